@@ -1,33 +1,101 @@
 #!/usr/bin/env python3
-from network_monitor.ping_monitor import ping_host, ping_multiple_hosts
-from network_monitor.port_scanner import scan_host, get_common_ports
+from network_monitor.ping_monitor import ping_host, ping_multiple_hosts, PING_ENGINES
+from network_monitor.port_scanner import scan_host, get_common_ports, get_top_ports, parse_port_spec, normalize_ports, SCAN_ENGINES, SCAN_ORDERS, SCAN_PROTOCOLS
+from network_monitor.network_scanner import scan_network, expand_targets, read_target_file
+from network_monitor.checkpoint import ScanCheckpoint
+from network_monitor.sharded_scanner import scan_network_sharded, scan_host_sharded
+from network_monitor.rate_limiter import configure_rate_limit
+from network_monitor.fd_budget import configure_fd_budget
+from network_monitor.scan_history import ScanHistory, delta_scan_host
 from network_monitor.dns_lookup import dns_lookup, reverse_dns_lookup
 from network_monitor.tcp_server import run_tcp_echo_server
 from network_monitor.udp_server import run_udp_echo_server
 from network_monitor.file_server import run_file_transfer_server
-from network_monitor.performance_optimizer import PerformanceOptimizer, run_performance_benchmark
+from network_monitor.performance_optimizer import PerformanceOptimizer, run_performance_benchmark, run_engine_benchmark, run_sharding_benchmark
 import argparse
+import time
+
+def print_error_ports(result):
+    """로컬 자원 부족으로 확인하지 못한 포트와 이유 출력"""
+    print(f"Ports not determined (local resource errors): {result['error_port_count']}")
+    pressure = result.get('resource_pressure')
+    if pressure:
+        print(f"  Local errors: {pressure['local_errors']}, concurrency reduced "
+              f"{pressure['configured_window']} -> {pressure['lowest_window']}")
+    for port_info in result['error_ports'][:20]:
+        print(f"  {port_info['port']}/{result['protocol']} - {port_info['error']}")
+    if result['error_port_count'] > 20:
+        print(f"  ... and {result['error_port_count'] - 20} more")
 
 def main():
     parser = argparse.ArgumentParser(description='Network Monitoring Tool')
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
     # Ping 명령 설정
-    ping_parser = subparsers.add_parser('ping', help='Ping a host')
-    ping_parser.add_argument('host', help='Host to ping')
-    ping_parser.add_argument('-c', '--count', type=int, default=5, help='Number of packets to send')
+    ping_parser = subparsers.add_parser('ping', help='Ping one or more hosts')
+    ping_parser.add_argument('host', nargs='+', help='Host(s) to ping')
+    ping_parser.add_argument('-c', '--count', type=int, help='Number of packets to send (default: 5; with -w, replies to wait for)')
     ping_parser.add_argument('-t', '--timeout', type=int, default=2, help='Timeout in seconds')
+    ping_parser.add_argument('-i', '--interval', type=float, default=0.5, help='Seconds between packets, sent without waiting for replies (default: 0.5)')
+    ping_parser.add_argument('-w', '--deadline', type=float, help='Stop after this many seconds regardless of how many packets were sent')
+    ping_parser.add_argument('--concurrency', type=int, default=256, help='Max hosts awaiting a reply at once when several hosts are given (default: 256)')
+    ping_parser.add_argument('--engine', choices=PING_ENGINES, default='native', help='Ping engine: native (shared ICMP socket, falls back to tcp without ICMP privileges), ping3 or tcp (TCP handshake RTT) (default: native)')
+    ping_parser.add_argument('--tcp-port', type=int, default=80, help='Port the tcp engine connects to (default: 80)')
     
     # 포트 스캔 명령 설정
     scan_parser = subparsers.add_parser('scan', help='Scan ports on a host')
-    scan_parser.add_argument('host', help='Host to scan')
-    scan_parser.add_argument('-p', '--ports', help='Port range to scan (e.g. 1-1024)')
+    scan_parser.add_argument('host', nargs='?', help='Host to scan')
+    scan_parser.add_argument('-p', '--ports', help='Ports to scan: range, list or mix (e.g. 1-1024, 22,80,8000-8100, top100)')
     scan_parser.add_argument('--common', action='store_true', help='Scan only common ports')
+    scan_parser.add_argument('--top', type=int, metavar='N', help='Scan the N most frequently open ports')
     scan_parser.add_argument('-t', '--timeout', type=float, default=0.5, help='Timeout in seconds for each port')
     scan_parser.add_argument('--advanced', action='store_true', help='Use advanced socket options (non-blocking)')
     scan_parser.add_argument('--adaptive-timeout', action='store_true', help='Use adaptive timeout based on network conditions')
     scan_parser.add_argument('--optimize', action='store_true', help='Auto-optimize scan parameters for target host')
     scan_parser.add_argument('--benchmark', action='store_true', help='Run performance benchmark')
+    scan_parser.add_argument('--engine', choices=SCAN_ENGINES, help='Scan engine to use (default: batch with --advanced, otherwise thread)')
+    scan_parser.add_argument('--concurrency', type=int, default=500, help='Max in-flight connects for the asyncio/batch engines (default: 500)')
+    scan_parser.add_argument('--benchmark-engines', action='store_true', help='Benchmark thread, asyncio and batch engines over the port range')
+    scan_parser.add_argument('--rate', type=float, metavar='PPS', help='Max probes per second across all targets (default: unlimited)')
+    scan_parser.add_argument('--host-rate', type=float, metavar='PPS', help='Max probes per second per destination host (default: unlimited)')
+    scan_parser.add_argument('--delta', action='store_true', help='Only report changes since the previous scan (previously open ports + rotating sample)')
+    scan_parser.add_argument('--sample', type=float, default=0.1, help='Fraction of remaining ports probed per delta scan (default: 0.1)')
+    scan_parser.add_argument('--history', default='scan_history.json', help='Scan history file for delta scans (default: scan_history.json)')
+    scan_parser.add_argument('--order', choices=SCAN_ORDERS, default='numeric', help='Probe order: numeric, or ranked by how often ports were seen open (default: numeric)')
+    scan_parser.add_argument('--stop-after', type=int, metavar='N', help='Stop after finding N open ports')
+    scan_parser.add_argument('--time-budget', type=float, metavar='SEC', help='Stop scanning after SEC seconds')
+    scan_parser.add_argument('--banners', action='store_true', help='Read service banners from open ports (SSH version, HTTP Server header, ...)')
+    scan_parser.add_argument('--protocol', choices=SCAN_PROTOCOLS, default='tcp', help='Transport protocol to scan (default: tcp)')
+    scan_parser.add_argument('--processes', type=int, metavar='N', help='Shard ports across N worker processes (0 = CPU count)')
+    scan_parser.add_argument('--checkpoint', action='store_true', help='Record progress to a checkpoint file so an interrupted scan can be resumed')
+    scan_parser.add_argument('--resume', metavar='SCAN_ID', help='Resume an interrupted scan from its checkpoint')
+    scan_parser.add_argument('--raise-fd-limit', action='store_true', help='Raise the open file soft limit to the hard limit before scanning')
+    scan_parser.add_argument('--kernel-rtt', action='store_true', help='Record kernel-measured RTT (TCP_INFO) for open ports (Linux)')
+    scan_family = scan_parser.add_mutually_exclusive_group()
+    scan_family.add_argument('-4', dest='family', action='store_const', const='ipv4', help='Resolve the host to an IPv4 address')
+    scan_family.add_argument('-6', dest='family', action='store_const', const='ipv6', help='Resolve the host to an IPv6 address')
+    
+    # 네트워크 스윕 명령 설정
+    sweep_parser = subparsers.add_parser('sweep', help='Scan ports on many hosts (CIDR, ranges, lists)')
+    sweep_parser.add_argument('targets', nargs='*', help='Targets: CIDR (10.0.0.0/22), range (10.0.0.1-50) or hosts')
+    sweep_parser.add_argument('-p', '--ports', default='common', help='Ports to scan on each host (default: common)')
+    sweep_parser.add_argument('-t', '--timeout', type=float, default=0.5, help='Timeout in seconds for each port')
+    sweep_parser.add_argument('--concurrency', type=int, default=500, help='Max in-flight connects across all hosts (default: 500)')
+    sweep_parser.add_argument('--per-host', type=int, default=32, help='Max in-flight connects per host (default: 32)')
+    sweep_parser.add_argument('--rate', type=float, metavar='PPS', help='Max probes per second across all targets (default: unlimited)')
+    sweep_parser.add_argument('--host-rate', type=float, metavar='PPS', help='Max probes per second per destination host (default: unlimited)')
+    sweep_parser.add_argument('--processes', type=int, metavar='N', help='Shard hosts across N worker processes (0 = CPU count)')
+    sweep_parser.add_argument('--benchmark-sharding', action='store_true', help='Benchmark sweep scaling from 1 to N processes')
+    sweep_parser.add_argument('--checkpoint', action='store_true', help='Record progress to a checkpoint file so an interrupted sweep can be resumed')
+    sweep_parser.add_argument('--resume', metavar='SCAN_ID', help='Resume an interrupted sweep from its checkpoint')
+    sweep_parser.add_argument('--raise-fd-limit', action='store_true', help='Raise the open file soft limit to the hard limit before sweeping')
+    sweep_parser.add_argument('-iL', '--targets-file', metavar='FILE', help='Read additional targets from FILE (one per line, # comments)')
+    sweep_parser.add_argument('--discover', action='store_true', help='Skip hosts that do not answer a quick TCP probe before the full port scan')
+    sweep_parser.add_argument('--discover-ports', metavar='PORTS', help='Ports probed during host discovery (default: 80,443,22,445,3389)')
+    sweep_parser.add_argument('--discover-ping', action='store_true', help='Also treat hosts answering ICMP echo as live during discovery')
+    sweep_family = sweep_parser.add_mutually_exclusive_group()
+    sweep_family.add_argument('-4', dest='family', action='store_const', const='ipv4', help='Resolve host names to IPv4 addresses')
+    sweep_family.add_argument('-6', dest='family', action='store_const', const='ipv6', help='Resolve host names to IPv6 addresses')
     
     # DNS 조회 명령 설정
     dns_parser = subparsers.add_parser('dns', help='Perform DNS lookups')
@@ -68,25 +136,126 @@ def main():
     
     args = parser.parse_args()
     
-    if args.command == 'ping':
-        result = ping_host(args.host, args.count, args.timeout)
+    # 이어서 실행할 때는 대상을 체크포인트에서 가져옴
+    if args.command == 'scan' and not args.host and not args.resume:
+        scan_parser.error('the following arguments are required: host')
+    if args.command == 'sweep' and args.targets_file:
+        try:
+            args.targets += read_target_file(args.targets_file)
+        except OSError as e:
+            sweep_parser.error(f"cannot read targets file: {e}")
+    if args.command == 'sweep' and not args.targets and not args.resume:
+        sweep_parser.error('the following arguments are required: targets')
+    if args.command == 'sweep' and (args.discover_ports or args.discover_ping):
+        args.discover = True
+    if args.command in ('scan', 'sweep') and (args.checkpoint or args.resume) and args.processes is not None:
+        parser.error('--checkpoint/--resume cannot be combined with --processes')
+    # 샤딩 워커는 배치 엔진으로 TCP 연결 상태만 기록하므로 나머지 스캔 옵션은 함께 쓸 수 없음
+    if args.command == 'scan' and args.processes is not None:
+        unsupported = [flag for flag, used in (
+            ('--protocol udp', args.protocol != 'tcp'),
+            ('--banners', args.banners),
+            ('--kernel-rtt', args.kernel_rtt),
+            ('--order ranked', args.order != 'numeric'),
+            ('--stop-after', args.stop_after is not None),
+            ('--time-budget', args.time_budget is not None),
+            ('--advanced', args.advanced),
+            ('--adaptive-timeout', args.adaptive_timeout),
+            ('--engine', args.engine is not None),
+            ('--delta', args.delta),
+            ('--optimize', args.optimize)
+        ) if used]
+        if unsupported:
+            scan_parser.error(f"{', '.join(unsupported)} cannot be combined with --processes")
+    
+    if args.command == 'ping' and len(args.host) > 1:
+        start_ns = time.perf_counter_ns()
+        results = ping_multiple_hosts(args.host, args.count, args.timeout, args.concurrency, engine=args.engine,
+                                      interval=args.interval, deadline=args.deadline, tcp_port=args.tcp_port)
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        print(f"\nPing Statistics ({len(results)} hosts in {elapsed:.2f}s):")
+        for host, result in results.items():
+            rtt = (f"avg {result['avg_time']:.2f}ms, jitter {result['jitter']:.2f}ms, p99 {result['p99']:.2f}ms"
+                   if result['avg_time'] is not None else "no reply")
+            via = f" [tcp port {result['tcp_port']}]" if result['engine'] == 'tcp' else ""
+            print(f"  {host}: {result['received']}/{result['transmitted']} received "
+                  f"({result['packet_loss_percent']:.1f}% loss), {rtt}{via}")
+    
+    elif args.command == 'ping':
+        result = ping_host(args.host[0], args.count, args.timeout, engine=args.engine,
+                           interval=args.interval, deadline=args.deadline, tcp_port=args.tcp_port)
         print("\nPing Statistics:")
-        print(f"Host: {result['host']}")
+        engine = f"tcp port {result['tcp_port']}" if result['engine'] == 'tcp' else result['engine']
+        print(f"Host: {result['host']} ({engine})")
+        if result['fallback']:
+            print(f"Fallback: TCP handshake RTT instead of ICMP ({result['fallback_reason']})")
         print(f"Packets: Transmitted = {result['transmitted']}, Received = {result['received']}, "
-              f"Lost = {result['packet_loss']} ({result['packet_loss_percent']:.1f}% loss)")
+              f"Lost = {result['packet_loss']} ({result['packet_loss_percent']:.1f}% loss), "
+              f"Time = {result['elapsed'] * 1000:.0f}ms")
+        if result['duplicates'] or result['late'] or result['reordered']:
+            print(f"Duplicates = {result['duplicates']}, Late = {result['late']}, "
+                  f"Out of order = {result['reordered']}")
         
         if result['avg_time'] is not None:
             print(f"Approximate round trip times in milliseconds:")
             print(f"Minimum = {result['min_time']:.2f}ms, Maximum = {result['max_time']:.2f}ms, "
                   f"Average = {result['avg_time']:.2f}ms")
+            print(f"Mdev = {result['mdev']:.2f}ms, Jitter = {result['jitter']:.2f}ms, "
+                  f"P50/P90/P99 = {result['p50']:.2f}/{result['p90']:.2f}/{result['p99']:.2f}ms")
+        if result['loss_bursts']:
+            print(f"Loss bursts = {result['loss_bursts']} (longest {result['max_loss_burst']} packets)")
     
     elif args.command == 'scan':
+        # 패킷 속도 제한 설정 (모든 스캔 엔진이 전역 레이트 리미터를 공유)
+        configure_rate_limit(args.rate, args.host_rate)
+        # 동시 연결 수 상한은 fd 예산에서 정해지므로 필요하면 soft limit부터 올림
+        configure_fd_budget(raise_soft_limit=args.raise_fd_limit)
+        
         # 성능 벤치마크 실행
         if args.benchmark:
             print("성능 벤치마크를 실행합니다...")
             run_performance_benchmark(args.host)
             return
         
+        # 스캔 엔진 벤치마크 실행
+        if args.benchmark_engines:
+            print("스캔 엔진 벤치마크를 실행합니다...")
+            if args.ports:
+                run_engine_benchmark(args.host, args.ports, args.timeout)
+            else:
+                run_engine_benchmark(args.host, timeout=args.timeout)
+            return
+        
+        # 델타 스캔: 이전 결과 대비 변화만 보고
+        if args.delta:
+            if args.common:
+                ports = get_common_ports()
+            elif args.top:
+                ports = get_top_ports(args.top)
+            else:
+                ports = args.ports or '1-1024'
+            try:
+                result = delta_scan_host(args.host, ports, args.timeout, args.sample,
+                                         history=ScanHistory(args.history), engine=args.engine,
+                                         max_concurrency=args.concurrency,
+                                         use_advanced_options=args.advanced)
+            except ValueError as e:
+                print(f"Invalid delta scan option: {e}")
+                return
+            
+            print("\nDelta Scan Results:")
+            print(f"Host: {result['host']}")
+            print(f"Probed {result['total_ports_scanned']}/{result['ports_in_range']} ports "
+                  f"({result['probe_fraction']:.1%}) in {result['scan_time']:.2f} seconds")
+            if result['baseline']:
+                print(f"Baseline recorded: {len(result['open_ports'])} open ports")
+            else:
+                print(f"New open ports: {[p['port'] for p in result['new_open']] or 'none'}")
+                print(f"Newly closed ports: {result['newly_closed'] or 'none'}")
+            if result['error_ports']:
+                print(f"Unchecked ports (local resource errors, previous state kept): {result['error_ports']}")
+            return
+        
         # 자동 최적화 실행
         if args.optimize:
             print("스캔 파라미터를 자동 최적화합니다...")
@@ -95,18 +264,19 @@ def main():
             # 최적화된 파라미터로 스캔 실행
             print(f"\n최적화된 설정으로 스캔을 시작합니다...")
             if args.ports:
-                start_port, end_port = map(int, args.ports.split('-'))
-                result = scan_host(args.host, (start_port, end_port), 
+                result = scan_host(args.host, args.ports, 
                                  optimal_params['timeout'],
                                  max_workers=optimal_params['max_workers'],
                                  use_advanced_options=optimal_params['use_advanced_options'],
-                                 use_adaptive_timeout=optimal_params['use_adaptive_timeout'])
+                                 use_adaptive_timeout=optimal_params['use_adaptive_timeout'],
+                                 engine=args.engine, max_concurrency=args.concurrency)
             else:
                 result = scan_host(args.host, 
                                  timeout=optimal_params['timeout'],
                                  max_workers=optimal_params['max_workers'],
                                  use_advanced_options=optimal_params['use_advanced_options'],
-                                 use_adaptive_timeout=optimal_params['use_adaptive_timeout'])
+                                 use_adaptive_timeout=optimal_params['use_adaptive_timeout'],
+                                 engine=args.engine, max_concurrency=args.concurrency)
             
             print(f"\n최적화된 스캔 완료:")
             print(f"Host: {result['host']}")
@@ -117,76 +287,222 @@ def main():
             if result['open_ports']:
                 print("\nOpen Ports:")
                 for port_info in sorted(result['open_ports'], key=lambda x: x['port']):
-                    print(f"  {port_info['port']}/tcp - {port_info['service']} "
-                          f"({port_info['response_time']:.4f}s)")
+                    print(f"  {port_info['port']}/{result['protocol']} - {port_info['service']} "
+                          f"({port_info['response_time']:.4f}s)"
+                          f"{' - ' + port_info['banner'] if port_info.get('banner') else ''}")
             return
         
-        # 포트 범위 결정
-        if args.common:
-            # 일반적인 포트만 스캔
-            common_ports = get_common_ports()
-            print(f"Scanning {len(common_ports)} common ports...")
-            
-            # 각 포트 개별적으로 스캔
-            results = []
-            for port in common_ports:
-                port_result = scan_host(args.host, (port, port), args.timeout, 
-                                      use_advanced_options=args.advanced,
-                                      use_adaptive_timeout=args.adaptive_timeout)
-                if port_result['open_ports']:
-                    results.extend(port_result['open_ports'])
-            
-            print("\nScan Results:")
-            print(f"Host: {args.host}")
-            print(f"Open ports: {len(results)}/{len(common_ports)}")
-            
-            if results:
-                print("\nOpen Ports:")
-                for port_info in sorted(results, key=lambda x: x['port']):
-                    print(f"  {port_info['port']}/tcp - {port_info['service']} "
-                          f"({port_info['response_time']:.4f}s)")
-            
-        elif args.ports:
-            # 지정된 포트 범위 스캔
+        # 체크포인트: 진행 상황을 파일에 기록하여 중단된 스캔을 --resume으로 이어서 실행
+        checkpoint = None
+        if args.resume:
             try:
-                start_port, end_port = map(int, args.ports.split('-'))
-                if not (1 <= start_port <= 65535 and 1 <= end_port <= 65535):
-                    raise ValueError("Port numbers must be between 1 and 65535")
-            except ValueError:
-                print("Invalid port range. Format should be: start-end (e.g. 1-1024)")
+                checkpoint = ScanCheckpoint.load(args.resume)
+            except (OSError, ValueError) as e:
+                print(f"Cannot resume scan {args.resume}: {e}")
                 return
+            if checkpoint.kind != 'host':
+                print(f"{args.resume} is a sweep checkpoint; resume it with: python app.py sweep --resume {args.resume}")
+                return
+            args.host = checkpoint.hosts[0]
+            args.ports = checkpoint.port_spec
+            args.protocol = checkpoint.protocol
+            args.common = args.top = None
+        elif args.checkpoint and not (args.common or args.top or args.ports):
+            args.ports = '1-1024'
+        
+        # 포트 범위 결정
+        if args.common or args.top or args.ports:
+            if args.common:
+                # 일반적인 포트만 스캔
+                ports = get_common_ports()
+                print(f"Scanning {len(ports)} common ports...")
+            elif args.top:
+                ports = get_top_ports(args.top)
+                print(f"Scanning top {len(ports)} ports...")
+            else:
+                # 지정된 포트 범위/목록 스캔
+                try:
+                    ports = parse_port_spec(args.ports)
+                except ValueError as e:
+                    print(f"Invalid port specification: {e}. Format: 1-1024, 22,80,8000-8100 or top100")
+                    return
             
-            result = scan_host(args.host, (start_port, end_port), args.timeout,
-                              use_advanced_options=args.advanced,
-                              use_adaptive_timeout=args.adaptive_timeout)
+            if args.checkpoint and checkpoint is None:
+                checkpoint = ScanCheckpoint.create('host', [args.host], normalize_ports(ports), args.protocol)
+                print(f"Checkpoint: {checkpoint.scan_id}")
+            
+            # 모든 포트를 하나의 스캔으로 동시에 처리
+            if args.processes is not None:
+                try:
+                    result = scan_host_sharded(args.host, ports, args.timeout, processes=args.processes,
+                                               max_concurrency=args.concurrency, family=args.family)
+                except RuntimeError as e:
+                    print(f"Scan failed: {e}")
+                    return
+            else:
+                try:
+                    result = scan_host(args.host, ports, args.timeout,
+                                      use_advanced_options=args.advanced,
+                                      use_adaptive_timeout=args.adaptive_timeout,
+                                      engine=args.engine, max_concurrency=args.concurrency,
+                                      order=args.order, stop_after_open=args.stop_after,
+                                      time_budget=args.time_budget, grab_banners=args.banners,
+                                      protocol=args.protocol, checkpoint=checkpoint,
+                                      family=args.family, kernel_rtt=args.kernel_rtt)
+                except KeyboardInterrupt:
+                    if checkpoint is None:
+                        raise
+                    print(f"\nInterrupted. Resume with: python app.py scan --resume {checkpoint.scan_id}")
+                    return
             
             print("\nScan Results:")
             print(f"Host: {result['host']}")
             print(f"Port range: {result['start_port']}-{result['end_port']}")
             print(f"Open ports: {result['open_port_count']}/{result['total_ports_scanned']}")
+            if result['protocol'] == 'udp':
+                print(f"Open|filtered ports (no response): {result['open_filtered_port_count']}")
+            if result.get('error_port_count'):
+                print_error_ports(result)
             print(f"Scan completed in {result['scan_time']:.2f} seconds")
+            if result['stop_reason']:
+                print(f"Stopped early ({result['stop_reason']})")
+            if result.get('resumed_ports'):
+                print(f"Resumed from checkpoint: {result['resumed_ports']} ports taken from the previous run")
+            if checkpoint is not None and result['cancelled']:
+                print(f"Resume with: python app.py scan --resume {checkpoint.scan_id}")
+            if args.rate or args.host_rate:
+                print(f"Probe rate: {result['rate_stats']['achieved_pps']:.0f} pps "
+                      f"(limit: {args.rate or '-'} total, {args.host_rate or '-'} per host)")
 
             if result['open_ports']:
                 print("\nOpen Ports:")
                 for port_info in sorted(result['open_ports'], key=lambda x: x['port']):
-                    print(f"  {port_info['port']}/tcp - {port_info['service']} "
-                          f"({port_info['response_time']:.4f}s)")
+                    print(f"  {port_info['port']}/{result['protocol']} - {port_info['service']} "
+                          f"({port_info['response_time']:.4f}s)"
+                          f"{' - ' + port_info['banner'] if port_info.get('banner') else ''}")
         else:
             # 기본 포트 범위(1-1024) 사용
-            result = scan_host(args.host, use_advanced_options=args.advanced,
-                              use_adaptive_timeout=args.adaptive_timeout)
+            if args.processes is not None:
+                try:
+                    result = scan_host_sharded(args.host, timeout=args.timeout, processes=args.processes,
+                                               max_concurrency=args.concurrency, family=args.family)
+                except RuntimeError as e:
+                    print(f"Scan failed: {e}")
+                    return
+            else:
+                result = scan_host(args.host, use_advanced_options=args.advanced,
+                                  use_adaptive_timeout=args.adaptive_timeout,
+                                  engine=args.engine, max_concurrency=args.concurrency,
+                                  order=args.order, stop_after_open=args.stop_after,
+                                  time_budget=args.time_budget, grab_banners=args.banners,
+                                  protocol=args.protocol, family=args.family,
+                                  kernel_rtt=args.kernel_rtt)
             
             print("\nScan Results:")
             print(f"Host: {result['host']}")
             print(f"Port range: {result['start_port']}-{result['end_port']}")
             print(f"Open ports: {result['open_port_count']}/{result['total_ports_scanned']}")
+            if result['protocol'] == 'udp':
+                print(f"Open|filtered ports (no response): {result['open_filtered_port_count']}")
+            if result.get('error_port_count'):
+                print_error_ports(result)
             print(f"Scan completed in {result['scan_time']:.2f} seconds")
+            if result['stop_reason']:
+                print(f"Stopped early ({result['stop_reason']})")
+            if args.rate or args.host_rate:
+                print(f"Probe rate: {result['rate_stats']['achieved_pps']:.0f} pps "
+                      f"(limit: {args.rate or '-'} total, {args.host_rate or '-'} per host)")
             
             if result['open_ports']:
                 print("\nOpen Ports:")
                 for port_info in sorted(result['open_ports'], key=lambda x: x['port']):
-                    print(f"  {port_info['port']}/tcp - {port_info['service']} "
-                          f"({port_info['response_time']:.4f}s)")
+                    print(f"  {port_info['port']}/{result['protocol']} - {port_info['service']} "
+                          f"({port_info['response_time']:.4f}s)"
+                          f"{' - ' + port_info['banner'] if port_info.get('banner') else ''}")
+    
+    elif args.command == 'sweep':
+        configure_rate_limit(args.rate, args.host_rate)
+        configure_fd_budget(raise_soft_limit=args.raise_fd_limit)
+        
+        # 프로세스 수에 따른 확장성 벤치마크 (대상은 루프백 주소 권장)
+        if args.benchmark_sharding:
+            run_sharding_benchmark(','.join(args.targets), args.ports, args.timeout,
+                                   args.processes or None)
+            return
+        
+        checkpoint = None
+        try:
+            if args.resume:
+                try:
+                    checkpoint = ScanCheckpoint.load(args.resume)
+                except OSError as e:
+                    print(f"Cannot resume sweep {args.resume}: {e}")
+                    return
+                if checkpoint.kind != 'network':
+                    print(f"{args.resume} is a single-host checkpoint; resume it with: python app.py scan --resume {args.resume}")
+                    return
+            elif args.checkpoint:
+                checkpoint = ScanCheckpoint.create('network', expand_targets(args.targets),
+                                                   normalize_ports(args.ports))
+                print(f"Checkpoint: {checkpoint.scan_id}")
+            
+            discovery_ports = normalize_ports(args.discover_ports) if args.discover_ports else None
+            if args.processes is not None:
+                result = scan_network_sharded(args.targets, args.ports, args.timeout,
+                                              processes=args.processes,
+                                              max_concurrency=args.concurrency,
+                                              per_host_limit=args.per_host, family=args.family,
+                                              discovery=args.discover, discovery_ports=discovery_ports,
+                                              discovery_ping=args.discover_ping)
+            else:
+                result = scan_network(args.targets, args.ports, args.timeout,
+                                      max_concurrency=args.concurrency,
+                                      per_host_limit=args.per_host, checkpoint=checkpoint,
+                                      family=args.family, discovery=args.discover,
+                                      discovery_ports=discovery_ports,
+                                      discovery_ping=args.discover_ping)
+        except ValueError as e:
+            print(f"Invalid sweep specification: {e}")
+            return
+        except KeyboardInterrupt:
+            if checkpoint is None:
+                raise
+            print(f"\nInterrupted. Resume with: python app.py sweep --resume {checkpoint.scan_id}")
+            return
+        
+        print("\nSweep Results:")
+        print(f"Hosts: {result['host_count']}, Ports per host: {result['ports_per_host']}")
+        if 'discovery' in result:
+            discovery = result['discovery']
+            evidence = ', '.join(f"{name} {count}" for name, count in sorted(discovery['evidence_counts'].items()))
+            print(f"Discovery: {discovery['alive_count']}/{discovery['host_count']} hosts live "
+                  f"({evidence or 'none'}), {discovery['down_count']} skipped, "
+                  f"{discovery['probes']} probes in {discovery['discovery_time']:.2f}s")
+        print(f"Probes: {result['total_probes']} in {result['scan_time']:.2f} seconds "
+              f"({result['probes_per_second']:.0f} probes/s)")
+        if args.rate or args.host_rate:
+            print(f"Rate limit: {args.rate or '-'} pps total, {args.host_rate or '-'} pps per host")
+        if result.get('resumed_probes'):
+            print(f"Resumed from checkpoint: {result['resumed_probes']} probes taken from the previous run")
+        print(f"Hosts with open ports: {len(result['hosts_with_open_ports'])}")
+        error_count = sum(r.get('error_port_count', 0) for r in result['hosts'].values())
+        if error_count:
+            pressure = result.get('resource_pressure')
+            print(f"Probes failed locally (not counted as closed): {error_count}"
+                  + (f" - {pressure['local_errors']}, window reduced to {pressure['lowest_window']}"
+                     if pressure else ""))
+        
+        for host in result['hosts_with_open_ports']:
+            host_result = result['hosts'][host]
+            print(f"\n{host} ({host_result['resolved_ip']}):")
+            for port_info in host_result['open_ports']:
+                print(f"  {port_info['port']}/tcp - {port_info['service']} "
+                      f"({port_info['response_time']:.4f}s)")
+        
+        if result['unresolved_hosts']:
+            print(f"\nUnresolved hosts: {', '.join(result['unresolved_hosts'])}")
+        if result.get('failed_hosts'):
+            print(f"\nNot scanned (worker process died): {', '.join(result['failed_hosts'])}")
     
     elif args.command == 'dns':
         if args.dns_command == 'lookup':
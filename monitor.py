@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 from network_monitor.ping_monitor import ping_host
-from network_monitor.port_scanner import scan_port
+from network_monitor.port_scanner import check_port
+from network_monitor.resolver import resolve_host, resolve_all
+from network_monitor.happy_eyeballs import happy_eyeballs_connect
+from network_monitor.rate_limiter import global_rate_limiter, configure_rate_limit
+from network_monitor.fd_budget import global_fd_budget
+from network_monitor.config import DEFAULT_PING_ENGINE, DEFAULT_PING_INTERVAL, DEFAULT_TCP_PING_PORT
 import time
 import json
+import socket
 import os
 import smtplib
 from email.mime.text import MIMEText
@@ -15,6 +21,18 @@ from datetime import datetime
 CONFIG_FILE = 'monitor_config.yaml'
 LOG_FILE = 'monitor.log'
 
+# ping 모니터의 품질 임계값: 설정 키 -> (결과 키, 표시 이름, 단위)
+# 응답이 있어도 지터나 꼬리 지연, 손실이 임계값을 넘으면 [품질] 알림
+PING_QUALITY_THRESHOLDS = {
+    'jitter_threshold_ms': ('jitter', '지터', 'ms'),
+    'p99_threshold_ms': ('p99', 'p99 RTT', 'ms'),
+    'loss_threshold_percent': ('packet_loss_percent', '패킷 손실률', '%'),
+    'loss_burst_threshold': ('max_loss_burst', '최대 연속 손실', '개')
+}
+
+# 포트 모니터별 Happy Eyeballs 결과 (마지막 승자 패밀리, 패밀리별 승리 횟수와 마지막 지연 시간)
+family_stats = {}
+
 def load_config():
     """
     설정 파일을 로드합니다. 파일이 없으면 기본 설정을 생성합니다.
@@ -149,6 +167,41 @@ def send_alert(config, subject, message):
     if 'console' in alerts:
         console_alert(alerts['console'], message)
 
+def record_family_result(monitor_name, connect):
+    """
+    Happy Eyeballs 점검 결과에서 승자 패밀리와 패밀리별 지연 시간을 기록하고 로그에 남깁니다.
+
+    매 점검마다 알림을 보내지 않고, 연결된 패밀리가 바뀐 경우(예: IPv6 경로 장애로 IPv4로
+    연결)에만 설정된 채널로 알립니다.
+    """
+    stats = family_stats.setdefault(monitor_name, {'last_family': None, 'wins': {}, 'latency': {},
+                                                   'kernel_rtt': {}})
+    previous_family = stats['last_family']
+    stats['last_family'] = connect['family']
+    stats['last_check'] = time.time()
+    if connect['family']:
+        stats['wins'][connect['family']] = stats['wins'].get(connect['family'], 0) + 1
+    stats['latency'].update(connect['family_latency'])
+    stats['kernel_rtt'].update(connect['family_kernel_rtt'])
+
+    def describe(family, latency):
+        if latency is None:
+            return f"{family} 실패"
+        kernel_rtt = connect['family_kernel_rtt'].get(family)
+        rtt_text = f", RTT {kernel_rtt * 1000:.2f}ms" if kernel_rtt is not None else ''
+        return f"{family} {latency * 1000:.1f}ms{rtt_text}"
+
+    latencies = ', '.join(describe(family, latency) for family, latency in connect['family_latency'].items())
+    stats['summary'] = f"연결 패밀리 {connect['family'] or '-'} ({latencies})"
+    if previous_family and connect['family'] and connect['family'] != previous_family:
+        send_alert(
+            config,
+            f"[패밀리 변경] {monitor_name}",
+            f"{monitor_name}의 연결 패밀리가 {previous_family}에서 {connect['family']}(으)로 바뀌었습니다 ({latencies})"
+        )
+    else:
+        log_alert(config.get('alerts', {}).get('log', {}), f"{monitor_name}: {stats['summary']}")
+
 def check_monitor(monitor, failures):
     """
     모니터 항목을 확인하고 결과를 반환합니다.
@@ -171,18 +224,52 @@ def check_monitor(monitor, failures):
     if monitor_type == 'ping':
         count = monitor.get('count', 3)
         timeout = monitor.get('timeout', 2)
+        # 기본은 프로세스가 공유하는 ICMP 소켓 엔진 (모니터가 많아도 소켓은 하나)
+        # ICMP 권한이 없는 컨테이너에서는 tcp_port로의 TCP 핸드셰이크로 자동 대체
+        engine = monitor.get('engine', DEFAULT_PING_ENGINE)
+        interval = monitor.get('interval', DEFAULT_PING_INTERVAL)
+        deadline = monitor.get('deadline')
+        tcp_port = monitor.get('tcp_port', DEFAULT_TCP_PING_PORT)
         
         try:
-            result = ping_host(host, count, timeout)
+            # 레이트 리미터가 설정되어 있으면 보낼 패킷 수만큼 허가를 받음
+            # (포트 점검, 스캐너와 같은 목적지 예산을 쓰도록 해석한 IP 기준 - ping_host도 같은 캐시로 해석)
+            try:
+                destination = resolve_host(host)['ip']
+            except socket.gaierror:
+                destination = None  # 해석하지 못하면 보낼 패킷이 없음 (ping_host가 'Unknown host'로 보고)
+            if destination is not None:
+                for _ in range(count):
+                    global_rate_limiter.acquire(destination)
+            # 같은 프로세스의 스캔이 fd를 다 써도 점검용 소켓 하나는 예산에서 받음
+            with global_fd_budget.permit(1, 'monitor', timeout=timeout):
+                result = ping_host(host, count, timeout, engine=engine, interval=interval, deadline=deadline,
+                                   tcp_port=tcp_port)
             success = result['received'] > 0  # 적어도 하나의 패킷이 수신되면 성공
+            probe = f"TCP ping(포트 {result['tcp_port']})" if result['engine'] == 'tcp' else "Ping"
+            if result['fallback']:
+                probe += " [ICMP 사용 불가로 대체]"
             
             if success:
+                exceeded = []
+                for key, (stat, label, unit) in PING_QUALITY_THRESHOLDS.items():
+                    threshold = monitor.get(key)
+                    if threshold is not None and result[stat] is not None and result[stat] > threshold:
+                        exceeded.append(f"{label} {result[stat]:.2f}{unit} (임계값 {threshold}{unit})")
+                if exceeded:
+                    send_alert(
+                        config,
+                        f"[품질] {monitor_name}",
+                        f"{monitor_name}({host})의 {probe} 품질이 임계값을 넘었습니다.\n" + "\n".join(exceeded)
+                    )
+                
                 if failures[monitor_name] > 0:
                     send_alert(
                         config,
                         f"[복구] {monitor_name}",
                         f"{monitor_name}({host})가 복구되었습니다.\n"
-                        f"Ping 응답 시간: {result['avg_time']:.2f}ms"
+                        f"{probe} 응답 시간: {result['avg_time']:.2f}ms "
+                        f"(지터 {result['jitter']:.2f}ms, p99 {result['p99']:.2f}ms)"
                     )
                     failures[monitor_name] = 0
                 
@@ -195,7 +282,7 @@ def check_monitor(monitor, failures):
                         config,
                         f"[경고] {monitor_name}",
                         f"{monitor_name}({host})에 연결할 수 없습니다.\n"
-                        f"Ping 실패: {failures[monitor_name]}회 연속 실패"
+                        f"{probe} 실패: {failures[monitor_name]}회 연속 실패"
                     )
                 
                 return False
@@ -216,8 +303,41 @@ def check_monitor(monitor, failures):
         timeout = monitor.get('timeout', 1)
         
         try:
-            port_result = scan_port(host, port, timeout)
-            success = port_result[1]  # port_result = (port, is_open, service_name, response_time)
+            # 해석 결과는 전역 TTL 캐시에서 재사용되므로 매 점검마다 DNS 조회를 하지 않음
+            family = monitor.get('family')  # 'ipv4'/'ipv6'로 고정하면 경주 없이 해당 패밀리만 확인
+            if family is None and monitor.get('happy_eyeballs', True):
+                # 듀얼 스택 호스트는 IPv6와 IPv4 연결을 경주시켜(RFC 8305) 실제 클라이언트처럼 확인
+                first_by_family = {}
+                for address_family, ip in resolve_all(host):
+                    first_by_family.setdefault(address_family, ip)
+                for ip in first_by_family.values():
+                    global_rate_limiter.acquire(ip)
+                with global_fd_budget.permit(len(first_by_family), 'monitor', timeout=timeout):
+                    connect = happy_eyeballs_connect(host, port, timeout,
+                                                     measure_families=monitor.get('measure_families', True))
+                record_family_result(monitor_name, connect)
+                success, response_time = connect['success'], connect['connect_time']
+                kernel_rtt = connect['kernel_rtt']
+                connected_via = f" ({connect['family']})" if connect['family'] else ''
+            else:
+                resolved = resolve_host(host, family)
+                global_rate_limiter.acquire(resolved['ip'])
+                with global_fd_budget.permit(1, 'monitor', timeout=timeout):
+                    port_result = check_port(host, port, timeout, target_ip=resolved['ip'])
+                success, response_time = port_result['is_open'], port_result['response_time']
+                kernel_rtt = port_result['kernel_rtt']
+                connected_via = f" ({resolved['family_name']})"
+            
+            # 지연 경보는 파이썬 스케줄링이 섞이지 않은 커널 RTT(TCP_INFO) 기준, 없으면 연결 시간 기준
+            rtt_threshold = monitor.get('rtt_threshold_ms')
+            measured_rtt = kernel_rtt if kernel_rtt is not None else response_time
+            if success and rtt_threshold and measured_rtt * 1000 > rtt_threshold:
+                send_alert(
+                    config,
+                    f"[지연] {monitor_name}",
+                    f"{monitor_name}({host}:{port})의 RTT가 {measured_rtt * 1000:.2f}ms로 "
+                    f"임계값 {rtt_threshold}ms를 넘었습니다{connected_via}."
+                )
             
             if success:
                 if failures[monitor_name] > 0:
@@ -225,7 +345,8 @@ def check_monitor(monitor, failures):
                         config,
                         f"[복구] {monitor_name}",
                         f"{monitor_name}({host}:{port})가 복구되었습니다.\n"
-                        f"응답 시간: {port_result[3]:.4f}s"
+                        f"응답 시간: {response_time:.4f}s"
+                        f"{f', RTT: {kernel_rtt * 1000:.2f}ms' if kernel_rtt is not None else ''}{connected_via}"
                     )
                     failures[monitor_name] = 0
                 
@@ -269,6 +390,10 @@ def run_monitor():
     global config
     config = load_config()
     
+    # 모니터 점검 패킷 속도 제한 (예: rate_limit: {pps: 100, per_host_pps: 10})
+    rate_limit = config.get('rate_limit') or {}
+    configure_rate_limit(rate_limit.get('pps'), rate_limit.get('per_host_pps'))
+    
     monitors = config.get('monitors', [])
     if not monitors:
         print("모니터링 항목이 설정되지 않았습니다.")
@@ -0,0 +1,180 @@
+import asyncio
+import errno
+import socket
+import time
+from collections import deque
+from .config import DEFAULT_TIMEOUT, DEFAULT_ASYNC_CONCURRENCY
+from .port_scanner import get_service_name, classify_connect_result, PORT_OPEN, PORT_ERROR
+from .pressure import ResourcePressure, abortive_close
+from .resolver import address_family
+
+
+async def async_probe_port(loop, host, port, timeout=DEFAULT_TIMEOUT, on_open=None):
+    """
+    이벤트 루프 위에서 논블로킹 connect로 단일 포트의 상태를 확인합니다.
+
+    Args:
+        on_open: 연결 성공 시 (host, port, sock)으로 호출되는 콜백. True를 반환하면
+            소켓을 닫지 않고 넘겨줌 (배너 읽기 등)
+
+    Returns:
+        tuple: (port, state, response_time) - error 상태는 response_time 자리에 errno
+    """
+    try:
+        sock = socket.socket(address_family(host), socket.SOCK_STREAM)
+    except OSError as e:
+        return (port, classify_connect_result(e.errno), e.errno)
+    sock.setblocking(False)
+    connected = False
+    handed_off = False
+
+    try:
+        start_ns = time.perf_counter_ns()
+        await asyncio.wait_for(loop.sock_connect(sock, (host, port)), timeout)
+        response_time = (time.perf_counter_ns() - start_ns) / 1e9
+        connected = True
+        handed_off = on_open is not None and on_open(host, port, sock)
+        return (port, PORT_OPEN, response_time)
+    except asyncio.TimeoutError:
+        return (port, classify_connect_result(errno.ETIMEDOUT), None)
+    except OSError as e:
+        state = classify_connect_result(e.errno)
+        return (port, state, e.errno if state == PORT_ERROR else None)
+    finally:
+        if connected and not handed_off:
+            # RST로 닫아 TIME_WAIT를 남기지 않음
+            abortive_close(sock)
+        elif not handed_off:
+            sock.close()
+
+
+async def async_scan_port(loop, host, port, timeout=DEFAULT_TIMEOUT):
+    """
+    이벤트 루프 위에서 논블로킹 connect로 단일 포트를 스캔합니다.
+
+    Returns:
+        tuple: (port, is_open, service_name, response_time)
+    """
+    port, state, response_time = await async_probe_port(loop, host, port, timeout)
+    if state == PORT_OPEN:
+        return (port, True, get_service_name(port), response_time)
+    return (port, False, None, None)
+
+
+async def async_scan_ports(host, ports, timeout=DEFAULT_TIMEOUT,
+                           max_concurrency=DEFAULT_ASYNC_CONCURRENCY, on_result=None):
+    """
+    하나의 이벤트 루프에서 최대 max_concurrency개의 연결을 동시에 유지하며 포트를 스캔합니다.
+
+    포트마다 태스크를 만들지 않고 max_concurrency개의 워커가 공유 이터레이터에서
+    포트를 꺼내 처리하므로, 65535개 포트를 스캔해도 태스크 수는 동시성 상한으로 고정됩니다.
+
+    Args:
+        host (str): 스캔할 호스트 이름 또는 IP 주소
+        ports (iterable): 스캔할 포트 번호들
+        timeout (float): 연결 타임아웃 시간(초)
+        max_concurrency (int): 동시에 진행할 최대 연결 수
+        on_result (callable): 포트별 결과 튜플을 받는 콜백 (선택)
+
+    Returns:
+        list: (port, is_open, service_name, response_time) 튜플 목록
+    """
+    loop = asyncio.get_running_loop()
+    port_iter = iter(ports)
+    results = []
+
+    async def worker():
+        for port in port_iter:
+            result = await async_scan_port(loop, host, port, timeout)
+            if on_result:
+                on_result(result)
+            results.append(result)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, max_concurrency))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+    return results
+
+
+def run_async_scan(host, ports, timeout=DEFAULT_TIMEOUT,
+                   max_concurrency=DEFAULT_ASYNC_CONCURRENCY, on_result=None):
+    """동기 코드에서 asyncio 스캔 엔진을 실행하는 편의 함수"""
+    return asyncio.run(async_scan_ports(host, ports, timeout, max_concurrency, on_result))
+
+
+def iter_async_scan(host, ports, timeout=DEFAULT_TIMEOUT, max_concurrency=DEFAULT_ASYNC_CONCURRENCY,
+                    rate_limiter=None, on_open=None, pressure=None):
+    """
+    전용 이벤트 루프를 돌리며 완료되는 순서대로 (port, state, response_time)을 생성하는 제너레이터
+
+    진행 중인 태스크는 최대 max_concurrency개로 유지되며, 제너레이터가 닫히면
+    남은 연결을 취소하고 루프를 정리합니다. rate_limiter가 있으면 연결마다 허가를 받고,
+    허가를 기다리는 동안에도 진행 중인 연결의 완료는 계속 수집합니다.
+    로컬 자원 부족으로 실패한 포트는 pressure에 따라 동시 연결 수를 줄이고 다시 시도합니다.
+    """
+    if pressure is None:
+        pressure = ResourcePressure(max_concurrency)
+    loop = asyncio.new_event_loop()
+    port_iter = iter(ports)
+    pending = set()
+    held = None  # 레이트 리미터에 막혀 대기 중인 포트
+    retry = deque()  # 로컬 자원 부족으로 다시 시도할 포트
+    attempts = {}
+
+    try:
+        while True:
+            throttle = None
+            while len(pending) < min(max_concurrency, pressure.limit):
+                pause = pressure.pause()
+                if pause > 0:
+                    throttle = pause
+                    break
+                if held is not None:
+                    port, held = held, None
+                elif retry:
+                    port = retry.popleft()
+                else:
+                    port = next(port_iter, None)
+                    if port is None:
+                        break
+
+                if rate_limiter is not None:
+                    wait = rate_limiter.try_acquire(host)
+                    if wait > 0:
+                        held, throttle = port, wait
+                        break
+
+                pending.add(loop.create_task(async_probe_port(loop, host, port, timeout, on_open)))
+
+            if not pending:
+                if held is None and not retry and throttle is None:
+                    break
+                loop.run_until_complete(asyncio.sleep(throttle or 0))
+                continue
+
+            done, pending = loop.run_until_complete(
+                asyncio.wait(pending, timeout=throttle, return_when=asyncio.FIRST_COMPLETED))
+            for task in done:
+                port, state, detail = task.result()
+                if state != PORT_ERROR:
+                    pressure.record_success()
+                    yield (port, state, detail)
+                    continue
+                pressure.record_error(detail)
+                tries = attempts.get(port, 0) + 1
+                if tries <= pressure.retries:
+                    attempts[port] = tries
+                    retry.append(port)
+                else:
+                    attempts.pop(port, None)
+                    yield (port, state, detail)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
@@ -0,0 +1,227 @@
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .config import DEFAULT_BANNER_CONCURRENCY, DEFAULT_BANNER_TIMEOUT, DEFAULT_BANNER_MAX_BYTES, \
+    DEFAULT_BANNER_CACHE_TTL
+from .pressure import abortive_close
+from .fd_budget import global_fd_budget
+
+# 서버가 먼저 말하지 않으므로 바로 HEAD 요청을 보내는 포트
+HTTP_PORTS = frozenset((80, 81, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8888, 9000))
+
+# 캐시 최대 항목 수
+_CACHE_SIZE = 4096
+
+
+def fingerprint_banner(data):
+    """
+    배너 바이트열에서 서비스 종류와 제품/버전 문자열을 추출합니다.
+
+    Returns:
+        dict: banner(첫 줄), service(추정 서비스 또는 None), product(제품/버전 또는 None)
+    """
+    text = data.decode('latin-1', errors='replace')
+    lines = text.splitlines()
+    first_line = lines[0].strip() if lines else ''
+    service, product = None, None
+
+    if first_line.startswith('SSH-'):
+        # 예: SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13
+        service = 'ssh'
+        parts = first_line.split('-', 2)
+        product = parts[2] if len(parts) == 3 else None
+    elif first_line.startswith('HTTP/'):
+        service = 'http'
+        for line in lines[1:]:
+            if line.lower().startswith('server:'):
+                product = line.split(':', 1)[1].strip()
+                break
+    elif first_line[:3].isdigit():
+        # FTP/SMTP 등 숫자 응답 코드로 시작하는 텍스트 프로토콜
+        lowered = first_line.lower()
+        if 'ftp' in lowered:
+            service = 'ftp'
+        elif 'smtp' in lowered:
+            service = 'smtp'
+        if first_line[:3] in ('220', '230'):
+            product = first_line[4:].strip() or None
+    elif first_line.startswith('+OK'):
+        service = 'pop3'
+        product = first_line[3:].strip() or None
+    elif first_line.startswith('* OK'):
+        service = 'imap'
+        product = first_line[4:].strip() or None
+
+    return {'banner': first_line[:200], 'service': service, 'product': product}
+
+
+class BannerGrabber:
+    """
+    열린 포트의 배너를 읽는 별도 단계
+
+    스캔 엔진이 연결에 성공한 소켓을 claim()으로 넘기면 자체 스레드 풀에서 배너를 읽습니다.
+    연결 단계와 동시성 한도가 분리되어 있어 배너를 기다리느라 포트 스캔이 느려지지 않으며,
+    결과는 (IP, 포트)별로 캐시됩니다.
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_BANNER_CONCURRENCY, timeout=DEFAULT_BANNER_TIMEOUT,
+                 max_bytes=DEFAULT_BANNER_MAX_BYTES, cache_ttl=DEFAULT_BANNER_CACHE_TTL):
+        """
+        Args:
+            max_concurrency: 동시에 배너를 읽을 최대 소켓 수
+            timeout: 배너 하나를 읽는 데 쓸 최대 시간(초)
+            max_bytes: 읽을 최대 바이트 수
+            cache_ttl: 캐시 유지 시간(초)
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.cache_ttl = cache_ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.futures = {}
+
+    def get_cached(self, ip, port):
+        """캐시된 배너 정보 (없거나 만료되면 None)"""
+        with self.lock:
+            entry = self.cache.get((ip, port))
+            if entry is None:
+                return None
+            if time.time() - entry['grabbed_at'] > self.cache_ttl:
+                del self.cache[(ip, port)]
+                return None
+            return entry
+
+    def _store(self, ip, port, info):
+        """읽기 결과 저장 (info가 None이면 캐시하지 않아 다음 스캔에서 다시 시도)"""
+        with self.lock:
+            if info is not None:
+                self.cache[(ip, port)] = info
+                self.cache.move_to_end((ip, port))
+                while len(self.cache) > _CACHE_SIZE:
+                    self.cache.popitem(last=False)
+            self.futures.pop((ip, port), None)
+
+    def claim(self, ip, port, sock):
+        """
+        연결된 소켓을 넘겨받아 배너 읽기를 예약합니다 (호출 즉시 반환).
+
+        Returns:
+            bool: True면 소켓 소유권을 가져감 (호출자는 닫지 않음). 이미 캐시되어 있거나
+                  대기열이나 fd 예산이 가득 차면 False
+        """
+        if self.get_cached(ip, port) is not None:
+            return False
+        with self.lock:
+            # 대기 중인 소켓이 너무 많으면 파일 디스크립터를 붙잡아 두지 않도록 거절
+            if (ip, port) in self.futures or len(self.futures) >= self.max_concurrency * 4:
+                return False
+            # 스캐너는 소켓을 넘긴 뒤 그 자리에 새 연결을 열므로 넘겨받은 소켓은 별도 허가가 필요
+            if not global_fd_budget.try_acquire(1, 'banner'):
+                return False
+            self.futures[(ip, port)] = self.executor.submit(self._read, ip, port, sock)
+        return True
+
+    def grab(self, ip, port):
+        """새로 연결하여 배너 정보를 가져옵니다 (캐시 우선, 블로킹)"""
+        cached = self.get_cached(ip, port)
+        if cached is not None:
+            return cached
+        with self.lock:
+            future = self.futures.get((ip, port))
+        if future is not None:
+            return future.result()
+        # fd 예산이 바닥나면 배너 제한 시간만큼만 기다리고 포기
+        if not global_fd_budget.acquire(1, 'banner', timeout=self.timeout):
+            return None
+        try:
+            sock = socket.create_connection((ip, port), timeout=self.timeout)
+        except OSError:
+            global_fd_budget.release(1, 'banner')
+            return None
+        return self._read(ip, port, sock)
+
+    def collect(self, ip, ports):
+        """
+        포트들의 배너 정보를 모아 반환합니다. 넘겨받은 소켓의 결과를 기다리고,
+        넘겨받지 못한 포트는 새 연결로 읽습니다.
+
+        Returns:
+            dict: 포트 -> 배너 정보 (읽지 못한 포트는 제외)
+        """
+        results = {}
+        fresh = []
+        # claim()이 다른 스레드에서 futures를 바꾸므로 잠금 아래에서 복사해 둠
+        with self.lock:
+            futures = dict(self.futures)
+        for port in ports:
+            cached = self.get_cached(ip, port)
+            future = futures.get((ip, port))
+            if cached is not None:
+                info = cached
+            elif future is not None:
+                info = future.result()
+            else:
+                fresh.append(port)
+                continue
+            if info is not None and info['banner']:
+                results[port] = info
+
+        for port, info in zip(fresh, self.executor.map(lambda p: self.grab(ip, p), fresh)):
+            if info is not None and info['banner']:
+                results[port] = info
+        return results
+
+    def _read(self, ip, port, sock):
+        """소켓에서 배너를 읽음 (서버가 말하지 않으면 HTTP HEAD 요청으로 유도, 끝나면 fd 허가 반납)"""
+        deadline = time.perf_counter_ns() + int(self.timeout * 1e9)
+        data = b''
+        try:
+            sock.setblocking(True)
+            probe_sent = False
+            if port in HTTP_PORTS:
+                sock.sendall(f"HEAD / HTTP/1.0\r\nHost: {ip}\r\n\r\n".encode())
+                probe_sent = True
+
+            while len(data) < self.max_bytes:
+                remaining = (deadline - time.perf_counter_ns()) / 1e9
+                if remaining <= 0:
+                    break
+                # SSH/FTP/SMTP처럼 먼저 말하는 서버를 위해 제한 시간의 절반은 수동으로 대기
+                sock.settimeout(remaining if probe_sent else min(remaining, self.timeout / 2))
+                try:
+                    chunk = sock.recv(self.max_bytes - len(data))
+                except socket.timeout:
+                    if data or probe_sent:
+                        break
+                    sock.sendall(f"HEAD / HTTP/1.0\r\nHost: {ip}\r\n\r\n".encode())
+                    probe_sent = True
+                    continue
+                if not chunk:
+                    break
+                data += chunk
+                if b'\n' in data and not probe_sent:
+                    break
+        except OSError:
+            pass
+        finally:
+            # 스캐너 쪽에 TIME_WAIT가 쌓이지 않도록 RST로 닫음
+            abortive_close(sock)
+            global_fd_budget.release(1, 'banner')
+
+        if not data:
+            # 읽기 실패나 빈 응답은 일시적일 수 있으므로 캐시하지 않음
+            self._store(ip, port, None)
+            return None
+
+        info = fingerprint_banner(data)
+        info['grabbed_at'] = time.time()
+        self._store(ip, port, info)
+        return info
+
+
+# 전역 인스턴스
+global_banner_grabber = BannerGrabber()
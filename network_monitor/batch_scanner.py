@@ -0,0 +1,245 @@
+import errno
+import heapq
+import itertools
+import selectors
+import socket
+import time
+from collections import deque
+from .config import DEFAULT_TIMEOUT, DEFAULT_BATCH_WINDOW
+from .port_scanner import get_service_name, classify_connect_result, PORT_OPEN, PORT_ERROR
+from .pressure import ResourcePressure, abortive_close, is_local_error
+from .resolver import address_family
+
+# 대상 이터레이터 소진 표시
+_EXHAUSTED = object()
+
+
+class BatchConnectScanner:
+    """
+    하나의 셀렉터(epoll/kqueue 등)에 수백 개의 연결 중인 소켓을 등록하고
+    완료 이벤트를 한 번에 수집하는 배치 connect 스캐너
+
+    소켓별 마감 시각은 힙에 보관하므로 가장 먼저 만료되는 연결까지만
+    select()가 대기하고, 만료된 소켓은 힙에서 꺼내 한꺼번에 정리합니다.
+    연결된 소켓은 RST로 닫아 TIME_WAIT를 남기지 않고, 임시 포트나 fd가 부족하면
+    윈도우를 줄이고 해당 대상을 다시 시도합니다.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, window: int = DEFAULT_BATCH_WINDOW,
+                 rate_limiter=None, pressure=None):
+        """
+        Args:
+            timeout: 소켓별 연결 타임아웃 (초)
+            window: 동시에 셀렉터에 등록할 최대 소켓 수
+            rate_limiter: 연결 시작 전에 허가를 받을 RateLimiter (선택)
+            pressure: 로컬 자원 부족 감지/감속 상태 (없으면 윈도우 크기로 새로 만듦)
+        """
+        self.timeout = timeout
+        self.window = max(1, window)
+        self.rate_limiter = rate_limiter
+        self.pressure = pressure or ResourcePressure(self.window)
+
+    def _close(self, sock, target, err, on_open):
+        """완료된 소켓 정리 (연결된 소켓은 넘겨주거나 RST로 닫음)"""
+        if err != 0:
+            sock.close()
+        elif on_open is None or not on_open(target[0], target[1], sock):
+            abortive_close(sock)
+
+    def scan(self, targets, on_complete=None, on_open=None):
+        """
+        (host, port) 대상들을 배치로 스캔하고 완료되는 순서대로 결과를 생성합니다.
+
+        Args:
+            targets: (host, port) 튜플의 이터러블. None을 생성하면 "지금 보낼 대상 없음"으로
+                보고 진행 중인 연결이 완료될 때까지 새 연결을 시작하지 않습니다 (스케줄러용).
+            on_complete: 대상 하나가 끝날 때마다 대상 튜플로 호출되는 콜백 (선택)
+            on_open: 연결 성공 시 (host, port, sock)으로 호출되는 콜백. True를 반환하면
+                소켓을 닫지 않고 넘겨줌 (배너 읽기 등)
+
+        Yields:
+            tuple: ((host, port), state, response_time) - response_time은 열린 포트만 기록,
+                error 상태(로컬 자원 부족으로 재시도까지 실패)는 그 자리에 errno
+        """
+        pressure = self.pressure
+        selector = selectors.DefaultSelector()
+        deadlines = []  # (deadline_ns, seq, fd) 힙
+        in_flight = {}  # fd -> (sock, target, start_ns, seq)
+        # 응답 시간과 마감 시각은 시계 변경의 영향을 받지 않는 perf_counter_ns 기준
+        timeout_ns = int(self.timeout * 1e9)
+        seq = itertools.count()
+        target_iter = iter(targets)
+        exhausted = False
+        held = None  # 레이트 리미터에 막혀 대기 중인 대상
+        retry = deque()  # 로컬 자원 부족으로 다시 시도할 대상
+        attempts = {}
+
+        try:
+            while True:
+                throttle = 0.0
+
+                # 윈도우가 빌 때마다 새 연결 시작 (자원 부족 시 줄어든 한도 적용)
+                while len(in_flight) < min(self.window, pressure.limit):
+                    throttle = pressure.pause()
+                    if throttle > 0:
+                        break
+                    if held is not None:
+                        target, held = held, None
+                    elif retry:
+                        target = retry.popleft()
+                    elif exhausted:
+                        break
+                    else:
+                        target = next(target_iter, _EXHAUSTED)
+                        if target is _EXHAUSTED:
+                            exhausted = True
+                            break
+                        if target is None:
+                            break
+
+                    if self.rate_limiter is not None:
+                        throttle = self.rate_limiter.try_acquire(target[0])
+                        if throttle > 0:
+                            held = target
+                            break
+
+                    sock = None
+                    start_ns = time.perf_counter_ns()
+                    try:
+                        sock = socket.socket(address_family(target[0]), socket.SOCK_STREAM)
+                        sock.setblocking(False)
+                        err = sock.connect_ex(target)
+                    except OSError as e:
+                        err = e.errno
+
+                    if is_local_error(err):
+                        # 임시 포트/fd 부족: 윈도우를 줄이고 잠시 멈춘 뒤 같은 대상을 다시 시도
+                        if sock is not None:
+                            sock.close()
+                        pressure.record_error(err)
+                        tries = attempts.get(target, 0) + 1
+                        if tries <= pressure.retries:
+                            attempts[target] = tries
+                            retry.append(target)
+                        else:
+                            attempts.pop(target, None)
+                            if on_complete:
+                                on_complete(target)
+                            yield (target, PORT_ERROR, err)
+                        continue
+
+                    if sock is None:
+                        # 소켓을 만들지 못함 (예: IPv4 전용 호스트에서 IPv6 대상 - EAFNOSUPPORT)
+                        if on_complete:
+                            on_complete(target)
+                        yield (target, classify_connect_result(err), None)
+                        continue
+
+                    if err in (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK):
+                        fd = sock.fileno()
+                        probe_id = next(seq)
+                        selector.register(fd, selectors.EVENT_WRITE)
+                        in_flight[fd] = (sock, target, start_ns, probe_id)
+                        heapq.heappush(deadlines, (start_ns + timeout_ns, probe_id, fd))
+                    else:
+                        # 즉시 연결 성공 (보통 localhost) 또는 즉시 거부
+                        response_time = (time.perf_counter_ns() - start_ns) / 1e9
+                        self._close(sock, target, err, on_open)
+                        pressure.record_success()
+                        if on_complete:
+                            on_complete(target)
+                        if err == 0:
+                            yield (target, PORT_OPEN, response_time)
+                        else:
+                            yield (target, classify_connect_result(err), None)
+
+                if not in_flight:
+                    if held is None and not retry and throttle <= 0:
+                        break
+                    time.sleep(throttle)
+                    continue
+
+                # 가장 이른 마감 시각(또는 레이트 리미터/감속이 풀릴 시각)까지만 대기
+                wait = max(0.0, (deadlines[0][0] - time.perf_counter_ns()) / 1e9) if deadlines else self.timeout
+                if throttle > 0:
+                    wait = min(wait, throttle)
+                events = selector.select(wait)
+                now = time.perf_counter_ns()
+
+                for key, _ in events:
+                    fd = key.fd
+                    sock, target, start_ns, _ = in_flight.pop(fd)
+                    selector.unregister(fd)
+                    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    self._close(sock, target, error, on_open)
+                    state = PORT_OPEN if error == 0 else classify_connect_result(error)
+
+                    if state == PORT_ERROR:
+                        # 비동기로 보고된 로컬 자원 부족도 connect_ex와 같이 감속 후 다시 시도
+                        pressure.record_error(error)
+                        tries = attempts.get(target, 0) + 1
+                        if tries <= pressure.retries:
+                            attempts[target] = tries
+                            retry.append(target)
+                            continue
+                        attempts.pop(target, None)
+                        if on_complete:
+                            on_complete(target)
+                        yield (target, state, error)
+                        continue
+
+                    pressure.record_success()
+                    if on_complete:
+                        on_complete(target)
+                    if error == 0:
+                        yield (target, PORT_OPEN, (now - start_ns) / 1e9)
+                    else:
+                        yield (target, state, None)
+
+                # 마감 시각이 지난 소켓 정리 (이미 완료되었거나 fd가 재사용된 항목은 건너뜀)
+                now = time.perf_counter_ns()
+                while deadlines and deadlines[0][0] <= now:
+                    _, probe_id, fd = heapq.heappop(deadlines)
+                    entry = in_flight.get(fd)
+                    if entry is None or entry[3] != probe_id:
+                        continue
+                    del in_flight[fd]
+                    selector.unregister(fd)
+                    entry[0].close()
+                    pressure.record_success()
+                    if on_complete:
+                        on_complete(entry[1])
+                    yield (entry[1], classify_connect_result(errno.ETIMEDOUT), None)
+        finally:
+            for sock, _, _, _ in in_flight.values():
+                sock.close()
+            selector.close()
+
+
+def batch_scan_ports(host, ports, timeout=DEFAULT_TIMEOUT, window=DEFAULT_BATCH_WINDOW, on_result=None):
+    """
+    단일 호스트의 포트들을 배치 connect 엔진으로 스캔합니다.
+
+    Args:
+        host (str): 스캔할 호스트 이름 또는 IP 주소
+        ports (iterable): 스캔할 포트 번호들
+        timeout (float): 연결 타임아웃 시간(초)
+        window (int): 동시에 진행할 최대 연결 수
+        on_result (callable): 포트별 결과 튜플을 받는 콜백 (선택)
+
+    Returns:
+        list: (port, is_open, service_name, response_time) 튜플 목록 (포트 순)
+    """
+    scanner = BatchConnectScanner(timeout, window)
+    results = []
+
+    for (_, port), state, response_time in scanner.scan((host, port) for port in ports):
+        is_open = state == PORT_OPEN
+        result = (port, is_open, get_service_name(port) if is_open else None,
+                  response_time if is_open else None)
+        if on_result:
+            on_result(result)
+        results.append(result)
+
+    results.sort(key=lambda r: r[0])
+    return results
@@ -0,0 +1,222 @@
+import json
+import os
+import struct
+import time
+from .config import DEFAULT_CHECKPOINT_DIR, DEFAULT_CHECKPOINT_INTERVAL
+from .port_scanner import parse_port_spec, PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_OPEN_FILTERED
+
+CHECKPOINT_VERSION = 1
+
+# 레코드: 호스트 번호(헤더의 hosts 목록 기준), 포트, 상태 코드, 응답 시간(없으면 -1)
+_RECORD = struct.Struct('!IHBf')
+
+_STATE_CODES = {PORT_OPEN: 1, PORT_CLOSED: 2, PORT_FILTERED: 3, PORT_OPEN_FILTERED: 4}
+_STATE_NAMES = {code: name for name, code in _STATE_CODES.items()}
+
+# 호스트의 모든 포트를 확인했음을 나타내는 레코드 (포트 0, 이 상태 코드)
+_HOST_DONE = 0xFF
+
+# 버퍼가 이만큼 차면 기록 주기와 관계없이 파일에 씀
+_FLUSH_BYTES = 64 * 1024
+
+
+def _compress_ports(ports):
+    """정렬된 포트 목록을 "1-1024,8080" 형식의 지정 문자열로 압축"""
+    parts = []
+    start = prev = None
+    for port in ports:
+        if prev is not None and port == prev + 1:
+            prev = port
+            continue
+        if start is not None:
+            parts.append(f"{start}-{prev}" if prev != start else str(start))
+        start = prev = port
+    if start is not None:
+        parts.append(f"{start}-{prev}" if prev != start else str(start))
+    return ','.join(parts)
+
+
+def new_scan_id():
+    """시각과 난수로 만든 스캔 ID (예: 20240101-120000-a1b2c3)"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}"
+
+
+class ScanCheckpoint:
+    """
+    진행 중인 스캔의 완료된 포트를 기록하는 추가 전용(append-only) 체크포인트 파일
+
+    파일은 JSON 헤더 한 줄(스캔 종류, 호스트, 포트, 프로토콜) 뒤에 포트마다 11바이트
+    고정 길이 레코드가 이어지는 형식입니다. 레코드는 메모리 버퍼에 모았다가
+    flush_interval초마다 한 번에 쓰므로 초당 수만 개의 프로브에서도 부담이 적고,
+    프로세스가 죽으면 마지막 기록 이후의 결과만 다시 확인하면 됩니다.
+    """
+
+    def __init__(self, scan_id, header, path, flush_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.scan_id = scan_id
+        self.path = path
+        self.kind = header['kind']
+        self.hosts = header['hosts']
+        self.port_spec = header['ports']
+        self.protocol = header.get('protocol', 'tcp')
+        self.created = header.get('created')
+        self.flush_interval = flush_interval
+        self.host_index = {host: index for index, host in enumerate(self.hosts)}
+
+        # 이전 실행에서 기록된 결과: 호스트 -> (포트별 상태 코드 bytearray, {열린 포트: 응답 시간})
+        self.completed = {}
+        self.completed_hosts = set()
+        self.resumed_records = 0
+
+        self.buffer = bytearray()
+        self.last_flush = time.monotonic()
+        self.file = None
+
+    @classmethod
+    def create(cls, kind, hosts, ports, protocol='tcp', directory=DEFAULT_CHECKPOINT_DIR,
+               flush_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        새 체크포인트 파일을 만듭니다.
+
+        Args:
+            kind (str): 'host'(scan_host) 또는 'network'(scan_network)
+            hosts (list): 스캔할 호스트 목록 (레코드는 이 목록의 순번으로 호스트를 가리킴)
+            ports: 정렬된 포트 시퀀스
+            protocol (str): 'tcp' 또는 'udp'
+            directory (str): 체크포인트 파일을 둘 디렉터리
+        """
+        scan_id = new_scan_id()
+        header = {
+            'version': CHECKPOINT_VERSION,
+            'scan_id': scan_id,
+            'kind': kind,
+            'hosts': list(hosts),
+            'ports': _compress_ports(ports),
+            'protocol': protocol,
+            'created': time.time()
+        }
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{scan_id}.ckpt")
+        checkpoint = cls(scan_id, header, path, flush_interval)
+        checkpoint.file = open(path, 'xb', buffering=0)
+        checkpoint.file.write(json.dumps(header).encode() + b'\n')
+        return checkpoint
+
+    @classmethod
+    def load(cls, scan_id, directory=DEFAULT_CHECKPOINT_DIR, flush_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        기존 체크포인트를 읽고 이어서 기록할 수 있도록 엽니다.
+
+        Raises:
+            FileNotFoundError: 해당 스캔 ID의 체크포인트가 없는 경우
+            ValueError: 파일 형식이 잘못된 경우
+        """
+        path = os.path.join(directory, f"{scan_id}.ckpt")
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        header_end = data.find(b'\n')
+        if header_end < 0:
+            raise ValueError(f"Corrupt checkpoint header: {path}")
+        header = json.loads(data[:header_end])
+        if header.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {header.get('version')}")
+
+        checkpoint = cls(scan_id, header, path, flush_interval)
+        body = memoryview(data)[header_end + 1:]
+        # 기록 도중 종료되어 잘린 마지막 레코드는 버림
+        valid = len(body) - len(body) % _RECORD.size
+        checkpoint._replay(body[:valid])
+
+        valid_size = header_end + 1 + valid
+        if valid_size < len(data):
+            os.truncate(path, valid_size)
+        checkpoint.file = open(path, 'ab', buffering=0)
+        return checkpoint
+
+    def _replay(self, body):
+        max_port = int(self.port_spec.rsplit(',', 1)[-1].rsplit('-', 1)[-1])
+        for index, port, code, response_time in _RECORD.iter_unpack(body):
+            host = self.hosts[index]
+            if code == _HOST_DONE:
+                self.completed_hosts.add(host)
+                continue
+            entry = self.completed.get(host)
+            if entry is None:
+                entry = self.completed[host] = (bytearray(max_port + 1), {})
+            entry[0][port] = code
+            if code == 1:
+                entry[1][port] = response_time if response_time >= 0 else None
+            self.resumed_records += 1
+
+    @property
+    def ports(self):
+        """스캔할 포트 목록"""
+        return parse_port_spec(self.port_spec)
+
+    def done_ports(self, host):
+        """이전 실행에서 확인한 호스트의 포트 집합"""
+        entry = self.completed.get(host)
+        if entry is None:
+            return set()
+        return {port for port, code in enumerate(entry[0]) if code}
+
+    def iter_completed(self, host):
+        """
+        이전 실행에서 확인한 호스트의 결과
+
+        Yields:
+            tuple: (port, state, response_time)
+        """
+        entry = self.completed.get(host)
+        if entry is None:
+            return
+        states, open_times = entry
+        for port, code in enumerate(states):
+            if code:
+                yield port, _STATE_NAMES[code], open_times.get(port)
+
+    def record(self, host, port, state, response_time=None):
+        """포트 결과 하나를 기록 (버퍼에 추가하고 주기적으로 파일에 씀)"""
+        self.buffer += _RECORD.pack(self.host_index[host], port, _STATE_CODES[state],
+                                    response_time if response_time is not None else -1.0)
+        if len(self.buffer) >= _FLUSH_BYTES or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def host_done(self, host):
+        """호스트의 모든 포트를 확인했음을 기록"""
+        self.completed_hosts.add(host)
+        self.buffer += _RECORD.pack(self.host_index[host], 0, _HOST_DONE, -1.0)
+
+    def flush(self):
+        """버퍼의 레코드를 파일에 씀"""
+        if self.buffer and self.file is not None:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.last_flush = time.monotonic()
+
+    def close(self, completed=False):
+        """
+        체크포인트를 닫습니다.
+
+        Args:
+            completed (bool): 스캔이 끝까지 완료되었으면 True (파일 삭제)
+        """
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+        if completed:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def list_checkpoints(directory=DEFAULT_CHECKPOINT_DIR):
+    """이어서 실행할 수 있는 체크포인트의 스캔 ID 목록 (오래된 순)"""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(name[:-5] for name in names if name.endswith('.ckpt'))
@@ -1,4 +1,42 @@
 # 기본 설정
 DEFAULT_PING_COUNT = 5
 DEFAULT_TIMEOUT = 2 # 초 단위
+DEFAULT_PING_CONCURRENCY = 256 # ping_multiple_hosts가 동시에 응답을 기다릴 최대 호스트 수
+DEFAULT_PING_INTERVAL = 0.5 # 연속 ping 요청 사이 간격(초, iputils ping의 -i)
+DEFAULT_PING_ENGINE = 'native' # ping 엔진 (native: 공유 ICMP 소켓, ping3: 패킷마다 소켓을 여는 ping3 라이브러리, tcp: TCP 핸드셰이크)
+DEFAULT_TCP_PING_PORT = 80 # tcp ping 엔진이 연결할 포트 (ICMP를 쓸 수 없을 때 자동으로 사용)
+DEFAULT_PING_PAYLOAD_SIZE = 56 # echo 요청 데이터 크기(바이트, iputils ping 기본값)
+DEFAULT_ICMP_SOCKET_BUFFER = 1 << 20 # 공유 ICMP 소켓의 송수신 버퍼 크기(바이트, 많은 응답이 한꺼번에 도착할 때 유실 방지)
 DEFAULT_PORT_RANGE = (1, 1024) # 스캔할 기본 포트 범위
+DEFAULT_ASYNC_CONCURRENCY = 500 # asyncio 스캔 엔진의 기본 동시 연결 수
+DEFAULT_BATCH_WINDOW = 256 # 배치 connect 엔진이 한 셀렉터에 등록할 소켓 수
+DEFAULT_RESOLVE_CACHE_TTL = 300 # 호스트 이름 해석 결과 캐시 유지 시간(초)
+DEFAULT_RESOLVE_CACHE_SIZE = 256 # 해석 캐시 최대 항목 수
+DEFAULT_PER_HOST_LIMIT = 32 # 네트워크 스윕 시 호스트별 동시 연결 수
+DEFAULT_MAX_SWEEP_HOSTS = 65536 # 네트워크 스윕 대상 호스트 수 상한
+DEFAULT_RATE_BURST_SECONDS = 0.05 # 레이트 리미터 버킷 용량 (초당 속도 x 이 시간만큼 버스트 허용)
+DEFAULT_SCAN_HISTORY_FILE = 'scan_history.json' # 델타 스캔용 호스트별 스캔 기록 파일
+DEFAULT_DELTA_SAMPLE_FRACTION = 0.1 # 델타 스캔 시 한 번에 확인할 나머지 포트 비율
+DEFAULT_SERVICES_FILE = '/etc/services' # 서비스 이름 테이블을 만들 services 파일
+SERVICE_NAME_OVERRIDES = {} # 사용자 지정 서비스 이름 (예: {8443: 'https-alt', '5353/udp': 'mdns'})
+DEFAULT_BANNER_CONCURRENCY = 32 # 배너 수집 단계의 동시 소켓 수 (연결 단계와 별도)
+DEFAULT_BANNER_TIMEOUT = 2.0 # 배너 하나를 읽는 최대 시간(초)
+DEFAULT_BANNER_MAX_BYTES = 1024 # 배너로 읽을 최대 바이트 수
+DEFAULT_BANNER_CACHE_TTL = 3600 # 호스트:포트별 배너 캐시 유지 시간(초)
+DEFAULT_UDP_RETRIES = 2 # UDP 스캔 시 응답이 없을 때 재전송 횟수
+DEFAULT_UDP_HOST_RATE = 100 # UDP 스캔 호스트별 초당 전송 수 (커널의 ICMP 오류 속도 제한 고려)
+DEFAULT_SHARD_PROCESSES = 0 # 다중 프로세스 스캔의 워커 수 (0이면 CPU 코어 수)
+DEFAULT_CHECKPOINT_DIR = 'scan_checkpoints' # 스캔 체크포인트 파일 디렉터리 (--resume으로 이어서 실행)
+DEFAULT_CHECKPOINT_INTERVAL = 1.0 # 체크포인트 버퍼를 파일에 쓰는 주기(초)
+DEFAULT_LOCAL_ERROR_RETRIES = 3 # 로컬 자원 부족(임시 포트/fd 고갈)으로 실패한 프로브의 재시도 횟수
+DEFAULT_PRESSURE_BACKOFF = 0.05 # 로컬 자원 부족 시 새 연결을 멈출 시간(초)
+DEFAULT_PRESSURE_MIN_WINDOW = 8 # 자원 부족으로 줄일 수 있는 동시 연결 수의 최솟값
+DEFAULT_FD_RESERVE = 64 # fd 예산에서 허가로 나누어 주지 않고 남겨 둘 fd 수 (로그, 셀렉터, 웹 서버 등)
+DEFAULT_FD_LEASE_SHARE = 0.5 # 스캔 하나가 빌릴 수 있는 남은 fd 허가의 최대 비율
+DEFAULT_FD_FALLBACK_LIMIT = 1024 # RLIMIT_NOFILE을 확인할 수 없는 플랫폼의 fd 한도
+DEFAULT_FD_LEASE_TIMEOUT = 30 # fd 예산에서 동시성 상한을 빌릴 때 최대 대기 시간(초), 넘으면 EMFILE 오류
+DEFAULT_FD_RAISE_SOFT_LIMIT = False # 시작 시 fd soft limit을 hard limit까지 올릴지 여부 (select 기반 코드는 fd 1024 미만만 지원)
+DEFAULT_MIN_IPV6_PREFIX = 112 # 스윕할 수 있는 IPv6 대역의 최소 프리픽스 길이 (/112 = 65536 주소, /64 같은 대역은 목록으로 지정)
+DEFAULT_HAPPY_EYEBALLS_DELAY = 0.25 # Happy Eyeballs 연결 시도 간격(초, RFC 8305 권장 250ms)
+DEFAULT_DISCOVERY_PORTS = (80, 443, 22, 445, 3389) # 호스트 탐색 단계에서 확인할 포트 (열려 있거나 RST가 오면 살아 있는 호스트)
+DEFAULT_DISCOVERY_PING_WORKERS = 32 # 호스트 탐색 단계의 동시 ICMP ping 수
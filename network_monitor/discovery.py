@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+from typing import Dict, Any, Iterable
+from .config import DEFAULT_TIMEOUT, DEFAULT_BATCH_WINDOW, DEFAULT_DISCOVERY_PORTS, DEFAULT_DISCOVERY_PING_WORKERS
+from .port_scanner import PORT_OPEN, PORT_CLOSED
+from .batch_scanner import BatchConnectScanner
+from .rate_limiter import global_rate_limiter
+from .fd_budget import global_fd_budget
+from .ping_monitor import ping_multiple_hosts
+
+# 호스트가 살아 있다고 판단한 근거
+EVIDENCE_OPEN = 'tcp-open'   # 탐색 포트 중 하나가 열려 있음
+EVIDENCE_RST = 'tcp-rst'     # 탐색 포트가 RST로 응답 (포트는 닫혔지만 호스트는 응답함)
+EVIDENCE_ICMP = 'icmp'       # ICMP echo 응답
+
+
+def discover_hosts(ips: Iterable[str], ports=DEFAULT_DISCOVERY_PORTS, timeout: float = DEFAULT_TIMEOUT,
+                   max_concurrency: int = DEFAULT_BATCH_WINDOW, use_icmp: bool = False,
+                   rate_limiter=None, ping_workers: int = DEFAULT_DISCOVERY_PING_WORKERS) -> Dict[str, Any]:
+    """
+    전체 포트 스캔 전에 응답하는 호스트만 골라냅니다.
+
+    모든 호스트에 탐색 포트를 하나씩 돌아가며 연결해 보고, 열려 있거나 RST로 닫힌 포트가
+    하나라도 있으면 살아 있는 호스트로 봅니다. 살아 있다고 확인된 호스트에는 남은 탐색
+    포트를 보내지 않습니다. 타임아웃(filtered)은 근거가 되지 않으며, use_icmp면 TCP로
+    확인하지 못한 호스트에 ping을 한 번 더 보냅니다.
+
+    Args:
+        ips: 확인할 IP 주소 목록
+        ports: 탐색 포트 (보낼 순서대로)
+        timeout: 프로브별 연결 타임아웃(초)
+        max_concurrency: 전체 동시 연결 수 상한 (fd 예산에서 빌림)
+        use_icmp: TCP로 확인하지 못한 호스트에 ICMP echo 확인 추가
+        rate_limiter: 전체/호스트별 pps 제한 (없으면 전역 레이트 리미터)
+        ping_workers: 동시에 응답을 기다릴 ping 수
+
+    Returns:
+        dict: alive(살아 있는 IP, 입력 순서), down_count, evidence(IP별 근거),
+            probe_results(살아 있는 IP별 [(port, state, response_time)] - 본 스캔에서 재사용),
+            evidence_counts, probes, pings, discovery_time
+    """
+    ips = list(ips)
+    evidence = {}
+    probe_results = {}
+
+    def targets():
+        # 포트 하나씩 모든 호스트를 돌고, 이미 확인된 호스트는 건너뜀
+        for port in ports:
+            for ip in ips:
+                if ip not in evidence:
+                    yield (ip, port)
+
+    if rate_limiter is None:
+        rate_limiter = global_rate_limiter
+    window = global_fd_budget.lease(max_concurrency, 'scan')
+    scanner = BatchConnectScanner(timeout, window, rate_limiter if rate_limiter.enabled else None)
+    probes = 0
+
+    start_ns = time.perf_counter_ns()
+    scan = scanner.scan(targets())
+    try:
+        for (ip, port), state, response_time in scan:
+            probes += 1
+            probe_results.setdefault(ip, []).append((port, state, response_time))
+            if ip not in evidence and state in (PORT_OPEN, PORT_CLOSED):
+                evidence[ip] = EVIDENCE_OPEN if state == PORT_OPEN else EVIDENCE_RST
+    finally:
+        scan.close()
+        global_fd_budget.release(window, 'scan')
+
+    pings = 0
+    if use_icmp:
+        candidates = [ip for ip in ips if ip not in evidence]
+        pings = len(candidates)
+        replies = ping_multiple_hosts(candidates, 1, timeout, ping_workers, verbose=False)
+        for ip, reply in replies.items():
+            # ICMP를 쓸 수 없어 TCP ping으로 대신한 응답은 ICMP 근거가 아님 (TCP는 위에서 이미 확인)
+            if reply['received'] > 0 and not reply['fallback']:
+                evidence[ip] = EVIDENCE_ICMP
+
+    alive = [ip for ip in ips if ip in evidence]
+    return {
+        'alive': alive,
+        'host_count': len(ips),
+        'down_count': len(ips) - len(alive),
+        'evidence': evidence,
+        'evidence_counts': dict(Counter(evidence.values())),
+        'probe_results': {ip: probe_results.get(ip, []) for ip in alive},
+        'probes': probes,
+        'pings': pings,
+        'discovery_time': (time.perf_counter_ns() - start_ns) / 1e9
+    }
+
@@ -22,9 +22,9 @@ def dns_lookup(domain, record_type='A', timeout=DEFAULT_TIMEOUT):
     results = []
     
     try:
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         answers = resolver.resolve(domain, record_type)
-        response_time = time.time() - start_time
+        response_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         for rdata in answers:
             if record_type == 'A' or record_type == 'AAAA':
@@ -133,9 +133,9 @@ def reverse_dns_lookup(ip_address, timeout=DEFAULT_TIMEOUT):
         dict: 역방향 DNS 조회 결과를 포함하는 딕셔너리
     """
     try:
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         hostname = socket.gethostbyaddr(ip_address)
-        response_time = time.time() - start_time
+        response_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         return {
             'ip_address': ip_address,
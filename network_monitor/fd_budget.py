@@ -0,0 +1,204 @@
+import errno
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Tuple
+from .config import DEFAULT_FD_RESERVE, DEFAULT_FD_LEASE_SHARE, DEFAULT_FD_FALLBACK_LIMIT, \
+    DEFAULT_FD_RAISE_SOFT_LIMIT, DEFAULT_FD_LEASE_TIMEOUT
+
+try:
+    import resource
+except ImportError:  # Windows: RLIMIT_NOFILE 없음
+    resource = None
+
+
+def get_nofile_limits() -> Tuple[int, int]:
+    """RLIMIT_NOFILE의 (soft, hard) 값 (확인할 수 없으면 기본값)"""
+    if resource is None:
+        return DEFAULT_FD_FALLBACK_LIMIT, DEFAULT_FD_FALLBACK_LIMIT
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        soft = DEFAULT_FD_FALLBACK_LIMIT * 64
+    if hard == resource.RLIM_INFINITY:
+        hard = max(soft, DEFAULT_FD_FALLBACK_LIMIT * 64)
+    return soft, hard
+
+
+def count_open_fds() -> Optional[int]:
+    """현재 프로세스가 열어 둔 fd 수 (/proc 또는 /dev/fd가 없으면 None)"""
+    for path in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+class FDBudget:
+    """
+    프로세스 전체의 파일 디스크립터 예산
+
+    RLIMIT_NOFILE에서 기본으로 열려 있는 fd와 여유분(reserve)을 뺀 만큼을 허가(permit)로
+    나누어 줍니다. 스캔 엔진은 lease()로 동시 연결 수만큼을 한꺼번에 빌려 실제 동시성 상한으로
+    쓰고, 모니터 점검과 서버의 클라이언트 연결은 permit()으로 하나씩 받습니다.
+    같은 프로세스에서 큰 스캔이 돌아도 웹 요청이나 서버 연결이 EMFILE로 실패하지 않습니다.
+    """
+
+    def __init__(self, reserve: int = DEFAULT_FD_RESERVE, lease_share: float = DEFAULT_FD_LEASE_SHARE,
+                 raise_soft_limit: bool = DEFAULT_FD_RAISE_SOFT_LIMIT):
+        """
+        Args:
+            reserve: 허가로 나누어 주지 않고 남겨 둘 fd 수 (로그 파일, 셀렉터, 웹 서버 등)
+            lease_share: 한 번의 lease가 가져갈 수 있는 남은 허가의 최대 비율
+            raise_soft_limit: True면 시작 시 soft limit을 hard limit까지 올림
+        """
+        self.condition = threading.Condition()
+        self.reserve = reserve
+        self.lease_share = lease_share
+        self.in_use = 0
+        self.peak = 0
+        self.waits = 0
+        self.by_owner = Counter()
+        self.baseline = count_open_fds() or 0
+        self.soft_limit, self.hard_limit = get_nofile_limits()
+        if raise_soft_limit:
+            self.raise_soft_limit()
+
+    @property
+    def capacity(self) -> int:
+        """나누어 줄 수 있는 전체 허가 수"""
+        return max(1, self.soft_limit - self.baseline - self.reserve)
+
+    @property
+    def available(self) -> int:
+        """지금 남은 허가 수"""
+        return max(0, self.capacity - self.in_use)
+
+    def raise_soft_limit(self, target: Optional[int] = None) -> int:
+        """
+        soft limit을 target(없으면 hard limit)까지 올립니다.
+
+        select() 기반 코드는 1024 이상의 fd를 다루지 못하므로 기본적으로는 올리지 않고,
+        설정이나 명령행 옵션으로 요청한 경우에만 호출합니다.
+
+        Returns:
+            int: 적용된 soft limit
+        """
+        if resource is None:
+            return self.soft_limit
+        target = min(target or self.hard_limit, self.hard_limit)
+        with self.condition:
+            if target > self.soft_limit:
+                try:
+                    resource.setrlimit(resource.RLIMIT_NOFILE, (target, self.hard_limit))
+                    self.soft_limit = target
+                except (ValueError, OSError):
+                    pass
+            self.condition.notify_all()
+        return self.soft_limit
+
+    def _grant(self, count: int, owner: str):
+        self.in_use += count
+        self.by_owner[owner] += count
+        self.peak = max(self.peak, self.in_use)
+
+    def try_acquire(self, count: int = 1, owner: str = 'other') -> bool:
+        """허가를 바로 받을 수 있으면 받고 True (기다리지 않음)"""
+        with self.condition:
+            if self.available < count:
+                return False
+            self._grant(count, owner)
+            return True
+
+    def acquire(self, count: int = 1, owner: str = 'other', timeout: Optional[float] = None) -> bool:
+        """허가를 받을 때까지 대기 (timeout이 지나면 False)"""
+        with self.condition:
+            if self.available < count:
+                self.waits += 1
+                if not self.condition.wait_for(lambda: self.available >= count, timeout):
+                    return False
+            self._grant(count, owner)
+            return True
+
+    def release(self, count: int = 1, owner: str = 'other'):
+        """허가 반납"""
+        with self.condition:
+            self.in_use = max(0, self.in_use - count)
+            self.by_owner[owner] -= count
+            if self.by_owner[owner] <= 0:
+                del self.by_owner[owner]
+            self.condition.notify_all()
+
+    @contextmanager
+    def permit(self, count: int = 1, owner: str = 'other', timeout: Optional[float] = None):
+        """
+        with 블록 동안 허가를 유지합니다.
+
+        Raises:
+            OSError: timeout 안에 허가를 받지 못한 경우 (EMFILE과 같은 의미)
+        """
+        if not self.acquire(count, owner, timeout):
+            raise OSError(errno.EMFILE, f"File descriptor budget exhausted ({self.in_use}/{self.capacity} in use)")
+        try:
+            yield
+        finally:
+            self.release(count, owner)
+
+    def lease(self, requested: int, owner: str = 'scan', minimum: int = 1,
+              timeout: Optional[float] = DEFAULT_FD_LEASE_TIMEOUT) -> int:
+        """
+        동시성 상한으로 쓸 허가를 한꺼번에 빌립니다.
+
+        남은 허가의 lease_share 비율까지만 주므로 여러 스캔이 동시에 돌아도 다른 작업의 몫이
+        남습니다. 최소 minimum개를 받을 때까지 최대 timeout초(None이면 무한히) 기다리며,
+        다 쓰면 같은 수로 release()해야 합니다.
+
+        Returns:
+            int: 실제로 받은 허가 수 (= 사용할 동시 연결 수)
+
+        Raises:
+            OSError: timeout 안에 허가를 받지 못한 경우 (EMFILE과 같은 의미)
+        """
+        requested = max(1, requested)
+        minimum = max(1, min(minimum, requested))
+        with self.condition:
+            if self.available < minimum:
+                self.waits += 1
+                if not self.condition.wait_for(lambda: self.available >= minimum, timeout):
+                    raise OSError(errno.EMFILE,
+                                  f"File descriptor budget exhausted ({self.in_use}/{self.capacity} in use)")
+            granted = min(requested, max(minimum, int(self.available * self.lease_share)))
+            self._grant(granted, owner)
+            return granted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """예산 사용 현황"""
+        with self.condition:
+            return {
+                'soft_limit': self.soft_limit,
+                'hard_limit': self.hard_limit,
+                'baseline_fds': self.baseline,
+                'reserve': self.reserve,
+                'capacity': self.capacity,
+                'in_use': self.in_use,
+                'available': self.available,
+                'peak': self.peak,
+                'waits': self.waits,
+                'by_owner': dict(self.by_owner),
+                'open_fds': count_open_fds()
+            }
+
+
+# 전역 인스턴스 (스캔 엔진, 모니터, 서버가 공유)
+global_fd_budget = FDBudget()
+
+
+def configure_fd_budget(raise_soft_limit: bool = False, reserve: Optional[int] = None):
+    """전역 fd 예산 설정 편의 함수"""
+    if reserve is not None:
+        with global_fd_budget.condition:
+            global_fd_budget.reserve = reserve
+            global_fd_budget.condition.notify_all()
+    if raise_soft_limit:
+        global_fd_budget.raise_soft_limit()
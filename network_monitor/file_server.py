@@ -3,6 +3,7 @@ import socket
 import threading
 import os
 from datetime import datetime
+from .fd_budget import global_fd_budget
 
 class FileTransferServer:
     def __init__(self, host='localhost', port=8082, upload_dir='uploads'):
@@ -30,6 +31,9 @@ class FileTransferServer:
             print("Waiting for connections...")
             
             while self.running:
+                # 클라이언트마다 소켓과 저장 파일용 fd 허가 2개를 받아, 허가가 없으면 accept를 미룸 (백로그에서 대기)
+                if not global_fd_budget.acquire(2, 'server', timeout=1.0):
+                    continue
                 try:
                     client_socket, client_address = self.socket.accept()
                     print(f"New connection from {client_address}")
@@ -43,6 +47,7 @@ class FileTransferServer:
                     client_thread.start()
                     
                 except socket.error as e:
+                    global_fd_budget.release(2, 'server')
                     if self.running:
                         print(f"Socket error: {e}")
                     break
@@ -117,6 +122,7 @@ class FileTransferServer:
             print(f"Error handling client {client_address}: {e}")
         finally:
             client_socket.close()
+            global_fd_budget.release(2, 'server')
             print(f"Connection with {client_address} closed")
             
     def stop(self):
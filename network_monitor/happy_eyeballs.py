@@ -0,0 +1,198 @@
+import errno
+import selectors
+import socket
+import time
+from typing import Dict, Any, List, Tuple
+from .config import DEFAULT_TIMEOUT, DEFAULT_HAPPY_EYEBALLS_DELAY
+from .resolver import resolve_all, FAMILY_NAMES
+from .pressure import abortive_close, error_name
+from .socket_options import read_tcp_rtt
+
+
+def interleave_addresses(addresses: List[Tuple[int, str]], first_family_count: int = 1) -> List[Tuple[int, str]]:
+    """
+    RFC 8305 6절에 따라 연결 시도 순서를 정합니다.
+
+    IPv6 주소를 먼저 first_family_count개 두고, 그 뒤로 IPv4와 IPv6를 번갈아 배치합니다.
+    한 패밀리의 경로가 막혀 있어도 다음 시도가 곧바로 다른 패밀리가 됩니다.
+
+    Args:
+        addresses: resolve_all이 반환한 (family, ip) 목록
+        first_family_count: 먼저 시도할 IPv6 주소 수
+
+    Returns:
+        list: 시도 순서대로 정렬한 (family, ip) 목록
+    """
+    v6 = [entry for entry in addresses if entry[0] == socket.AF_INET6]
+    v4 = [entry for entry in addresses if entry[0] == socket.AF_INET]
+    primary, secondary = (v6, v4) if v6 else (v4, [])
+    ordered = primary[:first_family_count]
+    rest_primary = primary[first_family_count:]
+    while rest_primary or secondary:
+        if secondary:
+            ordered.append(secondary.pop(0))
+        if rest_primary:
+            ordered.append(rest_primary.pop(0))
+    return ordered
+
+
+def happy_eyeballs_connect(host: str, port: int, timeout: float = DEFAULT_TIMEOUT,
+                           attempt_delay: float = DEFAULT_HAPPY_EYEBALLS_DELAY,
+                           measure_families: bool = False) -> Dict[str, Any]:
+    """
+    IPv6와 IPv4 연결을 경주시켜(RFC 8305 Happy Eyeballs) 먼저 성공한 주소로 연결을 확인합니다.
+
+    시도 순서는 interleave_addresses를 따르고, 앞선 시도가 attempt_delay 안에 끝나지 않으면
+    다음 주소로 동시에 연결을 시작합니다. 시도가 실패하면 기다리지 않고 바로 다음 주소를 시도합니다.
+    한 번의 점검이므로 승자를 포함한 모든 소켓은 확인 후 RST로 닫습니다.
+
+    Args:
+        host: 호스트 이름 또는 IP 주소
+        port: 포트 번호
+        timeout: 전체 점검 제한 시간(초)
+        attempt_delay: 다음 연결 시도를 시작하기까지의 간격(초)
+        measure_families: True면 승자가 정해진 뒤에도 아직 시도하지 않은 패밀리의 첫 주소에
+            연결해 패밀리별 지연 시간을 모두 측정 (승자는 바뀌지 않음)
+
+    Returns:
+        dict: success, host, port, ip(승자 주소), family(승자 패밀리 'ipv6'/'ipv4'),
+            connect_time(승자의 연결 시간, 초), kernel_rtt/kernel_rttvar(승자 소켓의 TCP_INFO RTT, 초),
+            family_latency(패밀리별 연결 시간, 실패/미시도는 None), family_kernel_rtt(패밀리별 커널 RTT),
+            attempts(시도별 ip, family, connect_time, kernel_rtt, error), error
+    """
+    result = {
+        'success': False,
+        'host': host,
+        'port': port,
+        'ip': None,
+        'family': None,
+        'connect_time': None,
+        'kernel_rtt': None,
+        'kernel_rttvar': None,
+        'family_latency': {},
+        'family_kernel_rtt': {},
+        'attempts': [],
+        'error': None
+    }
+    try:
+        addresses = interleave_addresses(resolve_all(host))
+    except OSError as e:
+        result['error'] = f"Resolve failed: {e}"
+        return result
+    result['family_latency'] = {FAMILY_NAMES[family]: None for family, _ in addresses}
+    result['family_kernel_rtt'] = dict(result['family_latency'])
+
+    selector = selectors.DefaultSelector()
+    in_flight = {}  # fd -> (sock, attempt)
+    queue = list(addresses)
+    # 연결 시간과 시도 간격은 perf_counter_ns 기준 (시계 변경의 영향 없음)
+    start_ns = time.perf_counter_ns()
+    deadline = start_ns + int(timeout * 1e9)
+    delay_ns = int(attempt_delay * 1e9)
+    next_attempt_at = start_ns
+    winner = None
+
+    def start(family, ip):
+        attempt = {'ip': ip, 'family': FAMILY_NAMES[family], 'connect_time': None,
+                   'kernel_rtt': None, 'kernel_rttvar': None, 'error': None}
+        result['attempts'].append(attempt)
+        sock = None
+        attempt_start = time.perf_counter_ns()
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex((ip, port))
+        except OSError as e:
+            err = e.errno
+        if err in (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK):
+            attempt['started_at'] = attempt_start
+            in_flight[sock.fileno()] = (sock, attempt)
+            selector.register(sock, selectors.EVENT_WRITE)
+            return
+        finish(sock, attempt, err, time.perf_counter_ns() - attempt_start)
+
+    def finish(sock, attempt, err, elapsed_ns):
+        nonlocal winner
+        attempt.pop('started_at', None)
+        if err == 0:
+            attempt['connect_time'] = elapsed_ns / 1e9
+            # 닫기 전에 커널이 SYN/SYN-ACK로 잰 RTT를 읽음
+            rtt = read_tcp_rtt(sock)
+            if rtt is not None:
+                attempt['kernel_rtt'], attempt['kernel_rttvar'] = rtt['rtt'], rtt['rttvar']
+            if result['family_latency'].get(attempt['family']) is None:
+                result['family_latency'][attempt['family']] = attempt['connect_time']
+                result['family_kernel_rtt'][attempt['family']] = attempt['kernel_rtt']
+            if winner is None:
+                winner = attempt
+            abortive_close(sock)
+        else:
+            attempt['error'] = error_name(err)
+            if sock is not None:
+                sock.close()
+
+    def measured_families():
+        return {attempt['family'] for attempt in result['attempts']}
+
+    try:
+        while True:
+            now = time.perf_counter_ns()
+            if now >= deadline:
+                break
+
+            if winner is None:
+                # 진행 중인 시도가 없거나 간격이 지났으면 다음 주소로 연결 시작
+                if queue and (not in_flight or now >= next_attempt_at):
+                    start(*queue.pop(0))
+                    next_attempt_at = time.perf_counter_ns() + delay_ns
+                    continue
+                if not queue and not in_flight:
+                    break
+            elif measure_families:
+                # 승자가 정해진 뒤에는 아직 시도하지 않은 패밀리의 첫 주소만 측정
+                pending = [entry for entry in queue if FAMILY_NAMES[entry[0]] not in measured_families()]
+                queue = []
+                for family, ip in pending:
+                    if FAMILY_NAMES[family] not in measured_families():
+                        start(family, ip)
+                # 이미 지연 시간을 잰 패밀리의 남은 시도는 기다리지 않음
+                for fd, (sock, attempt) in list(in_flight.items()):
+                    if result['family_latency'].get(attempt['family']) is not None:
+                        del in_flight[fd]
+                        selector.unregister(sock)
+                        sock.close()
+                        attempt.pop('started_at', None)
+                        attempt['error'] = 'cancelled'
+                if not in_flight:
+                    break
+            else:
+                break
+
+            wait = deadline - now
+            if winner is None and queue:
+                wait = min(wait, max(0, next_attempt_at - now))
+            for key, _ in selector.select(wait / 1e9):
+                sock, attempt = in_flight.pop(key.fd)
+                selector.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                finish(sock, attempt, err, time.perf_counter_ns() - attempt['started_at'])
+    finally:
+        for sock, attempt in in_flight.values():
+            attempt.pop('started_at', None)
+            attempt['error'] = error_name(errno.ETIMEDOUT) if winner is None else 'cancelled'
+            sock.close()
+        selector.close()
+
+    if winner is not None:
+        result.update({
+            'success': True,
+            'ip': winner['ip'],
+            'family': winner['family'],
+            'connect_time': winner['connect_time'],
+            'kernel_rtt': winner['kernel_rtt'],
+            'kernel_rttvar': winner['kernel_rttvar']
+        })
+    else:
+        errors = [attempt['error'] for attempt in result['attempts'] if attempt['error']]
+        result['error'] = ', '.join(dict.fromkeys(errors)) or 'No address attempted'
+    return result
@@ -0,0 +1,513 @@
+import errno
+import heapq
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Dict, Any, Callable, List, Optional
+from .config import DEFAULT_TIMEOUT, DEFAULT_PING_PAYLOAD_SIZE, DEFAULT_ICMP_SOCKET_BUFFER, DEFAULT_PING_INTERVAL
+from .pressure import error_name
+from .ping_stats import rtt_array, LOST
+from .resolver import address_family, FAMILY_NAMES
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+# 패밀리별 (echo 요청 타입, echo 응답 타입, 프로토콜)
+_ECHO_TYPES = {
+    socket.AF_INET: (ICMP_ECHO_REQUEST, ICMP_ECHO_REPLY, socket.IPPROTO_ICMP),
+    socket.AF_INET6: (ICMPV6_ECHO_REQUEST, ICMPV6_ECHO_REPLY, getattr(socket, 'IPPROTO_ICMPV6', 58)),
+}
+
+# ICMP echo 헤더: 타입, 코드, 체크섬, 식별자, 시퀀스
+_ECHO_HEADER = struct.Struct('!BBHHH')
+
+
+def icmp_checksum(data: bytes) -> int:
+    """인터넷 체크섬 (RFC 1071)"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def build_echo_request(family: int, ident: int, seq: int, payload: bytes) -> bytes:
+    """echo 요청 패킷 (ICMPv6 체크섬은 의사 헤더가 필요하므로 커널이 채움)"""
+    request_type = _ECHO_TYPES[family][0]
+    checksum = 0
+    if family == socket.AF_INET:
+        checksum = icmp_checksum(_ECHO_HEADER.pack(request_type, 0, 0, ident, seq) + payload)
+    return _ECHO_HEADER.pack(request_type, 0, checksum, ident, seq) + payload
+
+
+def parse_echo_reply(data: bytes, family: int, has_ip_header: bool):
+    """
+    수신한 패킷이 echo 응답이면 (식별자, 시퀀스)를 반환합니다.
+
+    raw IPv4 소켓은 IP 헤더까지 받고, datagram 소켓과 IPv6 소켓은 ICMP 메시지만 받습니다.
+    """
+    if has_ip_header:
+        if len(data) < 20:
+            return None
+        data = data[(data[0] & 0x0f) * 4:]
+    if len(data) < _ECHO_HEADER.size:
+        return None
+    icmp_type, _, _, ident, seq = _ECHO_HEADER.unpack_from(data)
+    if icmp_type != _ECHO_TYPES[family][1]:
+        return None
+    return ident, seq
+
+
+# 응답 종류 (PingBatch 콜백의 kind)
+REPLY = 'reply'          # 마감 전에 받은 응답
+TIMEOUT = 'timeout'      # 마감까지 응답 없음
+LATE = 'late'            # 마감이 지난 뒤 도착한 응답 (세션이 끝나기 전)
+DUPLICATE = 'duplicate'  # 이미 응답을 받은 요청에 대한 중복 응답
+SEND_ERROR = 'error'     # 보내지 못함 (예: 경로 없음)
+
+# 세션 끝에서 응답을 기다릴 때 가장 늦은 마감 뒤에 더 기다리는 시간(초) - 수신 스레드가
+# 마감 처리를 하지 못해도 세션이 끝나도록 대기 시간을 제한
+_EXPIRY_GRACE = 0.5
+
+
+class PingBatch:
+    """
+    ping 세션 하나(대상 여러 개 x 회차 여러 번)의 응답 수집기
+
+    rtts[target]는 대상별 회차의 왕복 시간(초) 배열(응답이 없으면 NaN), errors[target]는
+    회차별 오류이며, 수신 스레드가 채웁니다. 마감이 지난 응답(late), 중복 응답(duplicates), 앞선 회차보다
+    늦게 도착한 응답(reordered)은 대상별로 따로 셉니다.
+    """
+
+    def __init__(self, size: int, callback: Optional[Callable] = None):
+        """
+        Args:
+            size: 대상 수
+            callback: 결과가 나올 때마다 (kind, target, round, rtt, error)로 호출 (수신 스레드에서 실행)
+        """
+        self.rtts: List[array] = [rtt_array() for _ in range(size)]
+        self.errors: List[Dict[int, str]] = [{} for _ in range(size)]
+        self.received = [0] * size
+        self.late: List[Dict[int, float]] = [{} for _ in range(size)]
+        self.duplicates = [0] * size
+        self.reordered = [0] * size
+        self.outstanding = 0
+        self.last_deadline_ns = 0
+        self.callback_errors = 0
+        self.callback = callback
+        self._max_round = [-1] * size
+        self._keys = []
+        self._cond = threading.Condition()
+
+    def _add(self, target: int, round_: int, key, deadline_ns: int = 0):
+        with self._cond:
+            while len(self.rtts[target]) <= round_:
+                self.rtts[target].append(LOST)
+            self.outstanding += 1
+            self.last_deadline_ns = max(self.last_deadline_ns, deadline_ns)
+            self._keys.append(key)
+
+    def _record(self, kind: str, target: int, round_: int, rtt: Optional[float] = None,
+                error: Optional[str] = None):
+        # 기다리는 쪽이 깨어나기 전에 콜백을 실행해 출력 순서를 지킴
+        # (콜백이 실패해도 결과는 기록해야 기다리는 쪽이 멈추지 않음)
+        if self.callback is not None:
+            try:
+                self.callback(kind, target, round_, rtt, error)
+            except Exception:
+                self.callback_errors += 1
+        with self._cond:
+            if kind == REPLY:
+                self.rtts[target][round_] = rtt
+                self.received[target] += 1
+                if round_ < self._max_round[target]:
+                    self.reordered[target] += 1
+                self._max_round[target] = max(self._max_round[target], round_)
+            elif kind == LATE:
+                self.late[target][round_] = rtt
+            elif kind == DUPLICATE:
+                self.duplicates[target] += 1
+            if error is not None:
+                self.errors[target][round_] = error
+            # 늦은 응답에 error가 있으면 아직 마감 처리되지 않은 요청 (마감과 늦은 응답을 함께 기록)
+            if kind in (REPLY, TIMEOUT, SEND_ERROR) or (kind == LATE and error is not None):
+                self.outstanding -= 1
+            self._cond.notify_all()
+
+    def wait(self, limit: int = 0, timeout: Optional[float] = None) -> bool:
+        """응답을 기다리는 요청이 limit개 이하가 될 때까지 대기"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.outstanding <= limit, timeout)
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """결과가 기록될 때마다 predicate를 확인하며 대기"""
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout)
+
+
+class _Probe:
+    __slots__ = ('ip', 'sent_ns', 'deadline_ns', 'batch', 'target', 'round', 'answered')
+
+    def __init__(self, ip, sent_ns, deadline_ns, batch, target, round_):
+        self.ip = ip
+        self.sent_ns = sent_ns
+        self.deadline_ns = deadline_ns
+        self.batch = batch
+        self.target = target
+        self.round = round_
+        self.answered = False
+
+
+class ICMPEngine:
+    """
+    패밀리별 ICMP 소켓 하나로 여러 대상의 echo 요청을 보내고 응답을 한 수신 루프에서 모으는 ping 엔진
+
+    권한 없이 쓸 수 있는 datagram ICMP 소켓(net.ipv4.ping_group_range가 허용하는 경우)을
+    먼저 시도하고, 안 되면 raw 소켓을 씁니다. 요청마다 엔진 전체에서 유일한 시퀀스 번호를
+    붙이고 응답을 (식별자, 시퀀스)와 보낸 주소로 찾아 맞추므로, 수천 개의 대상과 여러
+    스레드의 요청이 같은 소켓을 함께 씁니다. 요청별 마감 시각은 힙에 두고 수신 스레드가
+    가장 가까운 마감까지만 대기합니다. 마감되었거나 응답을 받은 요청은 세션이 끝날 때까지
+    기억해 늦은 응답과 중복 응답을 구분합니다.
+    """
+
+    def __init__(self, payload_size: int = DEFAULT_PING_PAYLOAD_SIZE):
+        """
+        Args:
+            payload_size: echo 요청의 데이터 크기(바이트, iputils ping 기본값 56)
+        """
+        self.payload = bytes(i & 0xff for i in range(payload_size))
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """소켓과 수신 스레드 상태 초기화 (fork한 자식 프로세스는 부모의 스레드를 물려받지 못함)"""
+        self._pid = os.getpid()
+        self._sockets = {}       # family -> (sock, has_ip_header, ident 또는 None)
+        self._unavailable = {}   # family -> 소켓을 열지 못한 이유
+        self._pending = {}       # (family, seq) -> 응답을 기다리는 _Probe
+        self._finished = {}      # (family, seq) -> 응답을 받았거나 마감된 _Probe (세션이 끝날 때까지)
+        self._deadlines = []     # (deadline_ns, family, seq) 힙
+        self._next_seq = {socket.AF_INET: 0, socket.AF_INET6: 0}
+        self._selector = None
+        self._wakeup = None
+        self._thread = None
+        self.stats = Counter()
+
+    def _open_socket(self, family: int):
+        """datagram ICMP 소켓을 먼저 시도하고 안 되면 raw 소켓 (lock 안에서 호출)"""
+        protocol = _ECHO_TYPES[family][2]
+        last_error = None
+        for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                sock = socket.socket(family, sock_type, protocol)
+            except OSError as e:
+                last_error = e
+                continue
+            for option in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, option, DEFAULT_ICMP_SOCKET_BUFFER)
+                except OSError:
+                    pass
+            sock.setblocking(False)
+            if sock_type == socket.SOCK_DGRAM:
+                # 커널이 식별자를 소켓별로 정하고 그 식별자의 응답만 전달함
+                entry = (sock, False, None)
+            else:
+                entry = (sock, family == socket.AF_INET, (os.getpid() ^ id(self)) & 0xffff)
+            self._sockets[family] = entry
+            self._start_receiver()
+            self._selector.register(sock, selectors.EVENT_READ, (family,) + entry[1:])
+            self._wake()
+            return entry
+        self._unavailable[family] = str(last_error)
+        raise PermissionError(errno.EPERM, f"Cannot open ICMP socket: {last_error}")
+
+    def _socket(self, family: int):
+        if self._pid != os.getpid():
+            self._reset()
+        entry = self._sockets.get(family)
+        if entry is None:
+            if family in self._unavailable:
+                raise PermissionError(errno.EPERM, f"Cannot open ICMP socket: {self._unavailable[family]}")
+            entry = self._open_socket(family)
+        return entry
+
+    def available(self, family: int = socket.AF_INET) -> bool:
+        """이 패밀리의 ICMP 소켓을 열 수 있는지 여부 (raw 권한이나 ping_group_range 필요)"""
+        with self._lock:
+            try:
+                self._socket(family)
+            except OSError:
+                return False
+        return True
+
+    def unavailable_reason(self, family: int = socket.AF_INET) -> Optional[str]:
+        """이 패밀리의 ICMP 소켓을 열지 못한 이유 (열 수 있거나 아직 시도하지 않았으면 None)"""
+        with self._lock:
+            return self._unavailable.get(family)
+
+    def _start_receiver(self):
+        if self._thread is not None:
+            return
+        self._selector = selectors.DefaultSelector()
+        self._wakeup = socket.socketpair()
+        self._wakeup[0].setblocking(False)
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._receive_loop, name='icmp-engine', daemon=True)
+        self._thread.start()
+
+    def _wake(self):
+        """더 이른 마감이 생겼거나 소켓이 추가되었음을 수신 스레드에 알림"""
+        try:
+            self._wakeup[1].send(b'\x00')
+        except OSError:
+            pass
+
+    def _allocate_seq(self, family: int) -> int:
+        """응답을 기다리지 않는 시퀀스 번호 할당 (lock 안에서 호출)"""
+        for _ in range(0x10000):
+            seq = self._next_seq[family]
+            self._next_seq[family] = (seq + 1) & 0xffff
+            if (family, seq) not in self._pending:
+                # 끝난 요청의 번호를 다시 쓰면 그 요청의 늦은/중복 응답은 더 구분하지 않음
+                self._finished.pop((family, seq), None)
+                return seq
+        raise OSError(errno.ENOBUFS, 'Too many outstanding ICMP echo requests')
+
+    def send(self, ip: str, timeout: float, batch: PingBatch, target: int, round_: int = 0):
+        """
+        ip에 echo 요청 하나를 보냅니다. 결과는 batch의 (target, round_) 자리에 기록됩니다.
+
+        Raises:
+            PermissionError: ICMP 소켓을 열 수 없는 경우
+        """
+        family = address_family(ip)
+        with self._lock:
+            sock, _, ident = self._socket(family)
+            seq = self._allocate_seq(family)
+            sent_ns = time.perf_counter_ns()
+            deadline_ns = sent_ns + int(timeout * 1e9)
+            probe = _Probe(ip, sent_ns, deadline_ns, batch, target, round_)
+            self._pending[(family, seq)] = probe
+            earliest = not self._deadlines or deadline_ns < self._deadlines[0][0]
+            heapq.heappush(self._deadlines, (deadline_ns, family, seq))
+            self.stats['sent'] += 1
+        batch._add(target, round_, (family, seq), deadline_ns)
+
+        try:
+            sock.sendto(build_echo_request(family, ident or 0, seq, self.payload), (ip, 0))
+        except OSError as e:
+            with self._lock:
+                if self._pending.get((family, seq)) is not probe:
+                    return
+                del self._pending[(family, seq)]
+                self.stats['send_errors'] += 1
+            batch._record(SEND_ERROR, target, round_, error=error_name(e.errno))
+            return
+        if earliest:
+            self._wake()
+
+    def close(self, batch: PingBatch):
+        """세션 종료: 아직 응답을 기다리는 요청은 마감 처리하고 늦은/중복 응답 추적을 멈춤"""
+        abandoned = []
+        with self._lock:
+            for key in batch._keys:
+                probe = self._pending.get(key)
+                if probe is not None and probe.batch is batch:
+                    del self._pending[key]
+                    abandoned.append(probe)
+                probe = self._finished.get(key)
+                if probe is not None and probe.batch is batch:
+                    del self._finished[key]
+        for probe in abandoned:
+            batch._record(TIMEOUT, probe.target, probe.round, error='No reply before deadline')
+
+    def session(self, ips: List[str], count: Optional[int] = 1, interval: float = DEFAULT_PING_INTERVAL,
+                timeout: float = DEFAULT_TIMEOUT, deadline: Optional[float] = None,
+                window: Optional[int] = None, callback: Optional[Callable] = None) -> PingBatch:
+        """
+        ips에 interval 간격으로 echo 요청을 보내고 응답은 기다리지 않고 비동기로 맞춥니다.
+
+        count/interval/deadline은 iputils ping과 같은 뜻입니다.
+        - deadline이 없으면 count회 보낸 뒤 마지막 요청의 응답(또는 timeout)까지 기다림
+        - deadline이 있으면 count개의 응답을 받거나(count가 None이면 계속) deadline초가
+          지날 때까지 보내고, deadline에 아직 응답이 없는 요청은 손실로 처리
+
+        Args:
+            ips: 대상 IP 주소 목록 (회차마다 모든 대상에 하나씩 보냄)
+            count: 대상별 요청 수 (deadline이 있으면 필요한 응답 수)
+            interval: 회차 간격(초)
+            timeout: 요청별 응답 대기 시간(초)
+            deadline: 세션 전체 제한 시간(초)
+            window: 동시에 응답을 기다릴 최대 요청 수 (None이면 제한 없음)
+            callback: PingBatch 참고
+
+        Returns:
+            PingBatch: 대상별, 회차별 결과
+        """
+        if count is None and deadline is None:
+            raise ValueError('count or deadline is required')
+        batch = PingBatch(len(ips), callback)
+        start_ns = time.perf_counter_ns()
+        interval_ns = int(max(0.0, interval) * 1e9)
+        end_ns = start_ns + int(deadline * 1e9) if deadline is not None else None
+
+        def remaining():
+            if end_ns is None:
+                # 보낸 요청 중 가장 늦은 마감까지 (수신 스레드가 멈춰도 무한히 기다리지 않음)
+                return max(0.0, (batch.last_deadline_ns - time.perf_counter_ns()) / 1e9) + _EXPIRY_GRACE
+            return max(0.0, (end_ns - time.perf_counter_ns()) / 1e9)
+
+        def satisfied(target):
+            return deadline is not None and count is not None and batch.received[target] >= count
+
+        try:
+            round_ = 0
+            while True:
+                if deadline is None and round_ >= count:
+                    break
+                if end_ns is not None and time.perf_counter_ns() >= end_ns:
+                    break
+                targets = [target for target in range(len(ips)) if not satisfied(target)]
+                if not targets:
+                    break
+                for target in targets:
+                    if window and not batch.wait(window - 1, remaining()):
+                        break
+                    self.send(ips[target], timeout, batch, target, round_)
+                round_ += 1
+
+                if deadline is None and round_ >= count:
+                    break
+                # 다음 회차까지 대기 (deadline이 있으면 필요한 응답을 모두 받는 즉시 끝냄)
+                wait_ns = start_ns + round_ * interval_ns - time.perf_counter_ns()
+                if end_ns is not None:
+                    wait_ns = min(wait_ns, end_ns - time.perf_counter_ns())
+                if wait_ns > 0:
+                    batch.wait_for(lambda: all(satisfied(t) for t in range(len(ips))), wait_ns / 1e9)
+
+            # 마지막 요청의 응답 대기
+            if deadline is not None:
+                batch.wait_for(lambda: batch.outstanding == 0 or all(satisfied(t) for t in range(len(ips))),
+                               remaining())
+            else:
+                batch.wait(timeout=remaining())
+        finally:
+            self.close(batch)
+        return batch
+
+    def ping(self, ips: List[str], timeout: float = DEFAULT_TIMEOUT, window: Optional[int] = None) -> PingBatch:
+        """ips 각각에 echo 요청을 하나씩 보내고 모든 응답이나 마감을 기다립니다 (session의 1회 버전)."""
+        return self.session(ips, 1, timeout=timeout, window=window)
+
+    def _receive_loop(self):
+        # 이 스레드가 죽으면 이후의 모든 요청이 마감되지 않으므로 반복마다 예외를 세고 계속 진행
+        while True:
+            try:
+                self._receive_once()
+            except Exception:
+                self.stats['loop_errors'] += 1
+            try:
+                self._expire(time.perf_counter_ns())
+            except Exception:
+                self.stats['loop_errors'] += 1
+
+    def _receive_once(self):
+        """가장 가까운 마감까지 대기하며 도착한 응답을 처리"""
+        with self._lock:
+            wait = None
+            if self._deadlines:
+                wait = max(0.0, (self._deadlines[0][0] - time.perf_counter_ns()) / 1e9)
+        for key, _ in self._selector.select(wait):
+            if key.data is None:
+                try:
+                    key.fileobj.recv(4096)
+                except OSError:
+                    pass
+                continue
+            family, has_ip_header, ident = key.data
+            while True:
+                try:
+                    data, address = key.fileobj.recvfrom(65535)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    # datagram 소켓에 전달된 ICMP 오류 등 - 해당 요청은 마감으로 처리
+                    self.stats['receive_errors'] += 1
+                    break
+                self._dispatch(family, has_ip_header, ident, data, address[0], time.perf_counter_ns())
+
+    def _dispatch(self, family, has_ip_header, ident, data, source, received_ns):
+        parsed = parse_echo_reply(data, family, has_ip_header)
+        if parsed is None:
+            return
+        reply_ident, seq = parsed
+        if ident is not None and reply_ident != ident:
+            # 같은 호스트의 다른 ping 프로세스가 받은 응답 (raw 소켓은 모든 ICMP를 받음)
+            self.stats['foreign'] += 1
+            return
+        key = (family, seq)
+        source = source.split('%')[0]
+        expired = False
+        with self._lock:
+            probe = self._pending.get(key)
+            if probe is not None and probe.ip == source:
+                del self._pending[key]
+                self._finished[key] = probe
+                # 마감이 지났지만 아직 만료 처리 전인 요청 - 마감 처리 후 늦은 응답으로 셈
+                expired = received_ns > probe.deadline_ns
+                kind = LATE if expired else REPLY
+            else:
+                probe = self._finished.get(key)
+                if probe is None or probe.ip != source:
+                    self.stats['unmatched'] += 1
+                    return
+                kind = DUPLICATE if probe.answered else LATE
+            probe.answered = True
+            self.stats[kind] += 1
+            if expired:
+                self.stats[TIMEOUT] += 1
+        probe.batch._record(kind, probe.target, probe.round, (received_ns - probe.sent_ns) / 1e9,
+                            'Request timed out' if expired else None)
+
+    def _expire(self, now_ns: int):
+        expired = []
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now_ns:
+                deadline_ns, family, seq = heapq.heappop(self._deadlines)
+                probe = self._pending.get((family, seq))
+                # 응답을 받았거나 시퀀스 번호가 다른 요청에 재사용된 경우
+                if probe is None or probe.deadline_ns != deadline_ns:
+                    continue
+                del self._pending[(family, seq)]
+                self._finished[(family, seq)] = probe
+                expired.append(probe)
+            self.stats[TIMEOUT] += len(expired)
+        for probe in expired:
+            probe.batch._record(TIMEOUT, probe.target, probe.round, error='Request timed out')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """엔진 통계 (열린 소켓 종류, 송수신 수, 대기 중인 요청 수)"""
+        with self._lock:
+            sockets = {FAMILY_NAMES[family]: ('raw' if entry[2] is not None else 'dgram')
+                       for family, entry in self._sockets.items()}
+            pending = len(self._pending)
+            stats = dict(self.stats)
+        return {
+            'sockets': sockets,
+            'unavailable': {FAMILY_NAMES[family]: reason for family, reason in self._unavailable.items()},
+            'pending': pending,
+            **stats
+        }
+
+
+# 전역 ICMP 엔진 (프로세스 전체가 패밀리별 소켓 하나를 공유)
+global_icmp_engine = ICMPEngine()
@@ -0,0 +1,408 @@
+import ipaddress
+import socket
+import time
+from collections import deque, defaultdict
+from .config import DEFAULT_TIMEOUT, DEFAULT_PORT_RANGE, DEFAULT_BATCH_WINDOW, DEFAULT_PER_HOST_LIMIT, DEFAULT_MAX_SWEEP_HOSTS, \
+    DEFAULT_MIN_IPV6_PREFIX
+from .port_scanner import normalize_ports, get_service_name, PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_ERROR
+from .batch_scanner import BatchConnectScanner
+from .port_state import PortStateMap, open_on_all
+from .resolver import resolve_host
+from .rate_limiter import global_rate_limiter
+from .pressure import error_name
+from .fd_budget import global_fd_budget
+from .discovery import discover_hosts
+
+
+def expand_targets(targets, max_hosts=DEFAULT_MAX_SWEEP_HOSTS, min_ipv6_prefix=DEFAULT_MIN_IPV6_PREFIX):
+    """
+    스캔 대상 지정을 개별 호스트 목록으로 펼칩니다.
+
+    지원 형식: "10.0.0.0/22", "2001:db8::/120" (CIDR), "10.0.0.1-10.0.0.50" 또는 "10.0.0.1-50",
+    "2001:db8::1-2001:db8::ff" 또는 "2001:db8::1-ff" (범위), "host.example.com" / "10.0.0.5" /
+    "[2001:db8::5]" (단일 호스트). 쉼표로 구분한 문자열이나 목록을 받습니다.
+
+    IPv6 대역은 주소 공간이 커서 min_ipv6_prefix보다 짧은 프리픽스(예: /64)는 거부합니다.
+    그런 대역은 알려진 주소를 목록(read_target_file)으로 지정합니다.
+
+    Args:
+        targets: 대상 지정 문자열 또는 문자열 목록
+        max_hosts: 펼친 호스트 수 상한 (실수로 거대한 대역을 지정하는 것 방지)
+        min_ipv6_prefix: 펼칠 수 있는 IPv6 대역의 최소 프리픽스 길이
+
+    Returns:
+        list: 중복이 제거된 호스트 문자열 목록 (입력 순서 유지, IPv6 주소는 표준 표기로 정규화)
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 호스트 수가 상한을 넘는 경우
+    """
+    if isinstance(targets, str):
+        targets = targets.split(',')
+
+    hosts = []
+    seen = set()
+
+    def add(host):
+        if host in seen:
+            return
+        if len(hosts) >= max_hosts:
+            raise ValueError(f"Too many hosts in target specification (max {max_hosts})")
+        seen.add(host)
+        hosts.append(host)
+
+    for target in targets:
+        target = target.strip()
+        if not target:
+            continue
+
+        if '/' in target:
+            network = ipaddress.ip_network(target.strip('[]'), strict=False)
+            if network.version == 6 and network.prefixlen < min_ipv6_prefix:
+                raise ValueError(f"IPv6 prefix {target} is too large to sweep (minimum /{min_ipv6_prefix}); "
+                                 f"list the hosts explicitly instead")
+            if network.num_addresses > max_hosts + 2:
+                raise ValueError(f"Network {target} is larger than {max_hosts} hosts")
+            # /31, /32는 hosts()가 모든 주소를 반환
+            for address in network.hosts():
+                add(str(address))
+        elif '-' in target and _looks_like_ip_range(target):
+            start_text, end_text = target.split('-', 1)
+            start = ipaddress.ip_address(start_text)
+            if start.version == 6 and ':' not in end_text:
+                # "2001:db8::1-ff" 형식: 마지막 그룹만 지정
+                end_text = start_text.rsplit(':', 1)[0] + ':' + end_text
+            elif '.' not in end_text and ':' not in end_text:
+                # "10.0.0.1-50" 형식: 마지막 옥텟만 지정
+                end_text = start_text.rsplit('.', 1)[0] + '.' + end_text
+            end = ipaddress.ip_address(end_text)
+            if end.version != start.version or int(end) < int(start):
+                raise ValueError(f"Invalid address range: {target}")
+            if int(end) - int(start) + 1 > max_hosts:
+                raise ValueError(f"Address range {target} is larger than {max_hosts} hosts")
+            for value in range(int(start), int(end) + 1):
+                add(str(ipaddress.ip_address(value)))
+        else:
+            try:
+                add(str(ipaddress.ip_address(target.strip('[]'))))
+            except ValueError:
+                add(target)
+
+    return hosts
+
+
+def read_target_file(path):
+    """
+    대상 목록 파일을 읽습니다 (한 줄에 하나 또는 공백/쉼표로 구분, '#' 뒤는 주석).
+
+    큰 IPv6 대역처럼 펼칠 수 없는 네트워크는 알려진 주소를 이 파일로 지정해 스윕합니다.
+
+    Returns:
+        list: expand_targets에 넘길 대상 지정 문자열 목록
+    """
+    targets = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            targets.extend(part for part in line.replace(',', ' ').split() if part)
+    return targets
+
+
+def _looks_like_ip_range(target):
+    """'-'가 호스트 이름의 일부인지 IP 범위 구분자인지 판별"""
+    try:
+        ipaddress.ip_address(target.split('-', 1)[0])
+        return True
+    except ValueError:
+        return False
+
+
+class ProbeScheduler:
+    """
+    여러 호스트의 (ip, port) 프로브를 라운드로빈으로 섞어 내보내는 스케줄러
+
+    호스트마다 진행 중인 프로브 수를 세어 per_host_limit에 도달한 호스트는 건너뛰고,
+    모든 남은 호스트가 상한에 걸려 있으면 None을 내보내 배치 스캐너가 완료를 기다리게 합니다.
+    """
+
+    def __init__(self, ips, ports, per_host_limit=DEFAULT_PER_HOST_LIMIT, ports_by_ip=None):
+        # ports_by_ip: 일부 호스트만 다른 포트 목록을 스캔할 때 (예: 체크포인트에서 이어서 실행)
+        ports_by_ip = ports_by_ip or {}
+        self.active = deque([ip, iter(ports_by_ip.get(ip, ports))] for ip in ips)
+        self.per_host_limit = max(1, per_host_limit)
+        self.in_flight = defaultdict(int)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        for _ in range(len(self.active)):
+            entry = self.active[0]
+            self.active.rotate(-1)
+            ip = entry[0]
+
+            if self.in_flight[ip] >= self.per_host_limit:
+                continue
+
+            port = next(entry[1], None)
+            if port is None:
+                # 이 호스트의 포트를 모두 내보냄 (회전으로 맨 뒤에 있음)
+                self.active.pop()
+                continue
+
+            self.in_flight[ip] += 1
+            return (ip, port)
+
+        if not self.active:
+            raise StopIteration
+        return None
+
+    def release(self, target):
+        """프로브 완료 시 호출되어 해당 호스트의 진행 중 카운트 감소"""
+        self.in_flight[target[0]] -= 1
+
+
+def scan_network(targets, ports=DEFAULT_PORT_RANGE, timeout=DEFAULT_TIMEOUT,
+                 max_concurrency=DEFAULT_BATCH_WINDOW, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 max_hosts=DEFAULT_MAX_SWEEP_HOSTS, cancel_event=None, rate_limiter=None,
+                 return_state_map=False, checkpoint=None, family=None, discovery=False,
+                 discovery_ports=None, discovery_ping=False):
+    """
+    여러 호스트(CIDR, 범위, 목록)를 하나의 배치 엔진으로 동시에 스캔합니다.
+
+    모든 호스트의 프로브를 섞어서 전체 동시 연결 수(max_concurrency)와
+    호스트별 동시 연결 수(per_host_limit)를 함께 지키므로 한 호스트에 연결이 몰리지 않습니다.
+
+    Args:
+        targets: 대상 지정 (expand_targets 형식)
+        ports: 호스트마다 스캔할 포트 (scan_host와 같은 형식)
+        timeout (float): 연결 타임아웃 시간(초)
+        max_concurrency (int): 전체 동시 연결 수 상한
+        per_host_limit (int): 호스트별 동시 연결 수 상한
+        max_hosts (int): 펼친 호스트 수 상한
+        cancel_event (threading.Event): 설정되면 스캔 중단
+        rate_limiter (RateLimiter): 전체/호스트별 pps 제한 (없으면 전역 레이트 리미터)
+        return_state_map (bool): 호스트별 PortStateMap('port_state_map')과
+            모든 호스트에 공통으로 열린 포트('open_on_all_hosts')를 함께 반환
+        checkpoint (ScanCheckpoint): 완료된 포트와 호스트를 기록할 체크포인트. 이전 실행의
+            기록이 있으면 그 결과를 합치고 나머지만 스캔 (대상과 포트는 체크포인트의 값을 따름)
+        family (str): 호스트 이름을 해석할 주소 패밀리 ('ipv4'/'ipv6', None이면 IPv4 우선).
+            IP 주소와 대역은 지정한 그대로 스캔하므로 IPv4와 IPv6 대상을 섞을 수 있음
+        discovery (bool): 전체 포트 스캔 전에 discover_hosts로 응답하는 호스트만 골라 스캔.
+            응답하지 않은 호스트는 결과에서 빠지고 'discovery'에 통계가 남음
+        discovery_ports (list): 탐색 포트 (없으면 DEFAULT_DISCOVERY_PORTS)
+        discovery_ping (bool): 탐색 단계에서 ICMP echo도 확인
+
+    Returns:
+        dict: 호스트별 결과와 전체 통계를 포함하는 딕셔너리
+    """
+    if checkpoint is not None:
+        hosts = checkpoint.hosts
+        ports_to_scan = checkpoint.ports
+    else:
+        hosts = expand_targets(targets, max_hosts)
+        ports_to_scan = normalize_ports(ports)
+
+    # 호스트 이름 해석 (IP 주소는 조회 없이 통과)
+    ip_to_host = {}
+    unresolved = []
+    for host in hosts:
+        try:
+            ip = resolve_host(host, family)['ip']
+        except socket.gaierror:
+            unresolved.append(host)
+            continue
+        ip_to_host.setdefault(ip, host)
+
+    # 응답하지 않는 호스트는 전체 포트 스캔에서 제외 (희소한 대역에서 대부분의 프로브가 타임아웃)
+    # 체크포인트에 기록이 있는 호스트는 이미 스캔을 시작했으므로 다시 확인하지 않음
+    discovered = None
+    if discovery:
+        candidates = [ip for ip, host in ip_to_host.items()
+                      if checkpoint is None or host not in checkpoint.completed]
+        print(f"Discovering live hosts among {len(candidates)} addresses...")
+        discovery_kwargs = {'ports': discovery_ports} if discovery_ports else {}
+        discovered = discover_hosts(candidates, timeout=timeout, max_concurrency=max_concurrency,
+                                    use_icmp=discovery_ping, rate_limiter=rate_limiter, **discovery_kwargs)
+        print(f"Discovery found {len(discovered['alive'])}/{discovered['host_count']} live hosts "
+              f"in {discovered['discovery_time']:.2f}s")
+        dead = set(candidates) - set(discovered['alive'])
+        ip_to_host = {ip: host for ip, host in ip_to_host.items() if ip not in dead}
+
+    host_results = {}
+    for ip, host in ip_to_host.items():
+        host_results[ip] = {
+            'host': host,
+            'resolved_ip': ip,
+            'open_ports': [],
+            'open_port_count': 0,
+            'closed_port_count': 0,
+            'filtered_port_count': 0,
+            'error_port_count': 0,
+            'error_ports': []
+        }
+        if return_state_map:
+            host_results[ip]['port_state_map'] = PortStateMap(ports_to_scan[-1])
+
+    count_keys = {PORT_OPEN: 'open_port_count', PORT_CLOSED: 'closed_port_count',
+                  PORT_FILTERED: 'filtered_port_count', PORT_ERROR: 'error_port_count'}
+
+    # 이전 실행에서 확인한 포트는 체크포인트의 결과로 채우고 호스트별로 남은 포트만 스캔
+    ports_by_ip = {}
+    remaining = {ip: len(ports_to_scan) for ip in ip_to_host}
+    resumed_probes = 0
+    if checkpoint is not None and checkpoint.completed:
+        for ip, host in ip_to_host.items():
+            if host not in checkpoint.completed:
+                continue
+            host_result = host_results[ip]
+            for port, state, response_time in checkpoint.iter_completed(host):
+                host_result[count_keys[state]] += 1
+                if return_state_map:
+                    host_result['port_state_map'].set(port, state)
+                if state == PORT_OPEN:
+                    host_result['open_ports'].append({
+                        'port': port,
+                        'service': get_service_name(port),
+                        'response_time': response_time
+                    })
+            done = checkpoint.done_ports(host)
+            ports_by_ip[ip] = [p for p in ports_to_scan if p not in done]
+            remaining[ip] = len(ports_by_ip[ip])
+            resumed_probes += len(ports_to_scan) - remaining[ip]
+        print(f"Resuming sweep {checkpoint.scan_id}: {resumed_probes} probes already done "
+              f"({len(checkpoint.completed_hosts)} hosts complete)")
+
+    # 탐색 단계에서 이미 확인한 포트는 그 결과를 쓰고 다시 보내지 않음 (타임아웃이 같으므로 결과도 같음)
+    discovery_probes = 0
+    if discovered is not None:
+        port_set = set(ports_to_scan)
+        for ip, probe_results in discovered['probe_results'].items():
+            reused = [(port, state, response_time) for port, state, response_time in probe_results
+                      if port in port_set and state != PORT_ERROR]
+            if not reused:
+                continue
+            host_result = host_results[ip]
+            for port, state, response_time in reused:
+                host_result[count_keys[state]] += 1
+                if return_state_map:
+                    host_result['port_state_map'].set(port, state)
+                if state == PORT_OPEN:
+                    host_result['open_ports'].append({
+                        'port': port,
+                        'service': get_service_name(port),
+                        'response_time': response_time
+                    })
+                if checkpoint is not None:
+                    checkpoint.record(host_result['host'], port, state, response_time)
+            done = {port for port, _, _ in reused}
+            ports_by_ip[ip] = [p for p in ports_to_scan if p not in done]
+            remaining[ip] = len(ports_by_ip[ip])
+            discovery_probes += len(done)
+            if checkpoint is not None and remaining[ip] == 0:
+                checkpoint.host_done(host_result['host'])
+
+    print(f"Sweeping {len(ip_to_host)} hosts x {len(ports_to_scan)} ports "
+          f"(concurrency {max_concurrency}, per-host {per_host_limit})...")
+
+    # 전체 동시 연결 수는 프로세스 fd 예산에서 빌린 만큼으로 제한
+    requested_concurrency = max_concurrency
+    max_concurrency = global_fd_budget.lease(max_concurrency, 'scan')
+    if max_concurrency < requested_concurrency:
+        print(f"Concurrency limited to {max_concurrency} by the file descriptor budget")
+
+    scheduler = ProbeScheduler(list(ip_to_host), ports_to_scan, per_host_limit, ports_by_ip)
+    if rate_limiter is None:
+        rate_limiter = global_rate_limiter
+    scanner = BatchConnectScanner(timeout, max_concurrency,
+                                  rate_limiter if rate_limiter.enabled else None)
+    probes = 0
+    cancelled = False
+
+    start_ns = time.perf_counter_ns()
+    scan = scanner.scan(scheduler, on_complete=scheduler.release)
+    try:
+        for (ip, port), state, response_time in scan:
+            probes += 1
+            host_result = host_results[ip]
+            host_result[count_keys[state]] += 1
+            if return_state_map:
+                host_result['port_state_map'].set(port, state)
+            if state == PORT_ERROR:
+                # 로컬 자원 부족으로 재시도까지 실패 (response_time 자리에 errno)
+                # 체크포인트에 남기지 않아 이어서 실행할 때 다시 확인
+                host_result['error_ports'].append({'port': port, 'error': error_name(response_time)})
+            elif checkpoint is not None:
+                checkpoint.record(host_result['host'], port, state, response_time)
+                remaining[ip] -= 1
+                if remaining[ip] == 0:
+                    checkpoint.host_done(host_result['host'])
+
+            if state == PORT_OPEN:
+                service_name = get_service_name(port)
+                print(f"{host_result['host']}:{port} is open ({service_name}) - "
+                      f"Response time: {response_time:.4f}s")
+                host_result['open_ports'].append({
+                    'port': port,
+                    'service': service_name,
+                    'response_time': response_time
+                })
+
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+    finally:
+        scan.close()
+        global_fd_budget.release(max_concurrency, 'scan')
+        # 중단되었으면(예외 포함) 체크포인트를 남겨 이어서 실행, 모든 호스트를 마쳤으면 삭제
+        if checkpoint is not None:
+            checkpoint.close(completed=not any(remaining.values()))
+
+    total_time = (time.perf_counter_ns() - start_ns) / 1e9
+
+    results_by_host = {}
+    for ip, host_result in host_results.items():
+        host_result['open_ports'].sort(key=lambda p: p['port'])
+        results_by_host[host_result['host']] = host_result
+
+    result = {
+        'host_count': len(ip_to_host),
+        'ports_per_host': len(ports_to_scan),
+        'total_probes': probes + resumed_probes + discovery_probes,
+        'hosts': results_by_host,
+        'hosts_with_open_ports': sorted(h for h, r in results_by_host.items() if r['open_ports']),
+        'unresolved_hosts': unresolved,
+        'scan_time': total_time,
+        'probes_per_second': probes / total_time if total_time > 0 else 0,
+        'max_concurrency': max_concurrency,
+        'per_host_limit': per_host_limit,
+        'cancelled': cancelled,
+        'resource_pressure': scanner.pressure.get_stats(),
+        'rate_stats': {
+            'configured_pps': rate_limiter.rate,
+            'configured_per_host_pps': rate_limiter.per_destination_rate,
+            'achieved_pps': probes / total_time if total_time > 0 else 0.0
+        }
+    }
+
+    if discovered is not None:
+        result['discovery'] = {
+            'host_count': discovered['host_count'],
+            'alive_count': len(discovered['alive']),
+            'down_count': discovered['down_count'],
+            'evidence': {ip_to_host[ip]: evidence for ip, evidence in discovered['evidence'].items()},
+            'evidence_counts': discovered['evidence_counts'],
+            'probes': discovered['probes'],
+            'pings': discovered['pings'],
+            'reused_probes': discovery_probes,
+            'discovery_time': discovered['discovery_time']
+        }
+        result['down_hosts'] = discovered['down_count']
+
+    if checkpoint is not None:
+        result['scan_id'] = checkpoint.scan_id
+        result['resumed_probes'] = resumed_probes
+
+    if return_state_map:
+        result['open_on_all_hosts'] = open_on_all(r['port_state_map'] for r in results_by_host.values())
+
+    return result
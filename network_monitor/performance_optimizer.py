@@ -1,8 +1,11 @@
+import os
 import time
 import statistics
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
-from .port_scanner import scan_port_basic, scan_port_nonblocking, get_common_ports
+from .port_scanner import scan_port_basic, scan_port_nonblocking, get_common_ports, scan_host, normalize_ports
+from .resolver import resolve_host
+from .sharded_scanner import scan_network_sharded
 
 
 class PortScanBenchmark:
@@ -27,6 +30,10 @@ class PortScanBenchmark:
         """
         print(f"성능 벤치마크 시작: {host} ({len(ports)}개 포트, {iterations}회 반복)")
         
+        # 측정 시간에 이름 해석 시간이 섞이지 않도록 한 번만 해석하여 모든 방법에 재사용
+        resolved = resolve_host(host)
+        target_ip = resolved['ip']
+        
         methods = {
             'basic_blocking': self._test_basic_blocking,
             'advanced_nonblocking': self._test_nonblocking,
@@ -42,9 +49,9 @@ class PortScanBenchmark:
             method_success_counts = []
             
             for i in range(iterations):
-                start_time = time.time()
-                success_count = method_func(host, ports, timeout)
-                elapsed_time = time.time() - start_time
+                start_ns = time.perf_counter_ns()
+                success_count = method_func(target_ip, ports, timeout)
+                elapsed_time = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 method_times.append(elapsed_time)
                 method_success_counts.append(success_count)
@@ -70,6 +77,8 @@ class PortScanBenchmark:
             'performance_analysis': performance_comparison,
             'test_config': {
                 'host': host,
+                'resolved_ip': target_ip,
+                'resolve_time': resolved['resolve_time'],
                 'ports_tested': len(ports),
                 'timeout': timeout,
                 'iterations': iterations
@@ -122,6 +131,167 @@ class PortScanBenchmark:
                 success_count += 1
         return success_count
     
+    def benchmark_scan_engines(self, host: str, port_range: tuple, timeout: float = 1.0,
+                               iterations: int = 3, max_workers: int = 50,
+                               max_concurrency: int = 500) -> Dict[str, Any]:
+        """
+        스레드 풀, asyncio, 배치(셀렉터) 엔진으로 같은 포트 범위를 스캔하여 비교
+        
+        Args:
+            host: 대상 호스트 (루프백 권장)
+            port_range: 스캔할 포트 (scan_host가 받는 모든 형식)
+            timeout: 타임아웃 시간
+            iterations: 반복 테스트 횟수
+            max_workers: thread 엔진의 스레드 수
+            max_concurrency: asyncio/batch 엔진의 동시 연결 수
+        
+        Returns:
+            엔진별 벤치마크 결과 딕셔너리
+        """
+        ports = normalize_ports(port_range)
+        total_ports = len(ports)
+        print(f"스캔 엔진 벤치마크 시작: {host} ({total_ports}개 포트, {iterations}회 반복)")
+        
+        engines = {
+            'thread': {'engine': 'thread', 'max_workers': max_workers},
+            'asyncio': {'engine': 'asyncio', 'max_concurrency': max_concurrency},
+            'batch': {'engine': 'batch', 'max_concurrency': max_concurrency}
+        }
+        
+        results = {}
+        
+        for engine_name, engine_kwargs in engines.items():
+            print(f"\n{engine_name} 엔진 테스트 중...")
+            engine_times = []
+            open_counts = []
+            
+            for i in range(iterations):
+                scan_result = scan_host(host, ports, timeout, **engine_kwargs)
+                engine_times.append(scan_result['scan_time'])
+                open_counts.append(scan_result['open_port_count'])
+                print(f"  반복 {i+1}: {scan_result['scan_time']:.3f}초, "
+                      f"{total_ports / scan_result['scan_time']:.0f} ports/s")
+            
+            avg_time = statistics.mean(engine_times)
+            results[engine_name] = {
+                'avg_time': avg_time,
+                'min_time': min(engine_times),
+                'max_time': max(engine_times),
+                'std_dev': statistics.stdev(engine_times) if len(engine_times) > 1 else 0,
+                'ports_per_second': total_ports / avg_time if avg_time > 0 else 0,
+                'open_port_count': open_counts[-1],
+                'total_ports': total_ports
+            }
+        
+        # thread 엔진 대비 속도 (배수)
+        thread_time = results['thread']['avg_time']
+        speedup_vs_thread = {
+            engine: thread_time / stats['avg_time'] if stats['avg_time'] > 0 else 0
+            for engine, stats in results.items()
+        }
+        
+        return {
+            'engine_results': results,
+            'speedup_vs_thread': speedup_vs_thread,
+            'test_config': {
+                'host': host,
+                'ports_tested': total_ports,
+                'timeout': timeout,
+                'iterations': iterations,
+                'max_workers': max_workers,
+                'max_concurrency': max_concurrency
+            }
+        }
+    
+    def print_engine_benchmark_results(self, benchmark_data: Dict):
+        """스캔 엔진 벤치마크 결과 출력"""
+        print("\n" + "="*60)
+        print("스캔 엔진 벤치마크 결과")
+        print("="*60)
+        
+        config = benchmark_data['test_config']
+        print(f"테스트 대상: {config['host']}")
+        print(f"포트 수: {config['ports_tested']}")
+        print(f"타임아웃: {config['timeout']}초")
+        
+        for engine, stats in benchmark_data['engine_results'].items():
+            print(f"\n{engine}:")
+            print(f"  평균 시간: {stats['avg_time']:.3f}초")
+            print(f"  처리량: {stats['ports_per_second']:.0f} ports/s")
+            print(f"  열린 포트: {stats['open_port_count']}개")
+            print(f"  thread 엔진 대비: {benchmark_data['speedup_vs_thread'][engine]:.2f}x")
+    
+    def benchmark_sharding(self, targets: str = "127.0.0.1-16", ports: Any = (1, 2000),
+                           timeout: float = 0.5, max_processes: Optional[int] = None,
+                           max_concurrency: int = 256) -> Dict[str, Any]:
+        """
+        워커 프로세스 수를 1부터 늘려가며 다중 프로세스 스윕의 확장성 측정
+        
+        Args:
+            targets: 스윕 대상 (기본: 루프백 주소 16개)
+            ports: 호스트마다 스캔할 포트
+            timeout: 타임아웃 시간
+            max_processes: 최대 워커 수 (없으면 CPU 코어 수)
+            max_concurrency: 워커 하나의 동시 연결 수
+        
+        Returns:
+            프로세스 수별 벤치마크 결과 딕셔너리
+        """
+        max_processes = max_processes or os.cpu_count() or 1
+        process_counts = []
+        count = 1
+        while count < max_processes:
+            process_counts.append(count)
+            count *= 2
+        process_counts.append(max_processes)
+        
+        print(f"다중 프로세스 스윕 벤치마크 시작: {targets} (프로세스 {process_counts})")
+        
+        results = {}
+        for processes in process_counts:
+            scan_result = scan_network_sharded(targets, ports, timeout, processes=processes,
+                                               max_concurrency=max_concurrency)
+            results[processes] = {
+                'scan_time': scan_result['scan_time'],
+                'total_probes': scan_result['total_probes'],
+                'probes_per_second': scan_result['probes_per_second'],
+                'open_port_count': sum(r['open_port_count'] for r in scan_result['hosts'].values())
+            }
+            print(f"  {processes}개 프로세스: {scan_result['scan_time']:.3f}초, "
+                  f"{scan_result['probes_per_second']:.0f} probes/s")
+        
+        base_time = results[1]['scan_time']
+        return {
+            'process_results': results,
+            'speedup_vs_single': {
+                processes: base_time / stats['scan_time'] if stats['scan_time'] > 0 else 0
+                for processes, stats in results.items()
+            },
+            'test_config': {
+                'targets': targets,
+                'timeout': timeout,
+                'max_processes': max_processes,
+                'max_concurrency': max_concurrency,
+                'cpu_count': os.cpu_count()
+            }
+        }
+    
+    def print_sharding_benchmark_results(self, benchmark_data: Dict):
+        """다중 프로세스 스윕 벤치마크 결과 출력"""
+        print("\n" + "="*60)
+        print("다중 프로세스 스윕 벤치마크 결과")
+        print("="*60)
+        
+        config = benchmark_data['test_config']
+        print(f"테스트 대상: {config['targets']}")
+        print(f"CPU 코어 수: {config['cpu_count']}")
+        
+        for processes, stats in benchmark_data['process_results'].items():
+            print(f"\n{processes}개 프로세스:")
+            print(f"  시간: {stats['scan_time']:.3f}초")
+            print(f"  처리량: {stats['probes_per_second']:.0f} probes/s")
+            print(f"  1개 프로세스 대비: {benchmark_data['speedup_vs_single'][processes]:.2f}x")
+    
     def _analyze_performance(self, results: Dict, fastest_method: str) -> Dict[str, Any]:
         """성능 분석 결과 생성"""
         fastest_time = results[fastest_method]['avg_time']
@@ -220,6 +390,7 @@ class PerformanceOptimizer:
             sample_ports = get_common_ports()[:10]  # 10개 포트로 테스트
         
         print(f"최적 워커 수 탐색 중... (최대 {max_workers})")
+        target_ip = resolve_host(host)['ip']
         
         worker_counts = [10, 25, 50, 75, 100, 150, 200]
         worker_counts = [w for w in worker_counts if w <= max_workers]
@@ -228,15 +399,15 @@ class PerformanceOptimizer:
         best_workers = 50
         
         for workers in worker_counts:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
             with ThreadPoolExecutor(max_workers=workers) as executor:
                 results = list(executor.map(
-                    lambda p: scan_port_basic(host, p, 0.5), 
+                    lambda p: scan_port_basic(target_ip, p, 0.5), 
                     sample_ports
                 ))
             
-            elapsed = time.time() - start_time
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
             print(f"  워커 {workers}개: {elapsed:.3f}초")
             
             if elapsed < best_time:
@@ -258,6 +429,7 @@ class PerformanceOptimizer:
             최적화된 파라미터 딕셔너리
         """
         print(f"'{host}'에 대한 최적 스캔 파라미터 탐색 중...")
+        target_ip = resolve_host(host)['ip']
         
         # 샘플 포트로 테스트
         sample_ports = get_common_ports()[:20]
@@ -269,15 +441,15 @@ class PerformanceOptimizer:
         
         print("\n최적 타임아웃 탐색:")
         for timeout in timeouts:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             success_count = 0
             
             for port in sample_ports[:5]:  # 5개 포트로 빠른 테스트
-                _, is_open, _, _ = scan_port_basic(host, port, timeout)
+                _, is_open, _, _ = scan_port_basic(target_ip, port, timeout)
                 if is_open:
                     success_count += 1
             
-            elapsed = time.time() - start_time
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
             score = (success_count / len(sample_ports[:5])) / elapsed  # 성공률/시간
             
             print(f"  타임아웃 {timeout}초: 점수 {score:.3f}")
@@ -293,22 +465,22 @@ class PerformanceOptimizer:
         print("\n블로킹 vs 논블로킹 성능 비교:")
         
         # 블로킹 테스트
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         blocking_success = 0
         for port in sample_ports[:5]:
-            _, is_open, _, _ = scan_port_basic(host, port, best_timeout)
+            _, is_open, _, _ = scan_port_basic(target_ip, port, best_timeout)
             if is_open:
                 blocking_success += 1
-        blocking_time = time.time() - start_time
+        blocking_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         # 논블로킹 테스트
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         nonblocking_success = 0
         for port in sample_ports[:5]:
-            _, is_open, _, _ = scan_port_nonblocking(host, port, best_timeout)
+            _, is_open, _, _ = scan_port_nonblocking(target_ip, port, best_timeout)
             if is_open:
                 nonblocking_success += 1
-        nonblocking_time = time.time() - start_time
+        nonblocking_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         use_nonblocking = nonblocking_time < blocking_time
         
@@ -355,4 +527,22 @@ def run_performance_benchmark(host: str = "127.0.0.1", port_count: int = 20):
     # 결과 출력
     benchmark.print_benchmark_results(results)
     
-    return results
\ No newline at end of file
+    return results
+
+
+def run_engine_benchmark(host: str = "127.0.0.1", port_range: tuple = (1, 10000),
+                         timeout: float = 0.5, iterations: int = 2):
+    """thread/asyncio/batch 엔진 비교 벤치마크 실행 (기본: 루프백 1-10000번 포트)"""
+    benchmark = PortScanBenchmark()
+    results = benchmark.benchmark_scan_engines(host, port_range, timeout, iterations)
+    benchmark.print_engine_benchmark_results(results)
+    return results
+
+
+def run_sharding_benchmark(targets: str = "127.0.0.1-16", ports: Any = (1, 2000),
+                           timeout: float = 0.5, max_processes: Optional[int] = None):
+    """1~N개 프로세스로 루프백 스윕 확장성 벤치마크 실행"""
+    benchmark = PortScanBenchmark()
+    results = benchmark.benchmark_sharding(targets, ports, timeout, max_processes)
+    benchmark.print_sharding_benchmark_results(results)
+    return results
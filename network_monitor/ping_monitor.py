@@ -1,90 +1,315 @@
 from ping3 import ping
+import socket
 import time
-from .config import DEFAULT_PING_COUNT, DEFAULT_TIMEOUT
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from .config import DEFAULT_PING_COUNT, DEFAULT_TIMEOUT, DEFAULT_PING_CONCURRENCY, DEFAULT_PING_ENGINE, \
+    DEFAULT_PING_INTERVAL, DEFAULT_TCP_PING_PORT
+from .fd_budget import global_fd_budget
+from .icmp_engine import global_icmp_engine, REPLY, LATE, DUPLICATE
+from .ping_stats import rtt_statistics, rtt_array, LOST
+from .resolver import resolve_host, address_family
+from .tcp_ping import tcp_ping_session
 
-def ping_host(host, count=DEFAULT_PING_COUNT, timeout=DEFAULT_TIMEOUT):
+# ping 엔진: native(프로세스가 공유하는 ICMP 소켓 엔진), ping3(패킷마다 소켓을 여는 ping3 라이브러리),
+# tcp(TCP 핸드셰이크 왕복 시간, 권한 불필요)
+PING_ENGINES = ('native', 'ping3', 'tcp')
+
+def _select_engine(host, engine):
+    """
+    사용할 엔진과 대상을 정합니다.
+
+    native와 tcp 엔진은 IP 주소로 보내므로 호스트 이름을 먼저 해석합니다. native 엔진이
+    ICMP 소켓을 열 수 없으면(raw 권한도 없고 ping_group_range에도 속하지 않음) ping3도
+    같은 이유로 실패하므로 tcp 엔진으로 대신합니다.
+
+    Returns:
+        tuple: (엔진 이름, 대상, 대체 이유) - 대상이 None이면 호스트 이름을 해석하지 못한 것,
+            대체 이유는 ICMP 대신 tcp 엔진을 고른 경우에만 있음
+    """
+    if engine not in PING_ENGINES:
+        raise ValueError(f"Unknown ping engine: {engine} (choose from {', '.join(PING_ENGINES)})")
+    if engine == 'ping3':
+        return 'ping3', host, None
+    try:
+        ip = resolve_host(host)['ip']
+    except socket.gaierror:
+        return engine, None, None
+    family = address_family(ip)
+    if engine == 'native' and not global_icmp_engine.available(family):
+        return 'tcp', ip, f"ICMP unavailable: {global_icmp_engine.unavailable_reason(family)}"
+    return engine, ip, None
+
+def _summarize(host, rtts, errors, engine, elapsed, duplicates=0, late=0, reordered=0, fallback_reason=None,
+               tcp_port=None):
+    """
+    패킷 순서대로 기록한 RTT 배열(ms, 손실은 NaN)로 ping_host 형식의 결과를 만듭니다.
+
+    통계는 배열에서 계산하고, 결과에는 JSON으로 그대로 직렬화할 수 있도록 손실을 None으로 바꾼
+    목록과 패킷별 결과를 담습니다.
+    """
+    result = {
+        'host': host,
+        'engine': engine,
+        'fallback': fallback_reason is not None,
+        'fallback_reason': fallback_reason,
+        'tcp_port': tcp_port if engine == 'tcp' else None
+    }
+    result.update(rtt_statistics(rtts))
+    result.update({
+        'duplicates': duplicates,
+        'late': late,
+        'reordered': reordered,
+        'elapsed': elapsed,
+        'rtts': [rtt if rtt == rtt else None for rtt in rtts],
+        'errors': errors,
+        'results': _packet_results(rtts, errors)
+    })
+    return result
+
+def _packet_results(rtts, errors):
+    """RTT 배열을 패킷별 딕셔너리 목록(seq, success, time(ms), error)으로 펼칩니다."""
+    packets = []
+    for seq, rtt in enumerate(rtts):
+        if rtt == rtt:
+            packets.append({'seq': seq, 'success': True, 'time': rtt, 'error': None})
+        else:
+            packets.append({'seq': seq, 'success': False, 'time': None,
+                            'error': errors.get(seq, 'Request timed out')})
+    return packets
+
+def _batch_result(host, batch, target, elapsed, engine='native', fallback_reason=None, tcp_port=None):
+    """PingBatch에서 대상 하나의 결과 (늦게 도착한 응답은 손실로 두고 따로 셈)"""
+    rtts = array('d', (rtt * 1000 for rtt in batch.rtts[target]))
+    errors = dict(batch.errors[target])
+    for seq, rtt in batch.late[target].items():
+        errors[seq] = f"Late reply ({rtt * 1000:.2f} ms)"
+    return _summarize(host, rtts, errors, engine, elapsed, batch.duplicates[target],
+                      len(batch.late[target]), batch.reordered[target], fallback_reason, tcp_port)
+
+def _engine_label(engine, fallback_reason, tcp_port):
+    """진행 상황 출력용 엔진 표시 (예: 'tcp port 80, ICMP unavailable: ...')"""
+    label = f"tcp port {tcp_port}" if engine == 'tcp' else engine
+    return label if fallback_reason is None else f"{label}, {fallback_reason}"
+
+def _ping3_session(host, count, interval, timeout, deadline, on_packet=None):
+    """
+    ping3로 count/interval/deadline을 흉내 냅니다 (응답을 기다린 뒤 다음 요청을 보내므로
+    RTT가 interval보다 길면 그만큼 간격이 늘어남).
+
+    Returns:
+        tuple: (RTT 배열(ms, 손실은 NaN), 패킷별 오류)
+    """
+    rtts = rtt_array()
+    errors = {}
+    start_ns = time.perf_counter_ns()
+    received = 0
+    i = 0
+    while True:
+        if deadline is None and i >= count:
+            break
+        if deadline is not None and (time.perf_counter_ns() - start_ns) / 1e9 >= deadline:
+            break
+        if deadline is not None and count is not None and received >= count:
+            break
+
+        sent_ns = time.perf_counter_ns()
+        wait = timeout if deadline is None else min(timeout, max(0.001, deadline - (sent_ns - start_ns) / 1e9))
+        response_time = ping(host, timeout=wait, unit='ms')
+        error = None
+        if response_time is None:
+            error = 'Request timed out'
+        elif response_time is False:
+            # ping3는 호스트 이름을 해석하지 못하면 False를 반환
+            response_time, error = None, 'Unknown host'
+        rtts.append(LOST if response_time is None else response_time)
+        if error is not None:
+            errors[i] = error
+        else:
+            received += 1
+        if on_packet is not None:
+            on_packet(i, response_time, error)
+        i += 1
+
+        if deadline is None and i >= count:
+            break
+        pause = interval - (time.perf_counter_ns() - sent_ns) / 1e9
+        if pause > 0:
+            time.sleep(pause)
+    return rtts, errors
+
+def ping_host(host, count=DEFAULT_PING_COUNT, timeout=DEFAULT_TIMEOUT, verbose=True, engine=DEFAULT_PING_ENGINE,
+              interval=DEFAULT_PING_INTERVAL, deadline=None, tcp_port=DEFAULT_TCP_PING_PORT):
     """
     지정된 호스트에 ping을 보내고 결과를 반환합니다.
-    
+
+    native 엔진은 응답을 기다리지 않고 interval마다 요청을 보내며(파이프라이닝) 응답은
+    비동기로 맞춥니다. count/interval/deadline은 iputils ping의 -c/-i/-w와 같은 뜻입니다.
+    tcp 엔진은 echo 요청 대신 tcp_port로의 TCP 핸드셰이크 왕복 시간을 재며, ICMP 소켓을
+    열 수 없는 환경에서는 native 대신 자동으로 사용됩니다 (결과의 fallback이 True).
+
     Args:
         host (str): ping을 보낼 호스트 이름 또는 IP 주소
-        count (int): 보낼 ping 패킷 수
-        timeout (int): 타임아웃 시간(초)
-        
+        count (int): 보낼 ping 패킷 수 (deadline이 있으면 받을 응답 수, None이면 deadline까지)
+        timeout (int): 패킷별 응답 대기 시간(초)
+        verbose (bool): ping마다 진행 상황 출력
+        engine (str): 'native'(공유 ICMP 소켓 엔진, 소켓을 열 수 없으면 tcp), 'ping3' 또는 'tcp'
+        interval (float): 요청 간격(초)
+        deadline (float): 전체 제한 시간(초). 지정하면 count개의 응답을 받거나 이 시간이
+            지날 때까지 계속 보냄
+        tcp_port (int): tcp 엔진이 연결할 포트 (열려 있든 닫혀 있든 호스트가 응답하면 성공)
+
     Returns:
-        dict: ping 결과를 포함하는 딕셔너리
+        dict: ping 결과를 포함하는 딕셔너리 ('engine'은 실제로 사용한 엔진, 시간은 ms)
+            - fallback/fallback_reason: ICMP를 쓸 수 없어 tcp 엔진으로 대신했는지와 그 이유
+            - tcp_port: tcp 엔진이 연결한 포트 (다른 엔진이면 None)
+            - min_time/max_time/avg_time, mdev/stddev, jitter(RFC 3550), p50/p90/p99: RTT 통계
+            - loss_bursts/max_loss_burst: 연속 손실 구간 수와 가장 긴 길이
+            - duplicates/late/reordered: 중복/마감 후/순서가 바뀐 응답 수, elapsed: 걸린 시간(초)
+            - rtts: 패킷 순서대로의 RTT 목록(손실은 None), errors: 손실 패킷별 오류
+            - results: 패킷별 결과 목록 (seq, success, time, error)
     """
-    results = []
-    packet_loss = 0
-    
-    print(f"Pinging {host} {count} times with timeout {timeout}s...")
-    
-    for i in range(count):
-        start_time = time.time()
-        response_time = ping(host, timeout=timeout, unit='ms')
-        end_time = time.time()
-        
-        if response_time is None:
-            packet_loss += 1
-            results.append({
-                'seq': i,
-                'success': False,
-                'time': None,
-                'error': 'Request timed out'
-            })
-            print(f"Ping {i+1}/{count}: Failed (Request timed out)")
+    if count is None and deadline is None:
+        count = DEFAULT_PING_COUNT
+    engine, target, fallback_reason = _select_engine(host, engine)
+
+    if verbose:
+        sending = f"{count} times" if deadline is None else f"for up to {deadline}s"
+        print(f"Pinging {host} {sending} every {interval}s with timeout {timeout}s "
+              f"({_engine_label(engine, fallback_reason, tcp_port)})...")
+
+    start_ns = time.perf_counter_ns()
+    if target is None:
+        sent = count or 1
+        return _summarize(host, rtt_array([None] * sent), {i: 'Unknown host' for i in range(sent)}, engine, 0.0,
+                          tcp_port=tcp_port)
+
+    if engine == 'ping3':
+        def on_packet(seq, response_time, error):
+            if error is None:
+                print(f"Ping {seq+1}: Success ({response_time:.2f} ms)")
+            else:
+                print(f"Ping {seq+1}: Failed ({error})")
+
+        rtts, errors = _ping3_session(target, count, interval, timeout, deadline, on_packet if verbose else None)
+        return _summarize(host, rtts, errors, engine, (time.perf_counter_ns() - start_ns) / 1e9)
+
+    def on_result(kind, _, round_, rtt, error):
+        # 수신 스레드에서 응답이 도착하는 순서대로 출력
+        if kind == REPLY:
+            print(f"Ping {round_+1}: Success ({rtt * 1000:.2f} ms)")
+        elif kind == LATE:
+            print(f"Ping {round_+1}: Late reply ({rtt * 1000:.2f} ms)")
+        elif kind == DUPLICATE:
+            print(f"Ping {round_+1}: Success ({rtt * 1000:.2f} ms) (DUP!)")
         else:
-            results.append({
-                'seq': i,
-                'success': True,
-                'time': response_time,
-                'error': None
-            })
-            print(f"Ping {i+1}/{count}: Success ({response_time:.2f} ms)")
-        
-        # 연속 ping 사이에 약간의 간격 추가
-        if i < count - 1:
-            time.sleep(0.5)
-    
-    # 결과 통계 계산
-    successful_pings = [r['time'] for r in results if r['success']]
-    
-    if successful_pings:
-        min_time = min(successful_pings)
-        max_time = max(successful_pings)
-        avg_time = sum(successful_pings) / len(successful_pings)
-    else:
-        min_time = max_time = avg_time = None
-    
-    packet_loss_percent = (packet_loss / count) * 100
-    
-    return {
-        'host': host,
-        'transmitted': count,
-        'received': count - packet_loss,
-        'packet_loss': packet_loss,
-        'packet_loss_percent': packet_loss_percent,
-        'min_time': min_time,
-        'max_time': max_time,
-        'avg_time': avg_time,
-        'results': results
-    }
+            print(f"Ping {round_+1}: Failed ({error})")
+
+    if engine == 'tcp':
+        batch = tcp_ping_session([target], tcp_port, count, interval, timeout, deadline,
+                                 callback=on_result if verbose else None)
+        return _batch_result(host, batch, 0, (time.perf_counter_ns() - start_ns) / 1e9, engine, fallback_reason,
+                             tcp_port)
 
-def ping_multiple_hosts(hosts, count=DEFAULT_PING_COUNT, timeout=DEFAULT_TIMEOUT):
+    batch = global_icmp_engine.session([target], count, interval, timeout, deadline,
+                                       callback=on_result if verbose else None)
+    return _batch_result(host, batch, 0, (time.perf_counter_ns() - start_ns) / 1e9)
+
+def ping_multiple_hosts(hosts, count=DEFAULT_PING_COUNT, timeout=DEFAULT_TIMEOUT,
+                        max_concurrency=DEFAULT_PING_CONCURRENCY, verbose=True, engine=DEFAULT_PING_ENGINE,
+                        interval=DEFAULT_PING_INTERVAL, deadline=None, tcp_port=DEFAULT_TCP_PING_PORT):
     """
-    여러 호스트에 ping을 보내고 결과를 반환합니다.
-    
+    여러 호스트에 동시에 ping을 보내고 결과를 반환합니다.
+
+    native 엔진은 한 세션에서 interval마다 모든 호스트에 echo 요청을 한 소켓으로 보내고
+    응답을 비동기로 맞추므로, 전체 시간은 호스트 수의 합이 아니라 가장 느린 호스트 정도입니다.
+    tcp 엔진으로 보내는 호스트(ICMP를 쓸 수 없어 대신한 경우 포함)도 한 세션에서 함께
+    연결합니다. ping3로 보내야 하는 호스트는 스레드에서 ping_host를 실행하고, 스레드 수와
+    tcp 세션의 동시 소켓 수는 프로세스 fd 예산에서 빌립니다.
+
     Args:
         hosts (list): ping을 보낼 호스트 이름 또는 IP 주소 목록
-        count (int): 각 호스트별 보낼 ping 패킷 수
-        timeout (int): 타임아웃 시간(초)
-        
+        count (int): 각 호스트별 보낼 ping 패킷 수 (ping_host 참고)
+        timeout (int): 패킷별 응답 대기 시간(초)
+        max_concurrency (int): 동시에 응답을 기다릴 최대 요청 수
+        verbose (bool): 호스트별 결과 출력
+        engine (str): 'native', 'ping3' 또는 'tcp' (ping_host 참고)
+        interval (float): 회차 간격(초)
+        deadline (float): 전체 제한 시간(초, ping_host 참고)
+        tcp_port (int): tcp 엔진이 연결할 포트
+
     Returns:
-        dict: 호스트별 ping 결과를 포함하는 딕셔너리
+        dict: 호스트별 ping 결과를 포함하는 딕셔너리 (입력 순서, ping_host와 같은 형식)
     """
+    hosts = list(dict.fromkeys(hosts))
+    if not hosts:
+        return {}
+    if count is None and deadline is None:
+        count = DEFAULT_PING_COUNT
+
+    selected = {host: _select_engine(host, engine) for host in hosts}
+    native_hosts = [host for host in hosts if selected[host][0] == 'native' and selected[host][1] is not None]
+    tcp_hosts = [host for host in hosts if selected[host][0] == 'tcp' and selected[host][1] is not None]
+    session_set = set(native_hosts + tcp_hosts)
+    other_hosts = [host for host in hosts if host not in session_set]
+
+    if verbose:
+        sending = f"{count} times each" if deadline is None else f"for up to {deadline}s"
+        print(f"Pinging {len(hosts)} hosts {sending} (concurrency {max_concurrency})...")
+        reasons = {selected[host][2] for host in tcp_hosts if selected[host][2] is not None}
+        for reason in reasons:
+            print(f"TCP ping on port {tcp_port} instead of ICMP ({reason})")
+
+    def tcp_session(window):
+        start_ns = time.perf_counter_ns()
+        batch = tcp_ping_session([selected[host][1] for host in tcp_hosts], tcp_port, count, interval, timeout,
+                                 deadline, window)
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        return {host: _batch_result(host, batch, target, elapsed, 'tcp', selected[host][2], tcp_port)
+                for target, host in enumerate(tcp_hosts)}
+
     results = {}
-    
-    for host in hosts:
-        results[host] = ping_host(host, count, timeout)
-    
+    workers = 0
+    tcp_window = 0
+    executor = None
+    try:
+        # ping3 호스트, 해석하지 못한 호스트, tcp 세션은 스레드에서 처리하면서 native 세션을 진행
+        futures = {}
+        tcp_future = None
+        if other_hosts or tcp_hosts:
+            workers = global_fd_budget.lease(min(max_concurrency, len(other_hosts)) + bool(tcp_hosts), 'ping')
+            executor = ThreadPoolExecutor(max_workers=workers)
+            if tcp_hosts:
+                tcp_window = global_fd_budget.lease(min(max_concurrency, len(tcp_hosts)), 'ping')
+                tcp_future = executor.submit(tcp_session, tcp_window)
+            futures = {host: executor.submit(ping_host, host, count, timeout, False, selected[host][0],
+                                             interval, deadline, tcp_port)
+                       for host in other_hosts}
+
+        if native_hosts:
+            start_ns = time.perf_counter_ns()
+            batch = global_icmp_engine.session([selected[host][1] for host in native_hosts], count, interval,
+                                               timeout, deadline, window=max_concurrency)
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            for target, host in enumerate(native_hosts):
+                results[host] = _batch_result(host, batch, target, elapsed)
+
+        if tcp_future is not None:
+            results.update(tcp_future.result())
+        for host, future in futures.items():
+            results[host] = future.result()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+            global_fd_budget.release(workers + tcp_window, 'ping')
+
+    results = {host: results[host] for host in hosts}
+    if verbose:
+        for host, result in results.items():
+            if result['avg_time'] is not None:
+                print(f"{host}: {result['received']}/{result['transmitted']} received, "
+                      f"avg {result['avg_time']:.2f} ms")
+            else:
+                print(f"{host}: no reply ({result['transmitted']} sent)")
+
     return results
@@ -0,0 +1,102 @@
+import math
+from array import array
+from typing import Dict, Any, Iterable, List, Optional
+
+# 응답이 없는 패킷은 RTT 배열에 NaN으로 기록
+LOST = math.nan
+
+
+def rtt_array(values: Iterable[Optional[float]] = ()) -> array:
+    """RTT 목록(None은 손실)을 float64 배열로 변환 (손실은 NaN)"""
+    return array('d', (LOST if value is None else value for value in values))
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """정렬된 값의 p 백분위수 (선형 보간, numpy 기본 방식과 같음)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def rtt_statistics(rtts: array) -> Dict[str, Any]:
+    """
+    패킷 순서대로 기록한 RTT 배열(손실은 NaN)의 통계를 계산합니다.
+
+    평균/분산(Welford), 지터, 손실 구간은 배열을 한 번 훑으며 계산하고, 백분위수만
+    수신한 값을 정렬해서 구합니다.
+
+    - mdev: iputils ping의 mdev (모표준편차), stddev: 표본표준편차
+    - jitter: RFC 3550 방식의 지터 (연속 수신 패킷의 RTT 차이를 1/16 이득으로 평활)
+    - loss_bursts: 연속 손실 구간 수, max_loss_burst: 가장 긴 연속 손실 길이
+
+    Returns:
+        dict: transmitted, received, packet_loss, packet_loss_percent, min_time, max_time, avg_time,
+            mdev, stddev, jitter, p50, p90, p99, loss_bursts, max_loss_burst (RTT와 같은 단위)
+    """
+    received = 0
+    mean = 0.0
+    m2 = 0.0
+    minimum = math.inf
+    maximum = -math.inf
+    jitter = 0.0
+    previous = None
+    burst = 0
+    bursts = 0
+    longest = 0
+
+    for value in rtts:
+        if value != value:  # NaN: 손실
+            if burst == 0:
+                bursts += 1
+            burst += 1
+            longest = max(longest, burst)
+            continue
+        burst = 0
+        received += 1
+        delta = value - mean
+        mean += delta / received
+        m2 += delta * (value - mean)
+        if value < minimum:
+            minimum = value
+        if value > maximum:
+            maximum = value
+        if previous is not None:
+            jitter += (abs(value - previous) - jitter) / 16
+        previous = value
+
+    transmitted = len(rtts)
+    packet_loss = transmitted - received
+    stats = {
+        'transmitted': transmitted,
+        'received': received,
+        'packet_loss': packet_loss,
+        'packet_loss_percent': (packet_loss / transmitted) * 100 if transmitted else 0.0,
+        'min_time': None,
+        'max_time': None,
+        'avg_time': None,
+        'mdev': None,
+        'stddev': None,
+        'jitter': None,
+        'p50': None,
+        'p90': None,
+        'p99': None,
+        'loss_bursts': bursts,
+        'max_loss_burst': longest
+    }
+    if received:
+        ordered = sorted(value for value in rtts if value == value)
+        stats.update({
+            'min_time': minimum,
+            'max_time': maximum,
+            'avg_time': mean,
+            'mdev': math.sqrt(m2 / received),
+            'stddev': math.sqrt(m2 / (received - 1)) if received > 1 else 0.0,
+            'jitter': jitter,
+            'p50': percentile(ordered, 50),
+            'p90': percentile(ordered, 90),
+            'p99': percentile(ordered, 99)
+        })
+    return stats
@@ -1,12 +1,20 @@
 import socket
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import errno
 import time
 import select
-from .config import DEFAULT_PORT_RANGE, DEFAULT_TIMEOUT
-from .socket_options import NonBlockingSocketManager, AdvancedSocketOptions
+from collections import deque
+from .config import DEFAULT_PORT_RANGE, DEFAULT_TIMEOUT, DEFAULT_ASYNC_CONCURRENCY
+from .socket_options import NonBlockingSocketManager, AdvancedSocketOptions, read_tcp_rtt
 from .timeout_manager import global_connection_manager, AdaptiveTimeoutManager
+from .resolver import resolve_host, address_family
+from .rate_limiter import global_rate_limiter
+from .services import global_service_registry
+from .pressure import LOCAL_ERRNOS, ResourcePressure, abortive_close, error_name
+from .fd_budget import global_fd_budget
 
-def scan_port(host, port, timeout=DEFAULT_TIMEOUT, use_advanced_options=False, use_adaptive_timeout=False):
+def scan_port(host, port, timeout=DEFAULT_TIMEOUT, use_advanced_options=False, use_adaptive_timeout=False,
+              target_ip=None):
     """
     지정된 호스트의 특정 포트가 열려 있는지 확인합니다.
     
@@ -16,10 +24,18 @@ def scan_port(host, port, timeout=DEFAULT_TIMEOUT, use_advanced_options=False, u
         timeout (float): 연결 타임아웃 시간(초)
         use_advanced_options (bool): 고급 소켓 옵션 사용 여부
         use_adaptive_timeout (bool): 적응형 타임아웃 사용 여부
+        target_ip (str): 미리 해석된 IP 주소 (지정 시 연결에 사용, 없으면 해석 캐시로 해석)
         
     Returns:
         tuple: (port, is_open, service_name, response_time)
     """
+    # 주소 패밀리를 알 수 있도록 IP로 연결 (AAAA 레코드만 있는 호스트도 IPv6로 확인)
+    if target_ip is None:
+        try:
+            target_ip = resolve_host(host)['ip']
+        except OSError:
+            return (port, False, None, None)
+
     # 적응형 타임아웃 사용 시 호스트별 최적 타임아웃 계산
     if use_adaptive_timeout:
         adaptive_timeout = global_connection_manager.get_timeout_for_host(host)
@@ -27,10 +43,11 @@ def scan_port(host, port, timeout=DEFAULT_TIMEOUT, use_advanced_options=False, u
     else:
         actual_timeout = timeout
     
+    address = target_ip
     if use_advanced_options:
-        result = scan_port_nonblocking(host, port, actual_timeout)
+        result = scan_port_nonblocking(address, port, actual_timeout)
     else:
-        result = scan_port_basic(host, port, actual_timeout)
+        result = scan_port_basic(address, port, actual_timeout)
     
     # 적응형 타임아웃 사용 시 결과 기록
     if use_adaptive_timeout:
@@ -41,24 +58,21 @@ def scan_port(host, port, timeout=DEFAULT_TIMEOUT, use_advanced_options=False, u
 
 
 def scan_port_basic(host, port, timeout=DEFAULT_TIMEOUT):
-    """기본 블로킹 소켓을 사용한 포트 스캔"""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    """기본 블로킹 소켓을 사용한 포트 스캔 (host가 IPv6 주소면 AF_INET6 소켓 사용)"""
+    sock = socket.socket(address_family(host), socket.SOCK_STREAM)
     sock.settimeout(timeout)
     
     try:
-        # 연결 시도
-        start_time = time.time()
+        # 연결 시도 (시계 변경의 영향을 받지 않는 perf_counter_ns로 측정)
+        start_ns = time.perf_counter_ns()
         result = sock.connect_ex((host, port))
-        response_time = time.time() - start_time
-        
-        # 서비스 이름 가져오기 시도
-        try:
-            service_name = socket.getservbyport(port)
-        except (socket.error, OSError):
-            service_name = "unknown"
+        response_time = (time.perf_counter_ns() - start_ns) / 1e9
         
+        # 서비스 이름은 열린 포트에 대해서만 조회
         if result == 0:
-            return (port, True, service_name, response_time)
+            # 연결된 소켓은 RST로 닫아 TIME_WAIT로 임시 포트를 점유하지 않도록 함
+            abortive_close(sock)
+            return (port, True, get_service_name(port), response_time)
         else:
             return (port, False, None, None)
     except socket.error:
@@ -72,20 +86,21 @@ def scan_port_nonblocking(host, port, timeout=DEFAULT_TIMEOUT):
     try:
         # 고급 소켓 옵션으로 소켓 생성
         sock = AdvancedSocketOptions.create_socket_with_options(
+            family=address_family(host),
             blocking=False,
             reuse_addr=True,
             nodelay=True
         )
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # 논블로킹 연결 시도
         try:
             sock.connect((host, port))
             # 즉시 연결되는 경우 (보통 localhost)
-            response_time = time.time() - start_time
+            response_time = (time.perf_counter_ns() - start_ns) / 1e9
             service_name = get_service_name(port)
-            sock.close()
+            abortive_close(sock)
             return (port, True, service_name, response_time)
         except socket.error as e:
             if e.errno not in (socket.errno.EINPROGRESS, socket.errno.EALREADY, socket.errno.EWOULDBLOCK):
@@ -99,12 +114,12 @@ def scan_port_nonblocking(host, port, timeout=DEFAULT_TIMEOUT):
         if ready[1] or ready[2]:  # 쓰기 가능하거나 에러 발생
             # 연결 상태 확인
             error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
-            response_time = time.time() - start_time
+            response_time = (time.perf_counter_ns() - start_ns) / 1e9
             
             if error == 0:
                 # 연결 성공
                 service_name = get_service_name(port)
-                sock.close()
+                abortive_close(sock)
                 return (port, True, service_name, response_time)
             else:
                 # 연결 실패
@@ -119,36 +134,459 @@ def scan_port_nonblocking(host, port, timeout=DEFAULT_TIMEOUT):
         return (port, False, None, None)
 
 
-def get_service_name(port):
-    """포트 번호에 대한 서비스 이름 조회"""
+def get_service_name(port, proto='tcp'):
+    """포트 번호에 대한 서비스 이름 조회 (한 번 읽어 둔 서비스 테이블 사용)"""
+    return global_service_registry.lookup(port, proto)
+
+# 지원하는 스캔 엔진
+SCAN_ENGINES = ('thread', 'asyncio', 'batch')
+
+# 포트 탐색 순서: 번호 순 또는 열려 있을 가능성이 높은 순
+SCAN_ORDERS = ('numeric', 'ranked')
+
+# 포트 상태
+PORT_OPEN = 'open'
+PORT_CLOSED = 'closed'
+PORT_FILTERED = 'filtered'
+PORT_OPEN_FILTERED = 'open|filtered'  # UDP: 응답도 ICMP 오류도 없음
+PORT_ERROR = 'error'  # 로컬 자원 부족(임시 포트/fd 고갈)으로 확인하지 못함
+
+# 지원하는 프로토콜
+SCAN_PROTOCOLS = ('tcp', 'udp')
+
+
+def classify_connect_result(err):
+    """
+    connect 결과 errno를 포트 상태로 변환합니다.
+    
+    RST로 거부되면 closed, 타임아웃이나 도달 불가 등 응답이 없으면 filtered로 봅니다.
+    로컬 자원 부족(EADDRNOTAVAIL, EMFILE 등)은 대상과 무관하므로 error로 구분합니다.
+    """
+    if err == 0:
+        return PORT_OPEN
+    if err in (errno.ECONNREFUSED, errno.ECONNRESET):
+        return PORT_CLOSED
+    if err in LOCAL_ERRNOS:
+        return PORT_ERROR
+    return PORT_FILTERED
+
+
+def probe_port(address, port, timeout=DEFAULT_TIMEOUT, nonblocking=False, on_open=None):
+    """
+    연결을 시도하여 포트 상태만 확인합니다 (서비스 이름 조회 없음).
+    
+    Args:
+        address (str): 연결할 IP 주소
+        port (int): 포트 번호
+        timeout (float): 연결 타임아웃 시간(초)
+        nonblocking (bool): 논블로킹 connect + select 사용 여부
+        on_open (callable): 연결 성공 시 (address, port, sock)으로 호출. True를 반환하면
+            소켓 소유권을 넘겨받은 것으로 보고 닫지 않음 (배너 읽기 등)
+        
+    Returns:
+        tuple: (port, state, response_time) - response_time은 열린 포트만 기록,
+            error 상태는 그 자리에 errno
+    """
+    try:
+        sock = socket.socket(address_family(address), socket.SOCK_STREAM)
+    except OSError as e:
+        # fd 한도 등으로 소켓조차 만들지 못함
+        return (port, classify_connect_result(e.errno), e.errno)
+    
+    try:
+        start_ns = time.perf_counter_ns()
+        if nonblocking:
+            sock.setblocking(False)
+            err = sock.connect_ex((address, port))
+            if err in (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK):
+                _, writable, _ = select.select([], [sock], [], timeout)
+                if writable:
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                else:
+                    err = errno.ETIMEDOUT
+        else:
+            sock.settimeout(timeout)
+            err = sock.connect_ex((address, port))
+        response_time = (time.perf_counter_ns() - start_ns) / 1e9
+    except socket.timeout:
+        err, response_time = errno.ETIMEDOUT, None
+    except OSError as e:
+        err, response_time = e.errno or errno.EHOSTUNREACH, None
+    
+    if err == 0:
+        if on_open is None or not on_open(address, port, sock):
+            abortive_close(sock)
+    else:
+        sock.close()
+    
+    state = classify_connect_result(err)
+    if state == PORT_ERROR:
+        return (port, state, err)
+    return (port, state, response_time if state == PORT_OPEN else None)
+
+
+def check_port(host, port, timeout=DEFAULT_TIMEOUT, target_ip=None, kernel_rtt=True):
+    """
+    단일 포트 연결을 확인하고 연결 시간과 커널이 측정한 RTT를 함께 반환합니다 (모니터용).
+    
+    response_time은 connect 호출 전후를 perf_counter_ns로 잰 값이라 스레드 스케줄링과
+    GIL 대기가 섞일 수 있고, kernel_rtt는 TCP_INFO의 tcpi_rtt라 순수한 네트워크 지연입니다.
+    
+    Args:
+        host (str): 호스트 이름 또는 IP 주소
+        port (int): 포트 번호
+        timeout (float): 연결 타임아웃 시간(초)
+        target_ip (str): 미리 해석된 IP 주소 (없으면 해석 캐시로 해석)
+        kernel_rtt (bool): 연결된 소켓에서 TCP_INFO RTT를 읽을지 여부
+        
+    Returns:
+        dict: port, is_open, state, service, response_time(초), kernel_rtt, kernel_rttvar
+            (초, Linux 외 플랫폼이나 닫힌 포트는 None), error(error 상태의 errno 이름)
+    """
+    result = {'port': port, 'is_open': False, 'state': PORT_FILTERED, 'service': None,
+              'response_time': None, 'kernel_rtt': None, 'kernel_rttvar': None, 'error': None}
+    if target_ip is None:
+        try:
+            target_ip = resolve_host(host)['ip']
+        except OSError as e:
+            result['error'] = str(e)
+            return result
+    
+    def capture_rtt(address, port, sock):
+        info = read_tcp_rtt(sock)
+        if info is not None:
+            result['kernel_rtt'], result['kernel_rttvar'] = info['rtt'], info['rttvar']
+        return False
+    
+    _, state, detail = probe_port(target_ip, port, timeout, on_open=capture_rtt if kernel_rtt else None)
+    result['state'] = state
+    if state == PORT_OPEN:
+        result.update({'is_open': True, 'service': get_service_name(port), 'response_time': detail})
+    elif state == PORT_ERROR:
+        result['error'] = error_name(detail)
+    return result
+
+
+def _iter_ports_threaded(ip, ports_to_scan, get_timeout, max_workers, nonblocking, rate_limiter=None,
+                         on_open=None, pressure=None):
+    """
+    스레드 풀 엔진: 포트마다 probe_port를 스레드에서 실행하고 완료 순서대로 결과 생성
+    
+    한 번에 max_workers * 2개까지만 제출하므로 포트 수와 관계없이 메모리 사용량이 일정합니다.
+    로컬 자원 부족으로 실패한 포트는 pressure에 따라 감속한 뒤 다시 시도합니다.
+    """
+    if pressure is None:
+        pressure = ResourcePressure(max_workers * 2)
+    port_iter = iter(ports_to_scan)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = set()
+    retry = deque()
+    attempts = {}
+    
+    try:
+        while True:
+            while len(pending) < min(max_workers * 2, pressure.limit):
+                if retry:
+                    port = retry.popleft()
+                else:
+                    port = next(port_iter, None)
+                    if port is None:
+                        break
+                pause = pressure.pause()
+                if pause > 0:
+                    time.sleep(pause)
+                if rate_limiter is not None:
+                    rate_limiter.acquire(ip)
+                pending.add(executor.submit(probe_port, ip, port, get_timeout(), nonblocking, on_open))
+            
+            if not pending:
+                break
+            
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                port, state, detail = future.result()
+                if state != PORT_ERROR:
+                    pressure.record_success()
+                    yield (port, state, detail)
+                    continue
+                pressure.record_error(detail)
+                tries = attempts.get(port, 0) + 1
+                if tries <= pressure.retries:
+                    attempts[port] = tries
+                    retry.append(port)
+                else:
+                    attempts.pop(port, None)
+                    yield (port, state, detail)
+    finally:
+        # 취소되거나 중단된 경우 대기 중인 작업 정리
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _iter_ports_batch(ip, ports_to_scan, timeout, window, rate_limiter=None, on_open=None, pressure=None):
+    """배치 엔진: 하나의 셀렉터에 연결 중인 소켓 윈도우를 등록하고 완료를 함께 수집"""
+    from .batch_scanner import BatchConnectScanner
+    
+    scan = BatchConnectScanner(timeout, window, rate_limiter, pressure).scan(
+        ((ip, port) for port in ports_to_scan), on_open=on_open)
+    try:
+        for (_, port), state, response_time in scan:
+            yield (port, state, response_time)
+    finally:
+        scan.close()
+
+
+def _iter_ports_udp(ip, ports_to_scan, timeout, window, rate_limiter=None):
+    """UDP 엔진: 연결된 UDP 소켓으로 페이로드를 보내고 응답/ICMP 오류로 상태 판별"""
+    from .udp_scanner import UDPScanner
+    
+    # 호스트별 속도를 직접 지정했다면(--host-rate) UDP 기본 호스트 속도 대신 그 값을 사용
+    if rate_limiter is not None and rate_limiter.per_destination_rate:
+        scanner = UDPScanner(timeout, window, per_host_rate=None, rate_limiter=rate_limiter)
+    else:
+        scanner = UDPScanner(timeout, window, rate_limiter=rate_limiter)
+    scan = scanner.scan((ip, port) for port in ports_to_scan)
     try:
-        return socket.getservbyport(port)
-    except (socket.error, OSError):
-        return "unknown"
+        for (_, port), state, response_time in scan:
+            yield (port, state, response_time)
+    finally:
+        scan.close()
+
+
+def _select_engine(engine, use_advanced_options):
+    """엔진 미지정 시 옵션에 따라 엔진 선택"""
+    if engine is None:
+        # 고급 옵션은 셀렉터 기반 배치 엔진이 담당
+        engine = 'batch' if use_advanced_options else 'thread'
+    if engine not in SCAN_ENGINES:
+        raise ValueError(f"Unknown scan engine: {engine} (choose from {', '.join(SCAN_ENGINES)})")
+    return engine
+
+
+def iter_scan_host(host, port_range=DEFAULT_PORT_RANGE, timeout=DEFAULT_TIMEOUT, max_workers=50,
+                   use_advanced_options=False, use_adaptive_timeout=False, engine=None,
+                   max_concurrency=DEFAULT_ASYNC_CONCURRENCY, target_ip=None, cancel_event=None,
+                   rate_limiter=None, order='numeric', stop_after_open=None, time_budget=None,
+                   on_open=None, protocol='tcp', pressure=None, family=None, kernel_rtt=False):
+    """
+    포트를 스캔하면서 완료되는 순서대로 포트별 결과를 생성하는 제너레이터를 반환
+    
+    모든 엔진이 동시 진행 수만큼의 결과만 들고 있으므로 65535개 포트를 스캔해도
+    메모리 사용량이 일정합니다. cancel_event를 설정하거나 제너레이터를 닫으면
+    진행 중인 연결을 정리하고 중단합니다. 입력 검사와 호스트 이름 해석은 호출 즉시
+    하므로 잘못된 입력은 첫 결과를 꺼낼 때가 아니라 이 함수에서 예외로 알립니다.
+    
+    Args:
+        host (str): 스캔할 호스트 이름 또는 IP 주소
+        port_range: 스캔할 포트 (scan_host와 같은 형식)
+        timeout (float): 연결 타임아웃 시간(초)
+        max_workers (int): 동시에 실행할 최대 스레드 수 (thread 엔진)
+        use_advanced_options (bool): 고급 소켓 옵션 사용 여부
+        use_adaptive_timeout (bool): 적응형 타임아웃 사용 여부
+        engine (str): 스캔 엔진 ('thread', 'asyncio', 'batch', None이면 자동 선택)
+        max_concurrency (int): 동시에 진행할 최대 연결 수 (asyncio/batch 엔진)
+        target_ip (str): 미리 해석된 IP 주소 (없으면 한 번 해석)
+        cancel_event (threading.Event): 설정되면 스캔 중단
+        rate_limiter (RateLimiter): 프로브 속도 제한 (없으면 전역 레이트 리미터)
+        order (str): 'numeric'(번호 순) 또는 'ranked'(스캔 기록과 기본 빈도표에 따라 자주 열리는 순)
+        stop_after_open (int): 열린 포트를 이만큼 찾으면 중단
+        time_budget (float): 스캔에 쓸 최대 시간(초), 넘으면 중단
+        on_open (callable): 연결된 소켓을 넘겨받을 콜백 (probe_port 참고)
+        protocol (str): 'tcp' 또는 'udp' (udp는 엔진 설정과 관계없이 UDP 엔진 사용)
+        pressure (ResourcePressure): 로컬 자원 부족 감지/감속 상태 (없으면 엔진마다 새로 만듦)
+        family (str): 호스트 이름을 해석할 주소 패밀리 ('ipv4'/'ipv6', None이면 IPv4 우선)
+        kernel_rtt (bool): 열린 포트의 연결된 소켓에서 TCP_INFO RTT를 읽어 함께 반환 (TCP, Linux)
+        
+    Yields:
+        dict: port, state('open'/'closed'/'filtered'/'error', UDP는 'open|filtered' 포함), service,
+            response_time, error(error 상태의 errno 이름, 그 밖에는 None).
+            kernel_rtt를 켜면 kernel_rtt, kernel_rttvar(초, 열린 포트만)도 포함
+    
+    Raises:
+        ValueError: 알 수 없는 프로토콜, 엔진, 탐색 순서 또는 잘못된 포트 지정
+        socket.gaierror: 호스트 이름을 해석할 수 없는 경우
+    """
+    if protocol not in SCAN_PROTOCOLS:
+        raise ValueError(f"Unknown protocol: {protocol} (choose from {', '.join(SCAN_PROTOCOLS)})")
+    engine = _select_engine(engine, use_advanced_options)
+    ports_to_scan = normalize_ports(port_range)
+    if order == 'ranked':
+        from .scan_history import rank_ports
+        ports_to_scan = rank_ports(ports_to_scan, host)
+    elif order != 'numeric':
+        raise ValueError(f"Unknown scan order: {order} (choose from {', '.join(SCAN_ORDERS)})")
+    ip = target_ip or resolve_host(host, family)['ip']
+    return _iter_scan_results(host, ip, ports_to_scan, timeout, max_workers, use_adaptive_timeout, engine,
+                              max_concurrency, cancel_event, rate_limiter, stop_after_open, time_budget,
+                              on_open, protocol, pressure, kernel_rtt, use_advanced_options)
+
+
+def _iter_scan_results(host, ip, ports_to_scan, timeout, max_workers, use_adaptive_timeout, engine,
+                       max_concurrency, cancel_event, rate_limiter, stop_after_open, time_budget,
+                       on_open, protocol, pressure, kernel_rtt, use_advanced_options):
+    """iter_scan_host의 본체 (입력 검사와 해석이 끝난 뒤 포트별 결과를 생성)"""
+    deadline = None
+    if time_budget:
+        # 시계 변경(NTP 보정 등)으로 예산이 줄거나 늘지 않도록 단조 시계 기준
+        deadline = time.perf_counter_ns() + int(time_budget * 1e9)
+        # 응답 없는 포트 하나가 시간 예산을 넘기지 않도록 타임아웃도 예산 이내로 제한
+        timeout = min(timeout, time_budget) if timeout else time_budget
+    
+    # 예산이 설정되지 않은 리미터는 엔진에 넘기지 않아 오버헤드를 없앰
+    if rate_limiter is None:
+        rate_limiter = global_rate_limiter
+    if not rate_limiter.enabled:
+        rate_limiter = None
+    
+    def get_timeout():
+        # 적응형 타임아웃 사용 시 호스트별 최적 타임아웃 계산
+        if not use_adaptive_timeout:
+            return timeout
+        adaptive_timeout = global_connection_manager.get_timeout_for_host(host)
+        return min(timeout, adaptive_timeout) if timeout else adaptive_timeout
+    
+    # 동시 연결 수는 프로세스 fd 예산에서 빌린 만큼으로 제한 (스캔이 끝나면 반납)
+    if protocol == 'tcp' and engine == 'thread':
+        fd_lease = max_workers = global_fd_budget.lease(max_workers, 'scan')
+    else:
+        fd_lease = max_concurrency = global_fd_budget.lease(max_concurrency, 'scan')
+    if pressure is not None:
+        pressure.resize(max_workers * 2 if protocol == 'tcp' and engine == 'thread' else max_concurrency)
+    
+    # 연결된 소켓을 닫거나 넘기기 전에 커널이 잰 RTT를 읽어 둠 (모든 TCP 엔진이 on_open을 호출)
+    kernel_rtts = {}
+    kernel_rtt = kernel_rtt and protocol == 'tcp'
+    if kernel_rtt:
+        next_on_open = on_open
+        
+        def on_open(address, port, sock):
+            info = read_tcp_rtt(sock)
+            if info is not None:
+                kernel_rtts[port] = info
+            return next_on_open is not None and next_on_open(address, port, sock)
+    
+    if protocol == 'udp':
+        raw_results = _iter_ports_udp(ip, ports_to_scan, get_timeout(), max_concurrency, rate_limiter)
+    elif engine == 'asyncio':
+        from .async_scanner import iter_async_scan
+        # 이벤트 루프에서는 포트별로 타임아웃을 바꿀 수 없으므로 스캔 시작 시점의 값을 사용
+        raw_results = iter_async_scan(ip, ports_to_scan, get_timeout(), max_concurrency, rate_limiter,
+                                      on_open, pressure)
+    elif engine == 'batch':
+        raw_results = _iter_ports_batch(ip, ports_to_scan, get_timeout(), max_concurrency, rate_limiter,
+                                        on_open, pressure)
+    else:
+        raw_results = _iter_ports_threaded(ip, ports_to_scan, get_timeout, max_workers,
+                                           use_advanced_options, rate_limiter, on_open, pressure)
+    
+    open_found = 0
+    try:
+        for port, state, detail in raw_results:
+            is_open = state == PORT_OPEN
+            # error 상태는 응답 시간 대신 errno를 돌려줌
+            is_error = state == PORT_ERROR
+            response_time = None if is_error else detail
+            
+            # 적응형 타임아웃 사용 시 결과 기록 (로컬 오류는 네트워크 상태와 무관하므로 제외)
+            if use_adaptive_timeout and not is_error:
+                global_connection_manager.record_host_response(host, response_time, is_open)
+            
+            port_result = {
+                'port': port,
+                'state': state,
+                'service': get_service_name(port, protocol) if is_open else None,
+                'response_time': response_time,
+                'error': error_name(detail) if is_error else None
+            }
+            if kernel_rtt:
+                info = kernel_rtts.pop(port, None) or {}
+                port_result['kernel_rtt'] = info.get('rtt')
+                port_result['kernel_rttvar'] = info.get('rttvar')
+            yield port_result
+            
+            if is_open:
+                open_found += 1
+                if stop_after_open and open_found >= stop_after_open:
+                    break
+            if deadline is not None and time.perf_counter_ns() >= deadline:
+                break
+            if cancel_event is not None and cancel_event.is_set():
+                break
+    finally:
+        raw_results.close()
+        global_fd_budget.release(fd_lease, 'scan')
+
 
 def scan_host(host, port_range=DEFAULT_PORT_RANGE, timeout=DEFAULT_TIMEOUT, max_workers=50, 
-              use_advanced_options=False, use_adaptive_timeout=False):
+              use_advanced_options=False, use_adaptive_timeout=False, engine=None,
+              max_concurrency=DEFAULT_ASYNC_CONCURRENCY, cancel_event=None, rate_limiter=None,
+              return_state_map=False, order='numeric', stop_after_open=None, time_budget=None,
+              grab_banners=False, protocol='tcp', checkpoint=None, family=None, kernel_rtt=False):
     """
     지정된 호스트의 포트 범위를 스캔합니다.
     
     Args:
         host (str): 스캔할 호스트 이름 또는 IP 주소
-        port_range (tuple): 스캔할 포트 범위 (시작, 끝)
+        port_range: 스캔할 포트. (시작, 끝) 튜플, 포트 목록/집합/range,
+            또는 "22,80,8000-8100", "common", "top100" 같은 지정 문자열
         timeout (float): 연결 타임아웃 시간(초)
-        max_workers (int): 동시에 실행할 최대 스레드 수
-        use_advanced_options (bool): 고급 소켓 옵션 사용 여부
+        max_workers (int): 동시에 실행할 최대 스레드 수 (thread 엔진)
+        use_advanced_options (bool): 고급 소켓 옵션 사용 여부 (엔진 미지정 시 batch 엔진 사용)
         use_adaptive_timeout (bool): 적응형 타임아웃 사용 여부
+        engine (str): 스캔 엔진 ('thread', 'asyncio', 'batch', None이면 자동 선택)
+        max_concurrency (int): 동시에 진행할 최대 연결 수 (asyncio/batch 엔진)
+        cancel_event (threading.Event): 설정되면 스캔을 중단하고 그때까지의 결과 반환
+        rate_limiter (RateLimiter): 프로브 속도 제한 (없으면 전역 레이트 리미터)
+        return_state_map (bool): 모든 포트의 상태를 담은 PortStateMap을 'port_state_map'으로 함께 반환
+        order (str): 포트 탐색 순서 ('numeric' 또는 'ranked')
+        stop_after_open (int): 열린 포트를 이만큼 찾으면 중단 ("무언가 열려 있는가?" 확인용)
+        time_budget (float): 스캔에 쓸 최대 시간(초)
+        grab_banners (bool): 열린 포트의 연결된 소켓에서 배너를 읽어 open_ports 항목에 추가 (TCP)
+        protocol (str): 'tcp' 또는 'udp'. UDP는 응답이 없으면 'open|filtered'로 분류하고
+            open_filtered_port_count로 따로 집계
+        checkpoint (ScanCheckpoint): 완료된 포트를 기록할 체크포인트. 이전 실행의 기록이 있으면
+            그 포트는 건너뛰고 결과에 합치며, 포트와 프로토콜은 체크포인트의 값을 따름
+        family (str): 호스트 이름을 해석할 주소 패밀리 ('ipv4'/'ipv6', None이면 IPv4 우선,
+            AAAA 레코드만 있으면 IPv6)
+        kernel_rtt (bool): 열린 포트마다 커널이 잰 RTT(TCP_INFO tcpi_rtt/tcpi_rttvar)를
+            open_ports 항목의 kernel_rtt, kernel_rttvar(초)로 함께 기록 (TCP, Linux)
         
     Returns:
         dict: 포트 스캔 결과를 포함하는 딕셔너리
     """
-    start_port, end_port = port_range
-    ports_to_scan = range(start_port, end_port + 1)
+    engine = _select_engine(engine, use_advanced_options)
+    if rate_limiter is None:
+        rate_limiter = global_rate_limiter
+    if checkpoint is not None:
+        if host not in checkpoint.host_index:
+            raise ValueError(f"Checkpoint {checkpoint.scan_id} does not cover host {host}")
+        # 이어서 실행할 때 처음과 같은 스캔이 되도록 체크포인트의 포트/프로토콜 사용
+        port_range = checkpoint.ports
+        protocol = checkpoint.protocol
+    
+    # 모든 포트를 한 번의 동시 스캔으로 처리
+    ports_to_scan = normalize_ports(port_range)
+    start_port, end_port = ports_to_scan[0], ports_to_scan[-1]
+    is_contiguous = len(ports_to_scan) == end_port - start_port + 1
     open_ports = []
+    error_ports = []
+    state_counts = {PORT_OPEN: 0, PORT_CLOSED: 0, PORT_FILTERED: 0, PORT_OPEN_FILTERED: 0, PORT_ERROR: 0}
+    state_map = None
+    if return_state_map:
+        from .port_state import PortStateMap
+        state_map = PortStateMap(end_port)
     
     # 스캔 방법 표시
     methods = []
-    if use_advanced_options:
+    if protocol == 'udp':
+        methods.append(f"UDP (동시 {max_concurrency})")
+        grab_banners = False
+    elif engine == 'asyncio':
+        methods.append(f"asyncio (동시 {max_concurrency})")
+    elif engine == 'batch':
+        methods.append(f"논블로킹 소켓 배치 (셀렉터 윈도우 {max_concurrency})")
+    elif use_advanced_options:
         methods.append("논블로킹 소켓")
     else:
         methods.append("기본 소켓")
@@ -156,48 +594,183 @@ def scan_host(host, port_range=DEFAULT_PORT_RANGE, timeout=DEFAULT_TIMEOUT, max_
     if use_adaptive_timeout:
         methods.append("적응형 타임아웃")
     
+    if order == 'ranked':
+        methods.append("빈도 순")
+    
+    banner_grabber = None
+    if grab_banners:
+        from .banner import global_banner_grabber
+        banner_grabber = global_banner_grabber
+        methods.append("배너 수집")
+    
+    if kernel_rtt and protocol == 'tcp':
+        methods.append("커널 RTT")
+    
+    if rate_limiter.enabled:
+        methods.append(f"속도 제한 {rate_limiter.rate or '-'}/{rate_limiter.per_destination_rate or '-'} pps")
+    
     scan_method = " + ".join(methods)
-    print(f"Scanning {host} for open ports from {start_port} to {end_port}... ({scan_method})")
+    if is_contiguous:
+        print(f"Scanning {host} for open ports from {start_port} to {end_port}... ({scan_method})")
+    else:
+        print(f"Scanning {host} for {len(ports_to_scan)} open ports between {start_port} and {end_port}... ({scan_method})")
+    
+    # 포트마다 이름 해석을 반복하지 않도록 스캔 시작 전에 한 번만 해석
+    resolved = resolve_host(host, family)
+    ip = resolved['ip']
+    if ip != host:
+        print(f"Resolved {host} -> {ip} in {resolved['resolve_time'] * 1000:.1f}ms"
+              f"{' (cached)' if resolved['cached'] else ''}")
     
     # 적응형 타임아웃 사용 시 초기 타임아웃 정보 표시
     if use_adaptive_timeout:
         initial_timeout = global_connection_manager.get_timeout_for_host(host)
         print(f"Initial adaptive timeout for {host}: {initial_timeout:.3f}s")
     
-    start_time = time.time()
-    
-    # 스레드 풀을 사용하여 병렬로 포트 스캔
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # scan_port 함수에 인자를 전달하여 실행
-        scan_results = list(executor.map(
-            lambda p: scan_port(host, p, timeout, use_advanced_options, use_adaptive_timeout), 
-            ports_to_scan
-        ))
-    
-    # 결과 처리
-    for port, is_open, service_name, response_time in scan_results:
-        if is_open:
-            print(f"Port {port} is open ({service_name}) - Response time: {response_time:.4f}s")
-            open_ports.append({
-                'port': port,
-                'service': service_name,
-                'response_time': response_time
-            })
+    # 이전 실행에서 확인한 포트는 체크포인트의 결과를 사용하고 나머지만 스캔
+    remaining_ports = ports_to_scan
+    resumed_ports = 0
+    if checkpoint is not None and host in checkpoint.completed:
+        for port, state, response_time in checkpoint.iter_completed(host):
+            state_counts[state] += 1
+            resumed_ports += 1
+            if state_map is not None:
+                state_map.set(port, state)
+            if state == PORT_OPEN:
+                open_ports.append({
+                    'port': port,
+                    'service': get_service_name(port, protocol),
+                    'response_time': response_time
+                })
+        done = checkpoint.done_ports(host)
+        remaining_ports = [p for p in ports_to_scan if p not in done]
+        print(f"Resuming scan {checkpoint.scan_id}: {resumed_ports} ports already scanned, "
+              f"{len(remaining_ports)} remaining")
+    
+    # 임시 포트/fd 고갈을 감지하면 엔진의 동시 연결 수를 자동으로 줄임 (TCP)
+    pressure = None
+    if protocol == 'tcp':
+        pressure = ResourcePressure(max_workers * 2 if engine == 'thread' else max_concurrency)
+    
+    start_ns = time.perf_counter_ns()
+    
+    # 결과가 완료되는 대로 처리 (열린 포트는 즉시 출력)
+    try:
+        if remaining_ports:
+            for port_result in iter_scan_host(host, remaining_ports, timeout, max_workers,
+                                              use_advanced_options, use_adaptive_timeout, engine,
+                                              max_concurrency, target_ip=ip, cancel_event=cancel_event,
+                                              rate_limiter=rate_limiter, order=order,
+                                              stop_after_open=stop_after_open, time_budget=time_budget,
+                                              on_open=banner_grabber.claim if banner_grabber else None,
+                                              protocol=protocol, pressure=pressure,
+                                              kernel_rtt=kernel_rtt):
+                state_counts[port_result['state']] += 1
+                if state_map is not None:
+                    state_map.set(port_result['port'], port_result['state'])
+                if port_result['state'] == PORT_ERROR:
+                    # 대상과 무관한 로컬 실패: 이유를 따로 보고하고 체크포인트에는 남기지 않아
+                    # 이어서 실행할 때 다시 확인
+                    error_ports.append({'port': port_result['port'], 'error': port_result['error']})
+                    continue
+                if checkpoint is not None:
+                    checkpoint.record(host, port_result['port'], port_result['state'],
+                                      port_result['response_time'])
+                if port_result['state'] == PORT_OPEN:
+                    port_info = {
+                        'port': port_result['port'],
+                        'service': port_result['service'],
+                        'response_time': port_result['response_time']
+                    }
+                    rtt_text = ''
+                    if port_result.get('kernel_rtt') is not None:
+                        port_info['kernel_rtt'] = port_result['kernel_rtt']
+                        port_info['kernel_rttvar'] = port_result['kernel_rttvar']
+                        rtt_text = (f", kernel RTT: {port_result['kernel_rtt'] * 1000:.3f}ms"
+                                    f" (±{port_result['kernel_rttvar'] * 1000:.3f}ms)")
+                    print(f"Port {port_result['port']}/{protocol} is open ({port_result['service']}) - "
+                          f"Response time: {port_result['response_time']:.4f}s{rtt_text}")
+                    open_ports.append(port_info)
+    except BaseException:
+        # 예외로 중단되면(Ctrl+C 포함) 체크포인트를 남겨 --resume으로 이어서 실행
+        if checkpoint is not None:
+            checkpoint.close()
+        raise
     
-    total_time = time.time() - start_time
+    total_time = (time.perf_counter_ns() - start_ns) / 1e9
+    open_ports.sort(key=lambda p: p['port'])
+    ports_scanned = sum(state_counts.values())
+    
+    # 배너 단계는 연결 단계와 따로 진행되므로 스캔이 끝난 뒤 결과를 모음
+    if banner_grabber is not None and open_ports:
+        banners = banner_grabber.collect(ip, [p['port'] for p in open_ports])
+        for port_info in open_ports:
+            info = banners.get(port_info['port'])
+            if info is not None:
+                port_info['banner'] = info['banner']
+                port_info['product'] = info['product']
+                if info['service']:
+                    port_info['detected_service'] = info['service']
+                print(f"Port {port_info['port']} banner: {info['banner']}")
+    
+    # 모든 포트를 확인하기 전에 끝났다면 그 이유
+    stop_reason = None
+    if ports_scanned < len(ports_to_scan):
+        if stop_after_open and len(open_ports) >= stop_after_open:
+            stop_reason = 'open_limit'
+        elif cancel_event is not None and cancel_event.is_set():
+            stop_reason = 'cancelled'
+        elif time_budget:
+            stop_reason = 'time_budget'
+    
+    # 모든 포트를 확인했거나 --stop-after/--time-budget으로 일부러 멈췄으면 체크포인트 삭제
+    # (취소되었거나 error 포트가 남았으면 남겨서 --resume으로 이어서 실행)
+    if checkpoint is not None:
+        finished = ports_scanned - state_counts[PORT_ERROR] == len(ports_to_scan)
+        checkpoint.close(completed=finished or stop_reason in ('open_limit', 'time_budget'))
     
     # 적응형 타임아웃 사용 시 통계 정보 포함
     result = {
         'host': host,
+        'resolved_ip': ip,
+        'address_family': resolved['family_name'],
+        'resolve_time': resolved['resolve_time'],
         'start_port': start_port,
         'end_port': end_port,
-        'total_ports_scanned': len(ports_to_scan),
+        'total_ports_scanned': ports_scanned,
         'open_ports': open_ports,
         'open_port_count': len(open_ports),
+        'closed_port_count': state_counts[PORT_CLOSED],
+        'filtered_port_count': state_counts[PORT_FILTERED],
+        'error_port_count': len(error_ports),
+        'error_ports': sorted(error_ports, key=lambda p: p['port']),
         'scan_time': total_time,
-        'scan_method': scan_method
+        'protocol': protocol,
+        'scan_method': scan_method,
+        'engine': engine,
+        'cancelled': stop_reason == 'cancelled',
+        'stop_reason': stop_reason,
+        'order': order,
+        'rate_stats': {
+            'configured_pps': rate_limiter.rate,
+            'configured_per_host_pps': rate_limiter.per_destination_rate,
+            'achieved_pps': (ports_scanned - resumed_ports) / total_time if total_time > 0 else 0.0
+        }
     }
     
+    if protocol == 'udp':
+        result['open_filtered_port_count'] = state_counts[PORT_OPEN_FILTERED]
+    
+    if pressure is not None:
+        result['resource_pressure'] = pressure.get_stats()
+    
+    if checkpoint is not None:
+        result['scan_id'] = checkpoint.scan_id
+        result['resumed_ports'] = resumed_ports
+    
+    if state_map is not None:
+        result['port_state_map'] = state_map
+    
     if use_adaptive_timeout:
         timeout_stats = global_connection_manager.get_host_manager(host).get_timeout_stats()
         result['timeout_stats'] = timeout_stats
@@ -236,3 +809,134 @@ def get_common_ports():
         5900,  # VNC
         8080   # HTTP Alternate
     ]
+
+
+# 인터넷에서 자주 열려 있는 TCP 포트 (빈도 높은 순, "top N" 스캔에 사용)
+TOP_PORTS = (
+    80, 23, 443, 21, 22, 25, 3389, 110, 445, 139,
+    143, 53, 135, 3306, 8080, 1723, 111, 995, 993, 5900,
+    1025, 587, 8888, 199, 1720, 465, 548, 113, 81, 6001,
+    10000, 514, 5060, 179, 1026, 2000, 8443, 8000, 32768, 554,
+    26, 1433, 49152, 2001, 515, 8008, 49154, 1027, 5666, 646,
+    5000, 5631, 631, 49153, 8081, 2049, 88, 79, 5800, 106,
+    2121, 1110, 49155, 6000, 513, 990, 5357, 427, 49156, 543,
+    544, 5101, 144, 7, 389, 8009, 3128, 444, 9999, 5009,
+    7070, 5190, 3000, 5432, 1900, 3986, 13, 1029, 9, 5051,
+    6646, 49157, 1028, 873, 1755, 2717, 4899, 9100, 119, 37
+)
+
+
+_builtin_port_ranks = None
+
+
+def get_builtin_port_ranks():
+    """
+    기본 포트 빈도표를 반환합니다. get_common_ports()의 포트가 가장 앞서고
+    (TOP_PORTS 순서대로), 그 다음 나머지 TOP_PORTS가 이어집니다.
+    
+    Returns:
+        dict: 포트 번호 -> 순위 (0이 가장 자주 열림)
+    """
+    global _builtin_port_ranks
+    if _builtin_port_ranks is None:
+        common = set(get_common_ports())
+        top_rank = {port: rank for rank, port in enumerate(TOP_PORTS)}
+        ordered = sorted(common, key=lambda p: top_rank.get(p, len(TOP_PORTS)))
+        ordered += [port for port in TOP_PORTS if port not in common]
+        _builtin_port_ranks = {port: rank for rank, port in enumerate(ordered)}
+    return _builtin_port_ranks
+
+
+def get_top_ports(count):
+    """
+    빈도 순으로 상위 count개의 포트 목록을 반환합니다.
+    
+    Args:
+        count (int): 반환할 포트 수 (TOP_PORTS보다 많으면 나머지는 낮은 번호부터 채움)
+        
+    Returns:
+        list: 포트 번호 목록
+    """
+    count = max(0, min(count, 65535))
+    ports = list(TOP_PORTS[:count])
+    if len(ports) < count:
+        seen = set(ports)
+        for port in range(1, 65536):
+            if len(ports) >= count:
+                break
+            if port not in seen:
+                ports.append(port)
+    return ports
+
+
+def parse_port_spec(spec):
+    """
+    포트 지정 문자열을 포트 목록으로 변환합니다.
+    
+    지원 형식: "80", "22,80,443", "8000-8100", "22,80,8000-8100",
+    "common" (일반 포트), "top100" (빈도 상위 100개)
+    
+    Args:
+        spec (str): 포트 지정 문자열
+        
+    Returns:
+        list: 중복이 제거되고 정렬된 포트 번호 목록
+        
+    Raises:
+        ValueError: 형식이 잘못되었거나 포트 번호가 1-65535 범위를 벗어난 경우
+    """
+    ports = set()
+    
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        lowered = part.lower()
+        if lowered == 'common':
+            ports.update(get_common_ports())
+        elif lowered.startswith('top'):
+            ports.update(get_top_ports(int(lowered[3:] or 100)))
+        elif '-' in part:
+            start, end = map(int, part.split('-', 1))
+            if start > end:
+                raise ValueError(f"Invalid port range: {part}")
+            ports.update(range(start, end + 1))
+        else:
+            ports.add(int(part))
+    
+    return _validate_ports(sorted(ports))
+
+
+def _validate_ports(ports):
+    """포트 번호 범위 검증"""
+    if not ports:
+        raise ValueError("No ports to scan")
+    if ports[0] < 1 or ports[-1] > 65535:
+        raise ValueError("Port numbers must be between 1 and 65535")
+    return ports
+
+
+def normalize_ports(ports):
+    """
+    scan_host가 받는 다양한 포트 지정 방식을 정렬된 포트 시퀀스로 변환합니다.
+    
+    Args:
+        ports: (시작, 끝) 튜플, 포트 번호의 이터러블/집합, range, 또는 포트 지정 문자열
+        
+    Returns:
+        range 또는 list: 중복 없이 정렬된 포트 시퀀스
+    """
+    if isinstance(ports, str):
+        return parse_port_spec(ports)
+    
+    # 기존 호출 방식 호환: 두 정수로 된 튜플은 (시작, 끝) 범위
+    if isinstance(ports, tuple) and len(ports) == 2 and all(isinstance(p, int) for p in ports):
+        start_port, end_port = ports
+        if start_port > end_port:
+            raise ValueError(f"Invalid port range: {start_port}-{end_port}")
+        ports = range(start_port, end_port + 1)
+    
+    if isinstance(ports, range) and ports.step == 1:
+        _validate_ports([ports.start, ports.stop - 1] if ports else [])
+        return ports
+    
+    return _validate_ports(sorted(set(int(p) for p in ports)))
@@ -0,0 +1,188 @@
+from typing import Dict, Iterable, List, Optional
+from .port_scanner import get_service_name, PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_OPEN_FILTERED, \
+    PORT_ERROR
+
+# 포트당 2비트 상태 코드
+STATE_UNKNOWN = 0
+STATE_OPEN = 1
+STATE_CLOSED = 2
+STATE_FILTERED = 3
+
+STATE_CODES = {PORT_OPEN: STATE_OPEN, PORT_CLOSED: STATE_CLOSED, PORT_FILTERED: STATE_FILTERED}
+STATE_NAMES = {code: state for state, code in STATE_CODES.items()}
+# UDP의 open|filtered는 2비트에 담을 수 없으므로 filtered로 기록
+STATE_CODES[PORT_OPEN_FILTERED] = STATE_FILTERED
+# 로컬 자원 부족으로 확인하지 못한 포트는 상태를 모르는 것으로 기록
+STATE_CODES[PORT_ERROR] = STATE_UNKNOWN
+
+MAX_PORT = 65535
+
+# 모든 2비트 슬롯의 하위 비트가 1인 마스크 (0b0101...)
+_LOW_BITS = int.from_bytes(b'\x55' * ((MAX_PORT + 1) // 4), 'little')
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+def _iter_slots(mask: int) -> Iterable[int]:
+    """슬롯 마스크에서 설정된 포트 번호를 오름차순으로 생성"""
+    while mask:
+        low = mask & -mask
+        yield (low.bit_length() - 1) >> 1
+        mask ^= low
+
+
+class PortStateMap:
+    """
+    포트당 2비트(UNKNOWN/OPEN/CLOSED/FILTERED)로 상태를 저장하는 비트맵
+
+    65535개 포트 전체도 16KB면 충분하며, 스캔한 최대 포트까지만 버퍼를 할당합니다.
+    집합 연산은 버퍼를 하나의 정수로 바꿔 비트 연산으로 처리하므로 포트 수에 비해 빠릅니다.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, max_port: int = MAX_PORT, data: Optional[bytes] = None):
+        """
+        Args:
+            max_port: 저장할 최대 포트 번호 (버퍼 크기 결정, 더 큰 포트는 set 시 자동 확장)
+            data: to_bytes()로 직렬화한 버퍼 (복원 시)
+        """
+        if data is not None:
+            self.data = bytearray(data)
+        else:
+            self.data = bytearray(max_port // 4 + 1)
+
+    def set(self, port: int, state: str):
+        """포트 상태 기록 (state는 PORT_OPEN/PORT_CLOSED/PORT_FILTERED)"""
+        index, shift = port >> 2, (port & 3) << 1
+        if index >= len(self.data):
+            self.data.extend(bytes(index + 1 - len(self.data)))
+        self.data[index] = (self.data[index] & ~(3 << shift)) | (STATE_CODES[state] << shift)
+
+    def get(self, port: int) -> Optional[str]:
+        """포트 상태 조회 (스캔하지 않은 포트는 None)"""
+        index = port >> 2
+        if index >= len(self.data):
+            return None
+        return STATE_NAMES.get((self.data[index] >> ((port & 3) << 1)) & 3)
+
+    def _value(self) -> int:
+        return int.from_bytes(self.data, 'little')
+
+    def _mask(self, code: int) -> int:
+        """해당 상태인 슬롯의 하위 비트만 1인 마스크"""
+        value = self._value()
+        low = value & _LOW_BITS
+        high = (value >> 1) & _LOW_BITS
+        if code == STATE_OPEN:
+            return low & ~high
+        if code == STATE_CLOSED:
+            return high & ~low
+        if code == STATE_FILTERED:
+            return low & high
+        return _LOW_BITS & ~(low | high)
+
+    def ports(self, state: str = PORT_OPEN) -> List[int]:
+        """해당 상태인 포트 목록 (오름차순)"""
+        return list(_iter_slots(self._mask(STATE_CODES[state])))
+
+    def open_ports(self) -> List[int]:
+        return self.ports(PORT_OPEN)
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 포트 수"""
+        return {state: _popcount(self._mask(code)) for code, state in STATE_NAMES.items()}
+
+    def union(self, other: 'PortStateMap') -> 'PortStateMap':
+        """
+        두 스캔 결과를 합친 새 맵 (이 맵에서 UNKNOWN인 포트는 other의 상태로 채움)
+        """
+        mine, theirs = self._value(), other._value()
+        known = mine | (mine >> 1)
+        known = (known & _LOW_BITS) * 3
+        merged = mine | (theirs & ~known)
+        size = max(len(self.data), len(other.data))
+        return PortStateMap(data=merged.to_bytes(size, 'little'))
+
+    def diff(self, previous: 'PortStateMap') -> Dict[str, List[int]]:
+        """
+        이전 스캔(previous) 대비 열린 포트 변화
+
+        Returns:
+            dict: 'opened' (새로 열린 포트), 'closed' (열려 있었지만 이제 닫히거나 필터된 포트)
+        """
+        now_open = self._mask(STATE_OPEN)
+        was_open = previous._mask(STATE_OPEN)
+        # 이번에 스캔하지 않은 포트는 닫힌 것으로 보지 않음
+        now_known = ~self._mask(STATE_UNKNOWN)
+        return {
+            'opened': list(_iter_slots(now_open & ~was_open)),
+            'closed': list(_iter_slots(was_open & ~now_open & now_known))
+        }
+
+    def to_bytes(self) -> bytes:
+        """직렬화 (프로세스 간 전달/저장용)"""
+        return bytes(self.data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'PortStateMap':
+        return cls(data=data)
+
+    @classmethod
+    def from_result(cls, result: dict) -> 'PortStateMap':
+        """기존 딕셔너리 형식(open_ports)의 스캔 결과에서 열린 포트만 복원"""
+        state_map = cls(max((p['port'] for p in result.get('open_ports', [])), default=0))
+        for port_info in result.get('open_ports', []):
+            state_map.set(port_info['port'], PORT_OPEN)
+        return state_map
+
+    def to_dict(self, response_times: Optional[Dict[int, float]] = None) -> dict:
+        """
+        기존 스캔 결과 형식으로 변환 (open_ports 목록과 상태별 개수)
+
+        Args:
+            response_times: 포트별 응답 시간 (있으면 open_ports에 포함)
+        """
+        counts = self.counts()
+        response_times = response_times or {}
+        return {
+            'open_ports': [{
+                'port': port,
+                'service': get_service_name(port),
+                'response_time': response_times.get(port)
+            } for port in self.open_ports()],
+            'open_port_count': counts[PORT_OPEN],
+            'closed_port_count': counts[PORT_CLOSED],
+            'filtered_port_count': counts[PORT_FILTERED]
+        }
+
+    def __len__(self):
+        """상태가 기록된 포트 수"""
+        value = self._value()
+        return _popcount((value | (value >> 1)) & _LOW_BITS)
+
+    def __eq__(self, other):
+        if not isinstance(other, PortStateMap):
+            return NotImplemented
+        return self._value() == other._value()
+
+
+def open_on_all(maps: Iterable[PortStateMap]) -> List[int]:
+    """모든 맵에서 열려 있는 포트 목록 (예: 모든 호스트에 공통으로 열린 포트)"""
+    common = None
+    for state_map in maps:
+        mask = state_map._mask(STATE_OPEN)
+        common = mask if common is None else common & mask
+        if not common:
+            return []
+    return list(_iter_slots(common or 0))
+
+
+def open_on_any(maps: Iterable[PortStateMap]) -> List[int]:
+    """하나 이상의 맵에서 열려 있는 포트 목록"""
+    combined = 0
+    for state_map in maps:
+        combined |= state_map._mask(STATE_OPEN)
+    return list(_iter_slots(combined))
@@ -0,0 +1,179 @@
+import errno
+import socket
+import struct
+import time
+from collections import Counter
+from typing import Dict, Any, Optional, Tuple
+from .config import DEFAULT_PRESSURE_MIN_WINDOW, DEFAULT_PRESSURE_BACKOFF, DEFAULT_LOCAL_ERROR_RETRIES
+
+# 대상 포트가 아니라 로컬 자원 부족으로 연결을 시작하지 못한 경우의 errno
+# (임시 포트 고갈, 파일 디스크립터 한도, 커널 버퍼 부족)
+LOCAL_ERRNOS = frozenset(code for code in (
+    errno.EADDRNOTAVAIL, errno.EADDRINUSE, errno.EMFILE, errno.ENFILE,
+    errno.ENOBUFS, errno.ENOMEM
+))
+
+# SO_LINGER (켜짐, 0초): close 시 FIN 대신 RST를 보내 TIME_WAIT를 남기지 않음
+_LINGER_ABORT = struct.pack('ii', 1, 0)
+
+_EPHEMERAL_RANGE_FILE = '/proc/sys/net/ipv4/ip_local_port_range'
+# 리눅스 기본 임시 포트 범위 (범위를 읽을 수 없는 플랫폼용)
+_DEFAULT_EPHEMERAL_RANGE = (32768, 60999)
+# 현재 네트워크 네임스페이스의 TCP 소켓 목록 (로컬 주소:포트는 16진수, 상태 06 = TIME_WAIT, 0A = LISTEN)
+_PROC_TCP_FILES = ('/proc/net/tcp', '/proc/net/tcp6')
+_TCP_TIME_WAIT = '06'
+_TCP_LISTEN = '0A'
+
+
+def is_local_error(err: Optional[int]) -> bool:
+    """errno가 로컬 자원 부족을 뜻하는지 여부"""
+    return err in LOCAL_ERRNOS
+
+
+def error_name(err: Optional[int]) -> Optional[str]:
+    """errno 이름 (예: 'EADDRNOTAVAIL')"""
+    if err is None:
+        return None
+    return errno.errorcode.get(err, str(err))
+
+
+def abortive_close(sock: socket.socket):
+    """
+    연결된 프로브 소켓을 RST로 닫습니다.
+
+    일반 close는 먼저 닫은 쪽(스캐너)에 TIME_WAIT를 남겨 임시 포트를 60초 동안 점유하므로
+    대규모 스캔에서는 임시 포트가 고갈됩니다.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_ABORT)
+    except OSError:
+        pass
+    sock.close()
+
+
+def get_ephemeral_port_range() -> Tuple[int, int]:
+    """로컬 임시 포트 범위 (시작, 끝)"""
+    try:
+        with open(_EPHEMERAL_RANGE_FILE, 'r') as f:
+            start, end = map(int, f.read().split())
+        return start, end
+    except (OSError, ValueError):
+        return _DEFAULT_EPHEMERAL_RANGE
+
+
+def get_ephemeral_port_usage() -> Optional[Dict[str, int]]:
+    """
+    임시 포트 범위에서 지금 쓰이고 있는 로컬 포트 수 (/proc/net/tcp, 리눅스 전용)
+
+    Returns:
+        dict: range_size(범위 크기), ports_in_use(사용 중인 포트 수), sockets(해당 소켓 수),
+            time_wait(그중 TIME_WAIT 소켓 수) - /proc을 읽을 수 없으면 None
+    """
+    start, end = get_ephemeral_port_range()
+    ports = set()
+    sockets = 0
+    time_wait = 0
+    found = False
+    for path in _PROC_TCP_FILES:
+        try:
+            with open(path, 'r') as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            continue
+        found = True
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 4 or fields[3] == _TCP_LISTEN:
+                continue
+            port = int(fields[1].rsplit(':', 1)[1], 16)
+            if start <= port <= end:
+                ports.add(port)
+                sockets += 1
+                if fields[3] == _TCP_TIME_WAIT:
+                    time_wait += 1
+    if not found:
+        return None
+    return {
+        'range_size': end - start + 1,
+        'ports_in_use': len(ports),
+        'sockets': sockets,
+        'time_wait': time_wait
+    }
+
+
+class ResourcePressure:
+    """
+    로컬 자원 부족(임시 포트 고갈, fd 한도)을 감지해 스캔 엔진의 동시 연결 수를 자동으로 줄이는 조절기
+
+    커널이 연결을 거부하면(LOCAL_ERRNOS) 동시 연결 한도를 절반으로 줄이고 잠시 새 연결을
+    멈추며, 오류 없이 한도만큼의 프로브가 끝날 때마다 한도를 조금씩 되돌립니다.
+    거부된 프로브는 retries번까지 다시 시도하고, 그래도 실패하면 'error' 상태로 보고합니다.
+    엔진 루프 하나에서만 호출되므로 잠금을 쓰지 않습니다.
+    """
+
+    def __init__(self, window: int, min_window: int = DEFAULT_PRESSURE_MIN_WINDOW,
+                 backoff: float = DEFAULT_PRESSURE_BACKOFF, retries: int = DEFAULT_LOCAL_ERROR_RETRIES):
+        """
+        Args:
+            window: 설정된 동시 연결 수 (한도의 최댓값)
+            min_window: 줄일 수 있는 한도의 최솟값
+            backoff: 거부될 때마다 새 연결을 멈출 시간(초)
+            retries: 거부된 프로브를 다시 시도할 횟수
+        """
+        self.max_window = max(1, window)
+        self.min_window = max(1, min(min_window, self.max_window))
+        self.backoff = backoff
+        self.retries = retries
+        self.limit = self.max_window
+        self.pause_until = 0.0
+        self.successes = 0
+        self.errors = Counter()
+        self.throttle_events = 0
+        self.lowest_limit = self.max_window
+
+    def resize(self, window: int):
+        """한도의 최댓값 변경 (예: fd 예산에서 요청보다 적게 빌린 경우)"""
+        self.max_window = max(1, window)
+        self.min_window = min(self.min_window, self.max_window)
+        self.limit = min(self.limit, self.max_window)
+        self.lowest_limit = min(self.lowest_limit, self.limit)
+
+    def record_error(self, err: int):
+        """로컬 자원 부족으로 실패한 프로브 기록 후 감속"""
+        self.errors[error_name(err)] += 1
+        self.successes = 0
+        self.pause_until = time.monotonic() + self.backoff
+        if self.limit > self.min_window:
+            self.limit = max(self.min_window, self.limit // 2)
+            self.throttle_events += 1
+            self.lowest_limit = min(self.lowest_limit, self.limit)
+
+    def record_success(self):
+        """정상적으로 끝난 프로브 기록 (한도만큼 성공하면 한도를 1/4씩 복구)"""
+        if self.limit >= self.max_window:
+            return
+        self.successes += 1
+        if self.successes >= self.limit:
+            self.successes = 0
+            self.limit = min(self.max_window, self.limit + max(1, self.limit // 4))
+
+    def pause(self) -> float:
+        """새 연결을 시작하기 전에 기다려야 할 시간 (0이면 바로 가능)"""
+        if not self.pause_until:
+            return 0.0
+        remaining = self.pause_until - time.monotonic()
+        if remaining <= 0:
+            self.pause_until = 0.0
+            return 0.0
+        return remaining
+
+    def get_stats(self) -> Dict[str, Any]:
+        """자원 부족 통계 (ephemeral_ports는 지금 시점의 임시 포트 사용량, get_ephemeral_port_usage 참고)"""
+        return {
+            'local_errors': dict(self.errors),
+            'throttle_events': self.throttle_events,
+            'configured_window': self.max_window,
+            'current_window': self.limit,
+            'lowest_window': self.lowest_limit,
+            'ephemeral_ports': get_ephemeral_port_usage()
+        }
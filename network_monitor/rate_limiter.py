@@ -0,0 +1,147 @@
+import threading
+import time
+from typing import Optional, Dict, Any
+from .config import DEFAULT_RATE_BURST_SECONDS
+
+
+class TokenBucket:
+    """초당 rate개의 토큰이 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 토큰 수 (pps)
+            burst: 한 번에 쓸 수 있는 최대 토큰 수 (없으면 DEFAULT_RATE_BURST_SECONDS 분량)
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst else max(1.0, self.rate * DEFAULT_RATE_BURST_SECONDS)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """토큰 하나를 쓰기까지 기다려야 하는 시간 (0이면 즉시 가능)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def consume(self):
+        """토큰 하나 사용"""
+        self.tokens -= 1.0
+
+
+class RateLimiter:
+    """
+    전체 pps 예산과 목적지별 pps 예산을 함께 적용하는 레이트 리미터
+
+    스레드 엔진과 모니터는 acquire()로 블로킹 대기하고, asyncio/배치 엔진은
+    try_acquire()가 돌려주는 대기 시간을 자신의 이벤트 대기 타임아웃에 반영합니다.
+    """
+
+    def __init__(self, rate: Optional[float] = None, per_destination_rate: Optional[float] = None,
+                 burst: Optional[float] = None):
+        """
+        Args:
+            rate: 전체 초당 프로브 수 상한 (None이면 무제한)
+            per_destination_rate: 목적지(IP)별 초당 프로브 수 상한 (None이면 무제한)
+            burst: 버킷 용량 (없으면 rate 기준 자동 계산)
+        """
+        self.lock = threading.Lock()
+        self.configure(rate, per_destination_rate, burst)
+
+    def configure(self, rate: Optional[float] = None, per_destination_rate: Optional[float] = None,
+                  burst: Optional[float] = None):
+        """예산 재설정 (통계도 초기화)"""
+        with self.lock:
+            self.rate = rate
+            self.per_destination_rate = per_destination_rate
+            self.burst = burst
+            self.global_bucket = TokenBucket(rate, burst) if rate else None
+            self.destination_buckets = {}
+            self.granted = 0
+            self.throttled = 0
+            self.first_grant = None
+            self.last_grant = None
+
+    @property
+    def enabled(self) -> bool:
+        """예산이 하나라도 설정되어 있는지 여부"""
+        return bool(self.rate or self.per_destination_rate)
+
+    def try_acquire(self, destination: str) -> float:
+        """
+        프로브 하나의 허가를 시도합니다.
+
+        Returns:
+            float: 0.0이면 허가됨 (토큰 사용), 양수면 그만큼 기다린 뒤 다시 시도해야 함
+        """
+        with self.lock:
+            now = time.monotonic()
+
+            if self.enabled:
+                wait = self.global_bucket.wait_time(now) if self.global_bucket else 0.0
+
+                destination_bucket = None
+                if self.per_destination_rate:
+                    destination_bucket = self.destination_buckets.get(destination)
+                    if destination_bucket is None:
+                        self._prune_destinations(now)
+                        destination_bucket = TokenBucket(self.per_destination_rate, self.burst)
+                        self.destination_buckets[destination] = destination_bucket
+                    wait = max(wait, destination_bucket.wait_time(now))
+
+                if wait > 0:
+                    self.throttled += 1
+                    return wait
+
+                if self.global_bucket:
+                    self.global_bucket.consume()
+                if destination_bucket:
+                    destination_bucket.consume()
+
+            self.granted += 1
+            if self.first_grant is None:
+                self.first_grant = now
+            self.last_grant = now
+            return 0.0
+
+    def acquire(self, destination: str):
+        """허가를 받을 때까지 블로킹 대기"""
+        while True:
+            wait = self.try_acquire(destination)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _prune_destinations(self, now: float):
+        """가득 찬(한동안 쓰이지 않은) 목적지 버킷 정리 - 대규모 스윕 시 메모리 제한"""
+        if len(self.destination_buckets) < 4096:
+            return
+        idle = [dest for dest, bucket in self.destination_buckets.items()
+                if bucket.wait_time(now) == 0 and bucket.tokens >= bucket.capacity]
+        for dest in idle:
+            del self.destination_buckets[dest]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """설정된 속도와 실제 달성 속도 통계"""
+        with self.lock:
+            elapsed = (self.last_grant - self.first_grant) if self.first_grant is not None else 0.0
+            return {
+                'configured_pps': self.rate,
+                'configured_per_destination_pps': self.per_destination_rate,
+                'granted': self.granted,
+                'throttled': self.throttled,
+                'achieved_pps': self.granted / elapsed if elapsed > 0 else 0.0,
+                'destinations': len(self.destination_buckets)
+            }
+
+
+# 전역 인스턴스 (스캐너 엔진과 모니터가 공유, 기본값은 무제한)
+global_rate_limiter = RateLimiter()
+
+
+def configure_rate_limit(rate: Optional[float] = None, per_destination_rate: Optional[float] = None,
+                         burst: Optional[float] = None):
+    """전역 레이트 리미터 설정 편의 함수"""
+    global_rate_limiter.configure(rate, per_destination_rate, burst)
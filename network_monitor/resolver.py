@@ -0,0 +1,145 @@
+import ipaddress
+import socket
+import threading
+import time
+from collections import OrderedDict
+from .config import DEFAULT_RESOLVE_CACHE_TTL, DEFAULT_RESOLVE_CACHE_SIZE
+
+# 주소 패밀리 이름 (명령행/API/결과에서 사용)
+FAMILY_NAMES = {socket.AF_INET: 'ipv4', socket.AF_INET6: 'ipv6'}
+ADDRESS_FAMILIES = ('ipv4', 'ipv6')
+
+
+def address_family(ip: str) -> int:
+    """IP 주소 문자열의 소켓 패밀리 (AF_INET6 또는 AF_INET)"""
+    return socket.AF_INET6 if ':' in ip else socket.AF_INET
+
+
+def _family_constant(family):
+    """'ipv4'/'ipv6' 또는 소켓 상수를 소켓 상수로 변환 (None은 그대로)"""
+    if family is None or family in FAMILY_NAMES:
+        return family
+    for constant, name in FAMILY_NAMES.items():
+        if family == name:
+            return constant
+    raise ValueError(f"Unknown address family: {family} (choose from {', '.join(ADDRESS_FAMILIES)})")
+
+
+class ResolverCache:
+    """호스트 이름 → IP 주소 해석 결과를 TTL 동안 보관하는 캐시"""
+
+    def __init__(self, ttl: float = DEFAULT_RESOLVE_CACHE_TTL, max_entries: int = DEFAULT_RESOLVE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # host -> (expires_at, [(family, ip), ...])
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def resolve_all(self, host: str):
+        """
+        호스트의 모든 주소(A와 AAAA)를 getaddrinfo 순서대로 해석합니다. 캐시를 사용합니다.
+
+        Returns:
+            tuple: ([(family, ip), ...], resolve_time(초), cached)
+
+        Raises:
+            socket.gaierror: 이름 해석에 실패한 경우
+        """
+        # IP 주소 문자열은 조회 없이 그대로 사용 ("[::1]"처럼 괄호로 감싼 IPv6도 허용)
+        try:
+            address = ipaddress.ip_address(host.strip('[]'))
+            return [(address_family(str(address)), str(address))], 0.0, False
+        except ValueError:
+            pass
+
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(host)
+            if entry and entry[0] > now:
+                self.hits += 1
+                self.entries.move_to_end(host)
+                return entry[1], 0.0, True
+            self.misses += 1
+
+        start_ns = time.perf_counter_ns()
+        infos = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+        resolve_time = (time.perf_counter_ns() - start_ns) / 1e9
+        addresses = []
+        for family, _, _, _, sockaddr in infos:
+            if family in FAMILY_NAMES and (family, sockaddr[0]) not in addresses:
+                addresses.append((family, sockaddr[0]))
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f"No IPv4/IPv6 address for {host}")
+
+        with self.lock:
+            self.entries[host] = (time.monotonic() + self.ttl, addresses)
+            self.entries.move_to_end(host)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return addresses, resolve_time, False
+
+    def resolve(self, host: str, family=None) -> dict:
+        """
+        호스트를 IP 주소 하나로 해석합니다. 캐시에 유효한 항목이 있으면 재사용합니다.
+
+        Args:
+            host: 호스트 이름 또는 IP 주소
+            family: 'ipv4' 또는 'ipv6'로 주소 패밀리 지정. None이면 IPv4 주소가 있으면
+                IPv4, AAAA 레코드만 있으면 IPv6 주소를 사용
+
+        Returns:
+            dict: host, ip, family(소켓 상수), family_name, addresses(모든 주소),
+                resolve_time(초), cached 키를 포함하는 딕셔너리
+
+        Raises:
+            socket.gaierror: 이름 해석에 실패했거나 지정한 패밀리의 주소가 없는 경우
+        """
+        wanted = _family_constant(family)
+        addresses, resolve_time, cached = self.resolve_all(host)
+        candidates = [entry for entry in addresses if entry[0] == (wanted or socket.AF_INET)]
+        if not candidates:
+            if wanted is not None:
+                raise socket.gaierror(socket.EAI_NONAME, f"No {FAMILY_NAMES[wanted]} address for {host}")
+            candidates = addresses
+        chosen_family, ip = candidates[0]
+        return {'host': host, 'ip': ip, 'family': chosen_family, 'family_name': FAMILY_NAMES[chosen_family],
+                'addresses': [address for _, address in addresses],
+                'resolve_time': resolve_time, 'cached': cached}
+
+    def invalidate(self, host: str):
+        """특정 호스트의 캐시 항목 제거"""
+        with self.lock:
+            self.entries.pop(host, None)
+
+    def clear(self):
+        """캐시 전체 비우기"""
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self) -> dict:
+        """캐시 통계 반환"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'ttl': self.ttl
+            }
+
+
+# 전역 인스턴스 (스캐너, 모니터, 웹 API가 공유)
+global_resolver_cache = ResolverCache()
+
+
+def resolve_host(host: str, family=None) -> dict:
+    """전역 캐시를 사용하여 호스트를 해석하는 편의 함수"""
+    return global_resolver_cache.resolve(host, family)
+
+
+def resolve_all(host: str):
+    """전역 캐시를 사용하여 호스트의 모든 (family, ip)를 해석하는 편의 함수"""
+    return global_resolver_cache.resolve_all(host)[0]
@@ -0,0 +1,233 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from .config import DEFAULT_TIMEOUT, DEFAULT_PORT_RANGE, DEFAULT_ASYNC_CONCURRENCY, \
+    DEFAULT_SCAN_HISTORY_FILE, DEFAULT_DELTA_SAMPLE_FRACTION
+from .port_scanner import iter_scan_host, normalize_ports, get_builtin_port_ranks, PORT_OPEN, \
+    PORT_ERROR
+from .resolver import resolve_host
+
+
+class ScanHistory:
+    """
+    호스트별 마지막 스캔 결과를 JSON 파일에 저장하는 스캔 기록
+
+    항목 형식: {host: {'open_ports': [...], 'last_scan': ts, 'last_full_scan': ts, 'rotation_offset': n}}
+    """
+
+    def __init__(self, path=DEFAULT_SCAN_HISTORY_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = None
+
+    def _load(self):
+        if self.entries is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+        return self.entries
+
+    def _save(self):
+        # 임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 기록이 깨지지 않도록 함
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, host):
+        """호스트의 마지막 스캔 기록 (없으면 None)"""
+        with self.lock:
+            entry = self._load().get(host)
+            return dict(entry) if entry else None
+
+    def update(self, host, open_ports, rotation_offset=0, full_scan=False):
+        """호스트의 스캔 기록 갱신 후 파일에 저장"""
+        with self.lock:
+            entries = self._load()
+            now = time.time()
+            entry = entries.get(host, {})
+            entry.update({
+                'open_ports': sorted(open_ports),
+                'last_scan': now,
+                'rotation_offset': rotation_offset
+            })
+            if full_scan:
+                entry['last_full_scan'] = now
+            entries[host] = entry
+            self._save()
+
+    def open_port_counts(self):
+        """기록된 모든 호스트에서 각 포트가 열려 있던 횟수"""
+        with self.lock:
+            counts = Counter()
+            for entry in self._load().values():
+                counts.update(entry.get('open_ports', []))
+            return counts
+
+    def forget(self, host):
+        """호스트 기록 삭제 (다음 델타 스캔은 전체 스캔으로 시작)"""
+        with self.lock:
+            if self._load().pop(host, None) is not None:
+                self._save()
+
+
+# 전역 인스턴스
+global_scan_history = ScanHistory()
+
+
+def rank_ports(ports, host=None, history=None):
+    """
+    열려 있을 가능성이 높은 순서로 포트를 정렬합니다.
+
+    순서: 이 호스트에서 이전에 열려 있던 포트 -> 기록 전체에서 자주 열린 포트
+    -> 기본 빈도표(get_builtin_port_ranks) 순 -> 번호 순
+
+    Args:
+        ports: 정렬할 포트 시퀀스
+        host (str): 대상 호스트 (이 호스트의 기록을 가장 우선)
+        history (ScanHistory): 사용할 스캔 기록 (없으면 전역 기록)
+
+    Returns:
+        list: 정렬된 포트 목록
+    """
+    history = history or global_scan_history
+    host_entry = history.get(host) if host else None
+    host_open = set(host_entry['open_ports']) if host_entry else set()
+    seen_counts = history.open_port_counts()
+    builtin_ranks = get_builtin_port_ranks()
+    unranked = len(builtin_ranks)
+
+    return sorted(ports, key=lambda p: (p not in host_open, -seen_counts.get(p, 0),
+                                        builtin_ranks.get(p, unranked), p))
+
+
+def _rotating_sample(ports, offset, count):
+    """ports에서 offset부터 count개를 순환하며 선택"""
+    if not ports or count <= 0:
+        return [], offset
+    count = min(count, len(ports))
+    offset %= len(ports)
+    sample = ports[offset:offset + count]
+    if len(sample) < count:
+        sample += ports[:count - len(sample)]
+    return sample, (offset + count) % len(ports)
+
+
+def delta_scan_host(host, port_range=DEFAULT_PORT_RANGE, timeout=DEFAULT_TIMEOUT,
+                    sample_fraction=DEFAULT_DELTA_SAMPLE_FRACTION, history=None,
+                    engine=None, max_workers=50, max_concurrency=DEFAULT_ASYNC_CONCURRENCY,
+                    use_advanced_options=False, cancel_event=None):
+    """
+    이전 스캔 기록을 바탕으로 변화만 확인하는 델타 스캔을 수행합니다.
+
+    이전에 열려 있던 포트를 먼저 확인한 뒤, 나머지 포트는 매번 sample_fraction만큼
+    순환하며 표본을 확인합니다. 1/sample_fraction 회 실행하면 범위 전체를 한 번 훑게 됩니다.
+    기록이 없으면 전체 스캔으로 기준선을 만듭니다.
+
+    Args:
+        host (str): 스캔할 호스트 이름 또는 IP 주소
+        port_range: 스캔할 포트 (scan_host와 같은 형식)
+        timeout (float): 연결 타임아웃 시간(초)
+        sample_fraction (float): 한 번에 확인할 나머지 포트의 비율 (0~1)
+        history (ScanHistory): 사용할 스캔 기록 (없으면 전역 기록)
+        engine (str): 스캔 엔진 ('thread', 'asyncio', 'batch')
+        max_workers (int): thread 엔진의 최대 스레드 수
+        max_concurrency (int): asyncio/batch 엔진의 동시 연결 수
+        use_advanced_options (bool): 고급 소켓 옵션 사용 여부
+        cancel_event (threading.Event): 설정되면 스캔 중단 (기록은 갱신하지 않음)
+
+    Returns:
+        dict: new_open(새로 열린 포트), newly_closed(새로 닫힌 포트), error_ports(로컬 자원 부족으로
+            확인하지 못해 이전 상태를 유지한 포트)와 프로브 통계
+    """
+    if not 0 < sample_fraction <= 1:
+        raise ValueError(f"sample_fraction must be in (0, 1], got {sample_fraction}")
+
+    history = history or global_scan_history
+    ports_to_scan = normalize_ports(port_range)
+    in_range = set(ports_to_scan)
+    previous = history.get(host)
+    baseline = previous is None
+
+    if baseline:
+        phases = [list(ports_to_scan)]
+        previously_open = []
+        rotation_offset = 0
+    else:
+        previously_open = [p for p in previous['open_ports'] if p in in_range]
+        known_open = set(previously_open)
+        rest = [p for p in ports_to_scan if p not in known_open]
+        sample, rotation_offset = _rotating_sample(
+            rest, previous.get('rotation_offset', 0), math.ceil(len(rest) * sample_fraction))
+        # 이전에 열린 포트를 먼저 확인하고 표본은 그 다음에 확인
+        phases = [previously_open, sample]
+
+    resolved = resolve_host(host)
+    print(f"Delta scanning {host}: {len(previously_open)} previously open ports, "
+          f"{sum(len(p) for p in phases) - len(previously_open)} sampled of {len(ports_to_scan)}"
+          f"{' (baseline full scan)' if baseline else ''}")
+
+    open_now = {}
+    probed = set()
+    error_ports = []
+    start_ns = time.perf_counter_ns()
+    for phase_ports in phases:
+        if not phase_ports:
+            continue
+        for port_result in iter_scan_host(host, phase_ports, timeout, max_workers, use_advanced_options,
+                                          engine=engine, max_concurrency=max_concurrency,
+                                          target_ip=resolved['ip'], cancel_event=cancel_event):
+            if port_result['state'] == PORT_ERROR:
+                # 로컬 자원 부족으로 확인하지 못한 포트는 이전 상태를 유지
+                error_ports.append(port_result['port'])
+                continue
+            probed.add(port_result['port'])
+            if port_result['state'] == PORT_OPEN:
+                open_now[port_result['port']] = port_result
+        if cancel_event is not None and cancel_event.is_set():
+            break
+    total_time = (time.perf_counter_ns() - start_ns) / 1e9
+    cancelled = cancel_event is not None and cancel_event.is_set()
+
+    previously_open_set = set(previously_open)
+    new_open = [{
+        'port': port,
+        'service': open_now[port]['service'],
+        'response_time': open_now[port]['response_time']
+    } for port in sorted(open_now) if port not in previously_open_set]
+    newly_closed = sorted(p for p in previously_open if p in probed and p not in open_now)
+
+    # 이번에 확인하지 못한 포트는 이전 상태를 유지
+    current_open = (previously_open_set - set(newly_closed)) | set(open_now)
+    if not baseline:
+        # 범위 밖의 이전 기록은 그대로 보존
+        current_open |= set(previous['open_ports']) - in_range
+
+    if not cancelled:
+        history.update(host, current_open, rotation_offset, full_scan=baseline)
+
+    for port_info in new_open:
+        print(f"New open port: {port_info['port']} ({port_info['service']})")
+    for port in newly_closed:
+        print(f"Newly closed port: {port}")
+
+    return {
+        'host': host,
+        'resolved_ip': resolved['ip'],
+        'baseline': baseline,
+        'new_open': new_open,
+        'newly_closed': newly_closed,
+        'open_ports': sorted(p for p in current_open if p in in_range),
+        'ports_in_range': len(ports_to_scan),
+        'total_ports_scanned': len(probed),
+        'error_ports': sorted(error_ports),
+        'probe_fraction': len(probed) / len(ports_to_scan) if ports_to_scan else 0.0,
+        'previous_scan': None if baseline else previous.get('last_scan'),
+        'scan_time': total_time,
+        'cancelled': cancelled
+    }
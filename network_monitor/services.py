@@ -0,0 +1,95 @@
+import socket
+import threading
+from typing import Dict, Optional, Tuple
+from .config import DEFAULT_SERVICES_FILE, SERVICE_NAME_OVERRIDES
+
+
+class ServiceRegistry:
+    """
+    (포트, 프로토콜) -> 서비스 이름 테이블
+
+    처음 조회할 때 services 파일을 한 번만 읽어 딕셔너리로 만들고, 이후 조회는
+    딕셔너리 접근만 합니다. 사용자 지정 이름(overrides)이 파일 내용보다 우선합니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_SERVICES_FILE, overrides: Optional[dict] = None):
+        """
+        Args:
+            path: services 파일 경로 (/etc/services 형식)
+            overrides: {포트: 이름} 또는 {'포트/프로토콜': 이름} 형식의 사용자 지정 이름
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.table: Optional[Dict[Tuple[int, str], str]] = None
+        self.overrides: Dict[Tuple[int, str], str] = {}
+        self.file_loaded = False
+        self.set_overrides(overrides or {})
+
+    def _load(self) -> Dict[Tuple[int, str], str]:
+        with self.lock:
+            if self.table is None:
+                self.table = self._parse_services_file()
+        return self.table
+
+    def _parse_services_file(self) -> Dict[Tuple[int, str], str]:
+        """services 파일 파싱 (같은 포트가 여러 번 나오면 첫 항목 사용, libc와 동일)"""
+        table = {}
+        try:
+            with open(self.path, 'r', errors='replace') as f:
+                for line in f:
+                    fields = line.split('#', 1)[0].split()
+                    if len(fields) < 2 or '/' not in fields[1]:
+                        continue
+                    port_text, proto = fields[1].split('/', 1)
+                    if port_text.isdigit():
+                        table.setdefault((int(port_text), proto.lower()), fields[0])
+            self.file_loaded = True
+        except OSError:
+            # services 파일이 없는 플랫폼: 조회 시 소켓 API로 대체하고 결과를 기억
+            self.file_loaded = False
+        return table
+
+    def set_overrides(self, overrides: dict):
+        """사용자 지정 서비스 이름 설정 (기존 지정은 대체)"""
+        parsed = {}
+        for key, name in overrides.items():
+            if isinstance(key, str) and '/' in key:
+                port_text, proto = key.split('/', 1)
+                parsed[(int(port_text), proto.lower())] = name
+            else:
+                parsed[(int(key), 'tcp')] = name
+        self.overrides = parsed
+
+    def register(self, port: int, name: str, proto: str = 'tcp'):
+        """서비스 이름 하나를 사용자 지정으로 등록"""
+        self.overrides[(port, proto.lower())] = name
+
+    def lookup(self, port: int, proto: str = 'tcp') -> str:
+        """서비스 이름 조회 (모르는 포트는 'unknown')"""
+        key = (port, proto)
+        name = self.overrides.get(key)
+        if name is not None:
+            return name
+
+        table = self.table if self.table is not None else self._load()
+        name = table.get(key)
+        if name is not None:
+            return name
+
+        if not self.file_loaded:
+            try:
+                name = socket.getservbyport(port, proto)
+            except (socket.error, OSError):
+                name = "unknown"
+            table[key] = name
+            return name
+        return "unknown"
+
+
+# 전역 인스턴스 (config.SERVICE_NAME_OVERRIDES 적용)
+global_service_registry = ServiceRegistry(overrides=SERVICE_NAME_OVERRIDES)
+
+
+def configure_services(overrides: dict):
+    """전역 서비스 테이블의 사용자 지정 이름 설정"""
+    global_service_registry.set_overrides(overrides)
@@ -0,0 +1,383 @@
+import multiprocessing
+import os
+import socket
+import struct
+import time
+from multiprocessing.connection import wait as wait_connections
+from .config import DEFAULT_TIMEOUT, DEFAULT_PORT_RANGE, DEFAULT_BATCH_WINDOW, DEFAULT_PER_HOST_LIMIT, \
+    DEFAULT_MAX_SWEEP_HOSTS, DEFAULT_SHARD_PROCESSES
+from .port_scanner import normalize_ports, get_service_name, PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_ERROR
+from .batch_scanner import BatchConnectScanner
+from .network_scanner import expand_targets, ProbeScheduler
+from .port_state import PortStateMap, open_on_all
+from .rate_limiter import RateLimiter, global_rate_limiter
+from .resolver import resolve_host
+from .fd_budget import global_fd_budget
+from .discovery import discover_hosts
+from .pressure import error_name
+
+# 워커 -> 부모 이진 메시지 형식
+# 호스트 레코드: 'H', IP 길이, IP, 열린 포트 수, 오류 포트 수, 비트맵 길이
+#               + (포트, 응답 시간) * n + (포트, errno) * m + 비트맵
+# 완료 레코드:   'D', 프로브 수, 소요 시간
+_RECORD_HOST = b'H'
+_RECORD_DONE = b'D'
+_HOST_HEADER = struct.Struct('!cB')
+_HOST_COUNTS = struct.Struct('!HHI')
+_OPEN_PORT = struct.Struct('!Hf')
+_ERROR_PORT = struct.Struct('!HH')
+_DONE = struct.Struct('!cQd')
+
+
+def _pack_host_record(ip, state_map, open_times, errors):
+    ip_bytes = ip.encode('ascii')
+    map_bytes = state_map.to_bytes()
+    parts = [_HOST_HEADER.pack(_RECORD_HOST, len(ip_bytes)), ip_bytes,
+             _HOST_COUNTS.pack(len(open_times), len(errors), len(map_bytes))]
+    parts.extend(_OPEN_PORT.pack(port, rt) for port, rt in sorted(open_times.items()))
+    parts.extend(_ERROR_PORT.pack(port, err) for port, err in sorted(errors.items()))
+    parts.append(map_bytes)
+    return b''.join(parts)
+
+
+def _unpack_host_record(data):
+    """호스트 레코드 해석 -> (ip, PortStateMap, {port: response_time}, {port: errno})"""
+    _, ip_len = _HOST_HEADER.unpack_from(data, 0)
+    offset = _HOST_HEADER.size
+    ip = data[offset:offset + ip_len].decode('ascii')
+    offset += ip_len
+    open_count, error_count, map_len = _HOST_COUNTS.unpack_from(data, offset)
+    offset += _HOST_COUNTS.size
+    open_times = {}
+    for _ in range(open_count):
+        port, rt = _OPEN_PORT.unpack_from(data, offset)
+        open_times[port] = rt
+        offset += _OPEN_PORT.size
+    errors = {}
+    for _ in range(error_count):
+        port, err = _ERROR_PORT.unpack_from(data, offset)
+        errors[port] = err
+        offset += _ERROR_PORT.size
+    return ip, PortStateMap.from_bytes(data[offset:offset + map_len]), open_times, errors
+
+
+def _scan_shard(ips, ports, timeout, max_concurrency, per_host_limit, rate, per_host_rate, conn):
+    """
+    워커 프로세스: 맡은 호스트/포트를 자체 배치 엔진으로 스캔하고 결과를 이진 레코드로 전송
+    """
+    try:
+        # 워커마다 자체 fd 테이블을 가지므로 워커의 fd 예산 안에서 동시 연결 수를 정함
+        max_concurrency = global_fd_budget.lease(max_concurrency, 'scan')
+        limiter = RateLimiter(rate, per_host_rate)
+        scheduler = ProbeScheduler(ips, ports, per_host_limit)
+        scanner = BatchConnectScanner(timeout, max_concurrency, limiter if limiter.enabled else None)
+        max_port = ports[-1] if ports else 0
+        maps = {ip: PortStateMap(max_port) for ip in ips}
+        open_times = {ip: {} for ip in ips}
+        # PortStateMap은 로컬 오류를 UNKNOWN으로만 기록하므로 오류 포트는 errno와 함께 따로 보냄
+        errors = {ip: {} for ip in ips}
+        probes = 0
+
+        start_ns = time.perf_counter_ns()
+        for (ip, port), state, response_time in scanner.scan(scheduler, on_complete=scheduler.release):
+            probes += 1
+            maps[ip].set(port, state)
+            if state == PORT_OPEN:
+                open_times[ip][port] = response_time
+            elif state == PORT_ERROR:
+                errors[ip][port] = response_time
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+
+        for ip in ips:
+            conn.send_bytes(_pack_host_record(ip, maps[ip], open_times[ip], errors[ip]))
+        conn.send_bytes(_DONE.pack(_RECORD_DONE, probes, elapsed))
+    finally:
+        conn.close()
+
+
+def _get_context():
+    # fork가 가능하면 사용 (워커 시작이 빠르고 모듈을 다시 import하지 않음)
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+def _run_shards(shards, ports_for_shard, timeout, max_concurrency, per_host_limit, rate_limiter):
+    """
+    샤드마다 워커 프로세스를 띄우고 이진 레코드를 모아 반환
+
+    완료 레코드를 보내기 전에 연결이 끊긴 워커(예외, OOM, kill)의 샤드는 실패로 돌려주며,
+    그 워커에게서 레코드를 받지 못한 호스트가 실패한 호스트입니다.
+
+    Returns:
+        tuple: ({ip: (PortStateMap, open_times, errors)}, 총 프로브 수, 워커별 소요 시간 목록,
+            {실패한 샤드 번호: (종료 코드, 레코드를 받지 못한 IP 목록)})
+    """
+    context = _get_context()
+    workers = []
+    connections = []
+    shard_count = len(shards)
+
+    # 전체 속도 예산은 워커 수로 나누고, 호스트가 여러 워커에 나뉘면 호스트별 예산도 나눔
+    rate = rate_limiter.rate / shard_count if rate_limiter.rate else None
+    per_host_rate = rate_limiter.per_destination_rate
+    if per_host_rate and len({ip for shard in shards for ip in shard}) < sum(len(s) for s in shards):
+        per_host_rate /= shard_count
+
+    for index, ips in enumerate(shards):
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(target=_scan_shard,
+                                  args=(ips, ports_for_shard(index), timeout, max_concurrency,
+                                        per_host_limit, rate, per_host_rate, child_conn),
+                                  daemon=True)
+        process.start()
+        child_conn.close()
+        workers.append(process)
+        connections.append(parent_conn)
+
+    merged = {}
+    total_probes = 0
+    worker_times = []
+    shard_index = {conn: index for index, conn in enumerate(connections)}
+    received = [set() for _ in shards]
+    done = set()
+    lost = []
+    remaining = list(connections)
+    try:
+        while remaining:
+            for conn in wait_connections(remaining):
+                try:
+                    data = conn.recv_bytes()
+                except EOFError:
+                    remaining.remove(conn)
+                    if conn not in done:
+                        lost.append(shard_index[conn])
+                    continue
+                if data[:1] == _RECORD_DONE:
+                    _, probes, elapsed = _DONE.unpack(data)
+                    total_probes += probes
+                    worker_times.append(elapsed)
+                    done.add(conn)
+                    continue
+                ip, state_map, open_times, errors = _unpack_host_record(data)
+                received[shard_index[conn]].add(ip)
+                if ip in merged:
+                    # 포트 단위로 나눈 경우 같은 호스트의 결과를 합침
+                    previous_map, previous_times, previous_errors = merged[ip]
+                    state_map = previous_map.union(state_map)
+                    open_times.update(previous_times)
+                    errors.update(previous_errors)
+                merged[ip] = (state_map, open_times, errors)
+    finally:
+        for process in workers:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for conn in connections:
+            conn.close()
+
+    failed = {index: (workers[index].exitcode, [ip for ip in shards[index] if ip not in received[index]])
+              for index in lost}
+    return merged, total_probes, worker_times, failed
+
+
+def _host_result(host, ip, state_map, open_times, errors):
+    counts = state_map.counts()
+    return {
+        'host': host,
+        'resolved_ip': ip,
+        'open_ports': [{
+            'port': port,
+            'service': get_service_name(port),
+            'response_time': open_times.get(port)
+        } for port in state_map.open_ports()],
+        'open_port_count': counts[PORT_OPEN],
+        'closed_port_count': counts[PORT_CLOSED],
+        'filtered_port_count': counts[PORT_FILTERED],
+        'error_port_count': len(errors),
+        'error_ports': [{'port': port, 'error': error_name(err)} for port, err in sorted(errors.items())]
+    }
+
+
+def _describe_failures(failed):
+    """실패한 워커 설명 (예: 'worker 1 exited with code -9')"""
+    return ', '.join(f"worker {index} exited with code {exitcode}" for index, (exitcode, _) in sorted(failed.items()))
+
+
+def _rate_stats(rate_limiter, probes, total_time):
+    return {
+        'configured_pps': rate_limiter.rate,
+        'configured_per_host_pps': rate_limiter.per_destination_rate,
+        'achieved_pps': probes / total_time if total_time > 0 else 0.0
+    }
+
+
+def scan_network_sharded(targets, ports=DEFAULT_PORT_RANGE, timeout=DEFAULT_TIMEOUT,
+                         processes=DEFAULT_SHARD_PROCESSES, max_concurrency=DEFAULT_BATCH_WINDOW,
+                         per_host_limit=DEFAULT_PER_HOST_LIMIT, max_hosts=DEFAULT_MAX_SWEEP_HOSTS,
+                         rate_limiter=None, return_state_map=False, family=None, discovery=False,
+                         discovery_ports=None, discovery_ping=False):
+    """
+    여러 호스트를 N개의 워커 프로세스에 나눠 스캔합니다 (scan_network의 다중 프로세스 버전).
+
+    호스트를 워커 수만큼 라운드로빈으로 나누고, 각 워커는 자체 배치 엔진으로 스캔한 뒤
+    호스트별 PortStateMap과 열린 포트의 응답 시간을 이진 레코드로 돌려보냅니다.
+
+    Args:
+        targets: 대상 지정 (expand_targets 형식)
+        ports: 호스트마다 스캔할 포트
+        timeout (float): 연결 타임아웃 시간(초)
+        processes (int): 워커 프로세스 수 (0이면 CPU 코어 수)
+        max_concurrency (int): 워커 하나의 동시 연결 수 상한
+        per_host_limit (int): 호스트별 동시 연결 수 상한
+        max_hosts (int): 펼친 호스트 수 상한
+        rate_limiter (RateLimiter): 전체 예산 (워커 수로 나눠 적용, 없으면 전역 레이트 리미터)
+        return_state_map (bool): 호스트별 PortStateMap과 공통으로 열린 포트를 함께 반환
+        family (str): 호스트 이름을 해석할 주소 패밀리 ('ipv4'/'ipv6', None이면 IPv4 우선)
+        discovery (bool): 워커에 나누기 전에 응답하는 호스트만 골라냄 (scan_network 참고)
+        discovery_ports (list): 탐색 포트 (없으면 DEFAULT_DISCOVERY_PORTS)
+        discovery_ping (bool): 탐색 단계에서 ICMP echo도 확인
+
+    Returns:
+        dict: scan_network와 같은 형식의 결과 (+ processes, worker_times, failed_hosts, incomplete,
+            worker_failures)
+            - failed_hosts: 결과를 보내기 전에 워커가 죽어 스캔하지 못한 호스트 (hosts와
+              open_on_all_hosts에서 제외)
+            - incomplete: 워커가 죽어 일부 호스트를 스캔하지 못했으면 True (cancelled는 항상 False)
+            - worker_failures: 죽은 워커 번호 -> 종료 코드
+    """
+    hosts = expand_targets(targets, max_hosts)
+    ports_to_scan = list(normalize_ports(ports))
+    rate_limiter = rate_limiter or global_rate_limiter
+
+    ip_to_host = {}
+    unresolved = []
+    for host in hosts:
+        try:
+            ip = resolve_host(host, family)['ip']
+        except socket.gaierror:
+            unresolved.append(host)
+            continue
+        ip_to_host.setdefault(ip, host)
+
+    # 탐색은 부모 프로세스에서 한 번만 하고 살아 있는 호스트만 워커에 나눔
+    discovered = None
+    if discovery:
+        discovery_kwargs = {'ports': discovery_ports} if discovery_ports else {}
+        discovered = discover_hosts(list(ip_to_host), timeout=timeout, max_concurrency=max_concurrency,
+                                    use_icmp=discovery_ping, rate_limiter=rate_limiter, **discovery_kwargs)
+        print(f"Discovery found {len(discovered['alive'])}/{discovered['host_count']} live hosts "
+              f"in {discovered['discovery_time']:.2f}s")
+        ip_to_host = {ip: ip_to_host[ip] for ip in discovered['alive']}
+
+    ips = list(ip_to_host)
+    processes = max(1, min(processes or os.cpu_count() or 1, len(ips) or 1))
+    shards = [ips[i::processes] for i in range(processes)]
+
+    print(f"Sweeping {len(ips)} hosts x {len(ports_to_scan)} ports with {processes} processes "
+          f"(concurrency {max_concurrency}/process, per-host {per_host_limit})...")
+
+    start_ns = time.perf_counter_ns()
+    merged, probes, worker_times, failed = _run_shards(shards, lambda index: ports_to_scan, timeout,
+                                                       max_concurrency, per_host_limit, rate_limiter)
+    total_time = (time.perf_counter_ns() - start_ns) / 1e9
+    failed_hosts = [ip_to_host[ip] for _, ips_lost in failed.values() for ip in ips_lost]
+    if failed:
+        print(f"Sharded sweep incomplete: {_describe_failures(failed)}; {len(failed_hosts)} hosts not scanned")
+
+    results_by_host = {}
+    for ip, (state_map, open_times, errors) in merged.items():
+        host = ip_to_host[ip]
+        results_by_host[host] = _host_result(host, ip, state_map, open_times, errors)
+        if return_state_map:
+            results_by_host[host]['port_state_map'] = state_map
+
+    result = {
+        'host_count': len(ips),
+        'ports_per_host': len(ports_to_scan),
+        'total_probes': probes,
+        'hosts': results_by_host,
+        'hosts_with_open_ports': sorted(h for h, r in results_by_host.items() if r['open_ports']),
+        'unresolved_hosts': unresolved,
+        'failed_hosts': failed_hosts,
+        'scan_time': total_time,
+        'probes_per_second': probes / total_time if total_time > 0 else 0,
+        'max_concurrency': max_concurrency,
+        'per_host_limit': per_host_limit,
+        'processes': processes,
+        'worker_times': worker_times,
+        # 다중 프로세스 스캔은 취소할 수 없음 - 워커가 죽은 경우는 incomplete/worker_failures로 구분
+        'cancelled': False,
+        'incomplete': bool(failed),
+        'worker_failures': {index: exitcode for index, (exitcode, _) in sorted(failed.items())},
+        'rate_stats': _rate_stats(rate_limiter, probes, total_time)
+    }
+    if discovered is not None:
+        result['discovery'] = {
+            'host_count': discovered['host_count'],
+            'alive_count': len(discovered['alive']),
+            'down_count': discovered['down_count'],
+            'evidence': {ip_to_host[ip]: evidence for ip, evidence in discovered['evidence'].items()},
+            'evidence_counts': discovered['evidence_counts'],
+            'probes': discovered['probes'],
+            'pings': discovered['pings'],
+            'discovery_time': discovered['discovery_time']
+        }
+        result['down_hosts'] = discovered['down_count']
+    if return_state_map:
+        result['open_on_all_hosts'] = open_on_all(state_map for state_map, _, _ in merged.values())
+    return result
+
+
+def scan_host_sharded(host, port_range=DEFAULT_PORT_RANGE, timeout=DEFAULT_TIMEOUT,
+                      processes=DEFAULT_SHARD_PROCESSES, max_concurrency=DEFAULT_BATCH_WINDOW,
+                      rate_limiter=None, return_state_map=False, family=None):
+    """
+    한 호스트의 포트를 N개의 워커 프로세스에 나눠 스캔합니다 (scan_host의 다중 프로세스 버전).
+
+    포트를 워커 수만큼 번갈아 나누므로 각 워커가 범위 전체에 고르게 분포한 포트를 맡습니다.
+
+    Returns:
+        dict: scan_host와 같은 주요 키를 가진 결과 (+ processes, worker_times)
+
+    Raises:
+        RuntimeError: 워커가 결과를 모두 보내기 전에 종료된 경우 (일부 포트만 스캔됨)
+    """
+    ports_to_scan = list(normalize_ports(port_range))
+    resolved = resolve_host(host, family)
+    ip = resolved['ip']
+    processes = max(1, min(processes or os.cpu_count() or 1, len(ports_to_scan)))
+
+    print(f"Scanning {host} for {len(ports_to_scan)} ports with {processes} processes "
+          f"(concurrency {max_concurrency}/process)...")
+
+    start_ns = time.perf_counter_ns()
+    rate_limiter = rate_limiter or global_rate_limiter
+    merged, probes, worker_times, failed = _run_shards(
+        [[ip]] * processes, lambda index: ports_to_scan[index::processes], timeout,
+        max_concurrency, max_concurrency, rate_limiter)
+    total_time = (time.perf_counter_ns() - start_ns) / 1e9
+    if failed:
+        raise RuntimeError(f"Sharded scan of {host} incomplete: {_describe_failures(failed)}")
+
+    state_map, open_times, errors = merged.get(ip, (PortStateMap(0), {}, {}))
+    result = _host_result(host, ip, state_map, open_times, errors)
+    result.update({
+        'resolve_time': resolved['resolve_time'],
+        'address_family': resolved['family_name'],
+        'start_port': ports_to_scan[0],
+        'end_port': ports_to_scan[-1],
+        'total_ports_scanned': probes,
+        'scan_time': total_time,
+        'scan_method': f"다중 프로세스 배치 ({processes} x {max_concurrency})",
+        'engine': 'batch',
+        'processes': processes,
+        'worker_times': worker_times,
+        'cancelled': False,
+        'stop_reason': None,
+        'protocol': 'tcp',
+        'rate_stats': _rate_stats(rate_limiter, probes, total_time)
+    })
+    if return_state_map:
+        result['port_state_map'] = state_map
+    return result
@@ -1,7 +1,14 @@
 import socket
+import struct
+import sys
 import time
 from typing import Dict, Any, Optional
 
+# Linux struct tcp_info: 1바이트 필드 8개 뒤에 32비트 필드가 이어지며
+# tcpi_rtt/tcpi_rttvar(마이크로초)는 16, 17번째 32비트 필드
+TCP_INFO = getattr(socket, 'TCP_INFO', 11 if sys.platform.startswith('linux') else None)
+_TCP_INFO_RTT = struct.Struct('=8x60xII')
+
 
 class AdvancedSocketOptions:
     """고급 소켓 옵션 설정 및 관리 클래스"""
@@ -214,7 +221,7 @@ class NonBlockingSocketManager:
             raise ValueError(f"Socket {socket_id} not found")
         
         sock = self.sockets[socket_id]['socket']
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             sock.connect(address)
@@ -222,7 +229,7 @@ class NonBlockingSocketManager:
         except socket.error as e:
             if e.errno == socket.errno.EINPROGRESS or e.errno == socket.errno.EALREADY:
                 # 연결이 진행 중
-                while time.time() - start_time < timeout:
+                while (time.perf_counter_ns() - start_ns) / 1e9 < timeout:
                     try:
                         # 소켓이 쓰기 가능한지 확인 (연결 완료)
                         import select
@@ -254,10 +261,10 @@ class NonBlockingSocketManager:
             raise ValueError(f"Socket {socket_id} not found")
         
         sock = self.sockets[socket_id]['socket']
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         total_sent = 0
         
-        while total_sent < len(data) and time.time() - start_time < timeout:
+        while total_sent < len(data) and (time.perf_counter_ns() - start_ns) / 1e9 < timeout:
             try:
                 sent = sock.send(data[total_sent:])
                 if sent == 0:
@@ -288,9 +295,9 @@ class NonBlockingSocketManager:
             raise ValueError(f"Socket {socket_id} not found")
         
         sock = self.sockets[socket_id]['socket']
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        while time.time() - start_time < timeout:
+        while (time.perf_counter_ns() - start_ns) / 1e9 < timeout:
             try:
                 data = sock.recv(buffer_size)
                 if data:
@@ -348,4 +355,23 @@ def create_udp_socket(host: str = '', port: int = 0, **options) -> socket.socket
     )
     if host or port:
         sock.bind((host, port))
-    return sock
\ No newline at end of file
+    return sock
+
+def read_tcp_rtt(sock: socket.socket) -> Optional[Dict[str, float]]:
+    """
+    연결된 TCP 소켓에서 커널이 측정한 RTT를 읽습니다 (Linux TCP_INFO).
+
+    connect 직후에는 SYN/SYN-ACK 왕복으로 잰 값이므로 파이썬 스케줄링, GIL 대기,
+    시계 변경의 영향을 받지 않는 실제 네트워크 지연입니다.
+
+    Returns:
+        dict: rtt, rttvar (초). TCP_INFO를 지원하지 않는 플랫폼이거나 읽지 못하면 None
+    """
+    if TCP_INFO is None:
+        return None
+    try:
+        data = sock.getsockopt(socket.IPPROTO_TCP, TCP_INFO, _TCP_INFO_RTT.size)
+        rtt, rttvar = _TCP_INFO_RTT.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    return {'rtt': rtt / 1e6, 'rttvar': rttvar / 1e6}
@@ -0,0 +1,154 @@
+import errno
+import heapq
+import itertools
+import selectors
+import socket
+import time
+from collections import deque
+from typing import Callable, List, Optional
+from .config import DEFAULT_TIMEOUT, DEFAULT_PING_INTERVAL, DEFAULT_TCP_PING_PORT
+from .icmp_engine import PingBatch, REPLY, TIMEOUT, SEND_ERROR
+from .pressure import abortive_close, error_name
+from .resolver import address_family
+
+# 호스트가 응답했다고 보는 connect 결과: SYN-ACK(포트 열림) 또는 RST(포트 닫힘)
+_ANSWERED = (0, errno.ECONNREFUSED)
+_IN_PROGRESS = (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK)
+
+
+def tcp_ping_session(ips: List[str], port: int = DEFAULT_TCP_PING_PORT, count: Optional[int] = 1,
+                     interval: float = DEFAULT_PING_INTERVAL, timeout: float = DEFAULT_TIMEOUT,
+                     deadline: Optional[float] = None, window: Optional[int] = None,
+                     callback: Optional[Callable] = None) -> PingBatch:
+    """
+    ICMP 대신 TCP 핸드셰이크 왕복 시간으로 ping을 흉내 냅니다 (권한 없이 동작).
+
+    프로브마다 비블로킹 소켓 하나로 port에 연결하고, SYN을 보낸 뒤 SYN-ACK(열림)나
+    RST(닫힘)가 올 때까지를 RTT로 기록합니다. 어느 쪽이든 호스트가 응답한 것이므로 성공이며,
+    소켓은 결과가 나오는 즉시 abortive_close로 닫아 TIME_WAIT를 남기지 않습니다.
+    count/interval/deadline/window는 ICMPEngine.session과 같은 뜻이고 결과도 같은
+    PingBatch로 돌려주므로 ping 통계를 그대로 계산할 수 있습니다 (callback은 호출한 스레드에서 실행).
+
+    Args:
+        ips: 대상 IP 주소 목록 (회차마다 모든 대상에 하나씩 연결)
+        port: 연결할 TCP 포트
+        count: 대상별 프로브 수 (deadline이 있으면 필요한 응답 수)
+        interval: 회차 간격(초)
+        timeout: 프로브별 응답 대기 시간(초)
+        deadline: 세션 전체 제한 시간(초)
+        window: 동시에 열어 둘 최대 소켓 수 (None이면 제한 없음)
+        callback: PingBatch 참고
+
+    Returns:
+        PingBatch: 대상별, 회차별 결과
+    """
+    if count is None and deadline is None:
+        raise ValueError('count or deadline is required')
+    batch = PingBatch(len(ips), callback)
+    selector = selectors.DefaultSelector()
+    in_flight = {}  # fd -> (sock, target, round, sent_ns, probe_id)
+    deadlines = []  # (deadline_ns, probe_id, fd) 힙
+    queue = deque()  # 윈도우가 비기를 기다리는 (target, round)
+    probe_ids = itertools.count()
+    start_ns = time.perf_counter_ns()
+    interval_ns = int(max(0.0, interval) * 1e9)
+    timeout_ns = int(timeout * 1e9)
+    end_ns = start_ns + int(deadline * 1e9) if deadline is not None else None
+    round_ = 0
+    next_round_ns = start_ns
+
+    def satisfied(target):
+        return deadline is not None and count is not None and batch.received[target] >= count
+
+    def more_rounds():
+        return deadline is not None or round_ < count
+
+    def finish(fd, err, done_ns):
+        sock, target, probe_round, sent_ns, _ = in_flight.pop(fd)
+        selector.unregister(fd)
+        abortive_close(sock)
+        if err in _ANSWERED:
+            batch._record(REPLY, target, probe_round, (done_ns - sent_ns) / 1e9)
+        else:
+            batch._record(SEND_ERROR, target, probe_round, error=error_name(err))
+
+    def connect(target, probe_round):
+        batch._add(target, probe_round, None)
+        sock = None
+        sent_ns = time.perf_counter_ns()
+        try:
+            sock = socket.socket(address_family(ips[target]), socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex((ips[target], port))
+        except OSError as e:
+            err = e.errno
+        if err in _IN_PROGRESS:
+            fd = sock.fileno()
+            probe_id = next(probe_ids)
+            selector.register(fd, selectors.EVENT_WRITE)
+            in_flight[fd] = (sock, target, probe_round, sent_ns, probe_id)
+            heapq.heappush(deadlines, (sent_ns + timeout_ns, probe_id, fd))
+            return
+        # 즉시 연결/거부 (보통 localhost) 또는 소켓을 열지 못함
+        done_ns = time.perf_counter_ns()
+        if sock is not None:
+            abortive_close(sock)
+        if err in _ANSWERED:
+            batch._record(REPLY, target, probe_round, (done_ns - sent_ns) / 1e9)
+        else:
+            batch._record(SEND_ERROR, target, probe_round, error=error_name(err))
+
+    try:
+        while True:
+            now_ns = time.perf_counter_ns()
+            if end_ns is not None and now_ns >= end_ns:
+                break
+            if deadline is not None and all(satisfied(t) for t in range(len(ips))):
+                break
+
+            # 회차 시작 (앞 회차가 윈도우를 기다리는 중이면 미룸)
+            if not queue and more_rounds() and now_ns >= next_round_ns:
+                queue.extend((target, round_) for target in range(len(ips)) if not satisfied(target))
+                round_ += 1
+                next_round_ns = start_ns + round_ * interval_ns
+            while queue and (not window or len(in_flight) < window):
+                target, probe_round = queue.popleft()
+                if not satisfied(target):
+                    connect(target, probe_round)
+
+            if not queue and not more_rounds() and not in_flight:
+                break
+
+            # 다음 회차, 가장 이른 프로브 마감, 세션 마감 중 먼저 오는 시각까지 대기
+            wake_ns = deadlines[0][0] if deadlines else None
+            if not queue and more_rounds():
+                wake_ns = next_round_ns if wake_ns is None else min(wake_ns, next_round_ns)
+            if end_ns is not None:
+                wake_ns = end_ns if wake_ns is None else min(wake_ns, end_ns)
+            wait = None if wake_ns is None else max(0.0, (wake_ns - time.perf_counter_ns()) / 1e9)
+
+            for key, _ in selector.select(wait):
+                done_ns = time.perf_counter_ns()
+                sock = in_flight[key.fd][0]
+                finish(key.fd, sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR), done_ns)
+
+            now_ns = time.perf_counter_ns()
+            while deadlines and deadlines[0][0] <= now_ns:
+                _, probe_id, fd = heapq.heappop(deadlines)
+                entry = in_flight.get(fd)
+                # 이미 응답을 받았거나 fd가 다른 프로브에 재사용된 경우
+                if entry is None or entry[4] != probe_id:
+                    continue
+                in_flight.pop(fd)
+                selector.unregister(fd)
+                abortive_close(entry[0])
+                batch._record(TIMEOUT, entry[1], entry[2], error='Request timed out')
+    finally:
+        # 세션 마감까지 응답이 없는 프로브는 손실로 처리
+        for fd, (sock, target, probe_round, _, _) in list(in_flight.items()):
+            selector.unregister(fd)
+            abortive_close(sock)
+            batch._record(TIMEOUT, target, probe_round, error='No reply before deadline')
+        in_flight.clear()
+        selector.close()
+    return batch
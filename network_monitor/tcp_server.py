@@ -3,6 +3,7 @@ import threading
 import time
 from datetime import datetime
 from .socket_options import AdvancedSocketOptions
+from .fd_budget import global_fd_budget
 
 class TCPEchoServer:
     def __init__(self, host='localhost', port=8080, use_advanced_options=True):
@@ -36,6 +37,9 @@ class TCPEchoServer:
             print("Waiting for connection...")
             
             while self.running:
+                # 클라이언트 연결마다 fd 허가를 받아, 허가가 없으면 accept를 미룸 (백로그에서 대기)
+                if not global_fd_budget.acquire(1, 'server', timeout=1.0):
+                    continue
                 try:
                     client_socket, client_address = self.socket.accept()
                     print(f"Connection from {client_address}")
@@ -43,6 +47,7 @@ class TCPEchoServer:
                     self._handle_client(client_socket, client_address)
                     
                 except socket.error as e:
+                    global_fd_budget.release(1, 'server')
                     if self.running:
                         print(f"Socket error: {e}")
                     break
@@ -75,6 +80,9 @@ class TCPEchoServer:
             print("Waiting for connections...")
             
             while self.running:
+                # 클라이언트 연결마다 fd 허가를 받아, 허가가 없으면 accept를 미룸 (백로그에서 대기)
+                if not global_fd_budget.acquire(1, 'server', timeout=1.0):
+                    continue
                 try:
                     client_socket, client_address = self.socket.accept()
                     print(f"New connection from {client_address}")
@@ -89,6 +97,7 @@ class TCPEchoServer:
                     self.clients.append(client_thread)
                     
                 except socket.error as e:
+                    global_fd_budget.release(1, 'server')
                     if self.running:
                         print(f"Socket error: {e}")
                     break
@@ -125,6 +134,7 @@ class TCPEchoServer:
             print(f"Error handling client {client_address}: {e}")
         finally:
             client_socket.close()
+            global_fd_budget.release(1, 'server')
             print(f"Connection with {client_address} closed")
             
     def stop(self):
@@ -27,11 +27,11 @@ class PreciseTimeoutManager:
             seconds: 타임아웃 시간 (초, 소수점 지원)
             error_message: 타임아웃 시 에러 메시지
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         timeout_id = None
         
         def timeout_handler():
-            elapsed = time.time() - start_time
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
             if elapsed >= seconds:
                 raise TimeoutError(f"{error_message} (after {elapsed:.3f}s)")
         
@@ -40,7 +40,7 @@ class PreciseTimeoutManager:
                 self.timeout_counter += 1
                 timeout_id = self.timeout_counter
                 self.active_timeouts[timeout_id] = {
-                    'start_time': start_time,
+                    'start_ns': start_ns,
                     'timeout_seconds': seconds,
                     'handler': timeout_handler
                 }
@@ -59,7 +59,7 @@ class PreciseTimeoutManager:
                 return False
             
             timeout_info = self.active_timeouts[timeout_id]
-            elapsed = time.time() - timeout_info['start_time']
+            elapsed = (time.perf_counter_ns() - timeout_info['start_ns']) / 1e9
             return elapsed >= timeout_info['timeout_seconds']
     
     def get_remaining_time(self, timeout_id: int) -> float:
@@ -69,7 +69,7 @@ class PreciseTimeoutManager:
                 return 0.0
             
             timeout_info = self.active_timeouts[timeout_id]
-            elapsed = time.time() - timeout_info['start_time']
+            elapsed = (time.perf_counter_ns() - timeout_info['start_ns']) / 1e9
             remaining = timeout_info['timeout_seconds'] - elapsed
             return max(0.0, remaining)
 
@@ -0,0 +1,233 @@
+import errno
+import heapq
+import itertools
+import selectors
+import socket
+import sys
+import time
+from .config import DEFAULT_TIMEOUT, DEFAULT_BATCH_WINDOW, DEFAULT_UDP_RETRIES, DEFAULT_UDP_HOST_RATE
+from .port_scanner import PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_OPEN_FILTERED, PORT_ERROR
+from .pressure import is_local_error
+from .rate_limiter import RateLimiter
+from .resolver import address_family
+
+# Linux: ICMP 오류를 연결된 UDP 소켓의 오류로 전달 (raw 소켓 없이 port unreachable 감지)
+IP_RECVERR = getattr(socket, 'IP_RECVERR', 11 if sys.platform.startswith('linux') else None)
+IPV6_RECVERR = getattr(socket, 'IPV6_RECVERR', 25 if sys.platform.startswith('linux') else None)
+
+_DNS_QUERY = (b'\x12\x34\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00'  # 헤더: 질의 1개, 재귀 요청
+              b'\x00\x00\x02\x00\x01')                              # "." NS IN
+
+# 포트별 프로토콜 페이로드 (응답을 유도할 수 있는 최소 요청)
+UDP_PAYLOADS = {
+    7: b'network_monitor\n',                                          # Echo
+    53: _DNS_QUERY,                                                   # DNS
+    123: b'\x1b' + b'\x00' * 47,                                      # NTP v3 클라이언트 요청
+    137: (b'\x80\xf0\x00\x10\x00\x01\x00\x00\x00\x00\x00\x00'         # NetBIOS 이름 조회 ("*")
+          b'\x20CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\x00\x00\x21\x00\x01'),
+    161: (b'\x30\x29\x02\x01\x00\x04\x06public'                       # SNMPv1 get sysDescr.0
+          b'\xa0\x1c\x02\x04\x12\x34\x56\x78\x02\x01\x00\x02\x01\x00'
+          b'\x30\x0e\x30\x0c\x06\x08\x2b\x06\x01\x02\x01\x01\x01\x00\x05\x00'),
+    514: b'<14>network_monitor: udp probe',                           # Syslog (보통 응답 없음)
+    1900: (b'M-SEARCH * HTTP/1.1\r\nHOST: 239.255.255.250:1900\r\n'   # SSDP
+           b'MAN: "ssdp:discover"\r\nMX: 1\r\nST: ssdp:all\r\n\r\n'),
+    5353: b'\x00\x00' + _DNS_QUERY[2:],                               # mDNS
+}
+
+# 프로토콜을 모르는 포트에 보내는 기본 페이로드 (에코 서버 등)
+DEFAULT_UDP_PAYLOAD = b'network_monitor udp probe\r\n'
+
+
+def get_udp_payload(port):
+    """포트에 맞는 UDP 프로브 페이로드"""
+    return UDP_PAYLOADS.get(port, DEFAULT_UDP_PAYLOAD)
+
+
+def classify_udp_error(err):
+    """
+    UDP 소켓 오류를 포트 상태로 변환합니다.
+
+    ICMP port unreachable(ECONNREFUSED)만 closed이고, 그 밖의 ICMP 도달 불가
+    (호스트/네트워크 도달 불가, 관리적 차단 등)는 filtered로 봅니다.
+    소켓을 만들지 못한 로컬 자원 부족(fd 한도 등)은 error입니다.
+    """
+    if err == errno.ECONNREFUSED:
+        return PORT_CLOSED
+    if is_local_error(err):
+        return PORT_ERROR
+    return PORT_FILTERED
+
+
+class UDPScanner:
+    """
+    연결된 UDP 소켓 윈도우를 하나의 셀렉터로 처리하는 UDP 스캔 엔진
+
+    포트마다 페이로드를 보내고 응답이 오면 open, ICMP port unreachable이 오면 closed,
+    재시도까지 아무 응답이 없으면 open|filtered로 분류합니다. 커널이 ICMP 오류 전송
+    속도를 제한하므로 호스트별 송신 속도(per_host_rate)를 낮게 유지합니다.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, window=DEFAULT_BATCH_WINDOW, retries=DEFAULT_UDP_RETRIES,
+                 per_host_rate=DEFAULT_UDP_HOST_RATE, rate_limiter=None):
+        """
+        Args:
+            timeout: 전송마다 응답을 기다릴 시간(초)
+            window: 동시에 응답을 기다릴 최대 소켓 수
+            retries: 응답이 없을 때 다시 보낼 횟수
+            per_host_rate: 호스트별 초당 전송 수 (None/0이면 제한 없음)
+            rate_limiter: 추가로 적용할 전역 RateLimiter (선택)
+        """
+        self.timeout = timeout
+        self.window = max(1, window)
+        self.retries = max(0, retries)
+        self.host_limiter = RateLimiter(per_destination_rate=per_host_rate) if per_host_rate else None
+        self.rate_limiter = rate_limiter
+
+    def _throttle(self, host):
+        """전송 허가 대기 시간 (0이면 바로 전송 가능)"""
+        for limiter in (self.host_limiter, self.rate_limiter):
+            if limiter is not None:
+                wait = limiter.try_acquire(host)
+                if wait > 0:
+                    return wait
+        return 0.0
+
+    def _open_socket(self, target):
+        family = address_family(target[0])
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        # IPv6는 ICMPv6 오류를 IPV6_RECVERR로 받음
+        level, option = ((socket.IPPROTO_IPV6, IPV6_RECVERR) if family == socket.AF_INET6
+                         else (socket.IPPROTO_IP, IP_RECVERR))
+        if option is not None:
+            try:
+                sock.setsockopt(level, option, 1)
+            except OSError:
+                pass
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def scan(self, targets):
+        """
+        (host, port) 대상들을 스캔하고 완료되는 순서대로 결과를 생성합니다.
+
+        Yields:
+            tuple: ((host, port), state, response_time) - response_time은 open만 기록,
+                error 상태는 그 자리에 errno
+        """
+        selector = selectors.DefaultSelector()
+        deadlines = []  # (deadline_ns, probe_id, fd) 힙
+        in_flight = {}  # fd -> [sock, target, sent_ns, probe_id, tries]
+        timeout_ns = int(self.timeout * 1e9)
+        seq = itertools.count()
+        target_iter = iter(targets)
+        exhausted = False
+        held = None      # 레이트 리미터에 막힌 새 대상
+        resend = []      # 재전송을 기다리는 (fd, probe_id) (레이트 리미터에 막힌 경우)
+
+        def send(fd):
+            entry = in_flight[fd]
+            entry[2] = time.perf_counter_ns()
+            entry[3] = next(seq)
+            entry[4] += 1
+            try:
+                entry[0].send(get_udp_payload(entry[1][1]))
+            except OSError:
+                # 이전 전송에 대한 ICMP 오류가 send에서 보고될 수 있음 - 읽기 이벤트로 처리
+                pass
+            heapq.heappush(deadlines, (entry[2] + timeout_ns, entry[3], fd))
+
+        try:
+            while True:
+                throttle = 0.0
+
+                # 레이트 리미터에 막혔던 재전송부터 처리
+                while resend:
+                    fd, probe_id = resend[0]
+                    entry = in_flight.get(fd)
+                    if entry is None or entry[3] != probe_id:
+                        # 그 사이 응답이 와서 끝난 대상 (fd가 재사용되었을 수 있음)
+                        resend.pop(0)
+                        continue
+                    throttle = self._throttle(entry[1][0])
+                    if throttle > 0:
+                        break
+                    resend.pop(0)
+                    send(fd)
+
+                while not resend and len(in_flight) < self.window:
+                    if held is not None:
+                        target, held = held, None
+                    elif exhausted:
+                        break
+                    else:
+                        target = next(target_iter, None)
+                        if target is None:
+                            exhausted = True
+                            break
+
+                    throttle = self._throttle(target[0])
+                    if throttle > 0:
+                        held = target
+                        break
+
+                    try:
+                        sock = self._open_socket(target)
+                    except OSError as e:
+                        state = classify_udp_error(e.errno)
+                        yield (target, state, e.errno if state == PORT_ERROR else None)
+                        continue
+                    fd = sock.fileno()
+                    in_flight[fd] = [sock, target, 0, None, 0]
+                    selector.register(fd, selectors.EVENT_READ)
+                    send(fd)
+
+                if not in_flight:
+                    if held is None:
+                        break
+                    time.sleep(throttle)
+                    continue
+
+                wait = max(0.0, (deadlines[0][0] - time.perf_counter_ns()) / 1e9) if deadlines else self.timeout
+                if held is not None or resend:
+                    wait = min(wait, throttle)
+                events = selector.select(wait)
+                now = time.perf_counter_ns()
+
+                for key, _ in events:
+                    fd = key.fd
+                    sock, target, sent_ns = in_flight[fd][:3]
+                    try:
+                        sock.recv(2048)
+                        state, response_time = PORT_OPEN, (now - sent_ns) / 1e9
+                    except BlockingIOError:
+                        continue
+                    except OSError as e:
+                        state, response_time = classify_udp_error(e.errno), None
+                    del in_flight[fd]
+                    selector.unregister(fd)
+                    sock.close()
+                    yield (target, state, response_time)
+
+                # 응답 없이 마감된 소켓: 재시도가 남았으면 다시 보내고, 아니면 open|filtered
+                now = time.perf_counter_ns()
+                while deadlines and deadlines[0][0] <= now:
+                    _, probe_id, fd = heapq.heappop(deadlines)
+                    entry = in_flight.get(fd)
+                    if entry is None or entry[3] != probe_id:
+                        continue
+                    if entry[4] <= self.retries:
+                        resend.append((fd, probe_id))
+                        continue
+                    del in_flight[fd]
+                    selector.unregister(fd)
+                    entry[0].close()
+                    yield (entry[1], PORT_OPEN_FILTERED, None)
+        finally:
+            for entry in in_flight.values():
+                entry[0].close()
+            selector.close()
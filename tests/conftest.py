@@ -0,0 +1,37 @@
+import os
+import socket
+import sys
+import pytest
+
+# 저장소 루트에서 pytest를 바로 실행해도 network_monitor 패키지를 찾도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def listeners():
+    """루프백에 TCP 리스너를 n개 열고 포트 목록을 돌려주는 팩토리 (테스트가 끝나면 닫음)"""
+    sockets = []
+
+    def open_listeners(count=1, host='127.0.0.1'):
+        ports = []
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind((host, 0))
+            sock.listen(128)
+            sockets.append(sock)
+            ports.append(sock.getsockname()[1])
+        return ports
+
+    yield open_listeners
+    for sock in sockets:
+        sock.close()
+
+
+@pytest.fixture
+def closed_port():
+    """루프백에서 아무도 듣지 않는 포트 (바인드 후 바로 닫아 얻음)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
@@ -0,0 +1,85 @@
+import socket
+import threading
+import pytest
+from network_monitor.banner import BannerGrabber, fingerprint_banner
+
+
+@pytest.fixture
+def banner_server():
+    """연결마다 replies에서 하나씩 꺼내 보내고 닫는 루프백 서버 (b''이면 바로 닫음)"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(16)
+    replies = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                reply = replies.pop(0) if replies else b''
+                if reply:
+                    conn.sendall(reply)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield server.getsockname()[1], replies
+    server.close()
+
+
+@pytest.mark.parametrize('data, service, product', [
+    (b'SSH-2.0-OpenSSH_9.6p1 Ubuntu\r\n', 'ssh', 'OpenSSH_9.6p1 Ubuntu'),
+    (b'HTTP/1.0 200 OK\r\nServer: nginx/1.24\r\n\r\n', 'http', 'nginx/1.24'),
+    (b'220 mail.example.com ESMTP Postfix smtp\r\n', 'smtp', 'mail.example.com ESMTP Postfix smtp'),
+    (b'+OK Dovecot ready.\r\n', 'pop3', 'Dovecot ready.'),
+    (b'* OK IMAP4rev1\r\n', 'imap', 'IMAP4rev1'),
+    (b'\x00\x01binary', None, None),
+])
+def test_fingerprint_banner(data, service, product):
+    info = fingerprint_banner(data)
+    assert (info['service'], info['product']) == (service, product)
+
+
+def test_grab_caches_banner(banner_server):
+    port, replies = banner_server
+    replies.append(b'SSH-2.0-OpenSSH_9.6\r\n')
+    grabber = BannerGrabber(timeout=1.0)
+    info = grabber.grab('127.0.0.1', port)
+    assert info['service'] == 'ssh'
+    # 두 번째 요청은 서버에 다시 연결하지 않고 캐시에서 응답
+    assert grabber.grab('127.0.0.1', port) is info
+    assert grabber.get_cached('127.0.0.1', port) is info
+
+
+def test_failed_read_is_not_cached(banner_server):
+    port, replies = banner_server
+    replies.extend([b'', b'SSH-2.0-OpenSSH_9.6\r\n'])
+    grabber = BannerGrabber(timeout=0.5)
+    assert grabber.grab('127.0.0.1', port) is None
+    assert grabber.get_cached('127.0.0.1', port) is None
+    # 다음 시도에서 다시 읽음
+    assert grabber.grab('127.0.0.1', port)['service'] == 'ssh'
+
+
+def test_cache_expires(banner_server):
+    port, replies = banner_server
+    replies.append(b'+OK ready\r\n')
+    grabber = BannerGrabber(timeout=1.0, cache_ttl=0)
+    assert grabber.grab('127.0.0.1', port)['service'] == 'pop3'
+    grabber.cache[('127.0.0.1', port)]['grabbed_at'] -= 1
+    assert grabber.get_cached('127.0.0.1', port) is None
+
+
+def test_claim_and_collect(banner_server, closed_port):
+    port, replies = banner_server
+    replies.append(b'SSH-2.0-OpenSSH_9.6\r\n')
+    grabber = BannerGrabber(timeout=1.0)
+    sock = socket.create_connection(('127.0.0.1', port))
+    assert grabber.claim('127.0.0.1', port, sock)
+    # 이미 읽는 중인 포트는 다시 넘겨받지 않음
+    assert not grabber.claim('127.0.0.1', port, None)
+    results = grabber.collect('127.0.0.1', [port, closed_port])
+    assert list(results) == [port]
+    assert results[port]['product'] == 'OpenSSH_9.6'
+    assert grabber.futures == {}
@@ -0,0 +1,90 @@
+import errno
+import socket
+import pytest
+from network_monitor import batch_scanner
+from network_monitor.batch_scanner import BatchConnectScanner
+from network_monitor.port_scanner import PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_ERROR
+from network_monitor.pressure import ResourcePressure, is_local_error
+
+
+def failing_socket(err, failures=None):
+    """socket.socket 대신 쓸 생성자 (failures번까지, None이면 항상 err로 실패)"""
+    real_socket = socket.socket
+    calls = {'count': 0}
+
+    def create(*args, **kwargs):
+        calls['count'] += 1
+        if failures is None or calls['count'] <= failures:
+            raise OSError(err, 'injected')
+        return real_socket(*args, **kwargs)
+
+    return create
+
+
+def test_loopback_open_and_closed(listeners, closed_port):
+    open_port, = listeners()
+    scanner = BatchConnectScanner(timeout=1.0, window=4)
+    results = {target[1]: state for target, state, _ in
+               scanner.scan([('127.0.0.1', open_port), ('127.0.0.1', closed_port)])}
+    assert results == {open_port: PORT_OPEN, closed_port: PORT_CLOSED}
+
+
+def test_socket_creation_failure(monkeypatch):
+    # IPv4 전용 호스트에서 IPv6 대상을 스캔하는 경우처럼 소켓 자체를 만들 수 없음
+    monkeypatch.setattr(batch_scanner.socket, 'socket', failing_socket(errno.EAFNOSUPPORT))
+    completed = []
+    scanner = BatchConnectScanner(timeout=0.5, window=4)
+    results = list(scanner.scan([('::1', 80), ('::1', 443)], on_complete=completed.append))
+    assert results == [(('::1', 80), PORT_FILTERED, None), (('::1', 443), PORT_FILTERED, None)]
+    assert completed == [('::1', 80), ('::1', 443)]
+
+
+def test_local_error_is_retried(monkeypatch, listeners):
+    open_port, = listeners()
+    monkeypatch.setattr(batch_scanner.socket, 'socket', failing_socket(errno.EADDRNOTAVAIL, failures=1))
+    pressure = ResourcePressure(4, backoff=0.01, retries=2)
+    scanner = BatchConnectScanner(timeout=1.0, window=4, pressure=pressure)
+    results = list(scanner.scan([('127.0.0.1', open_port)]))
+    assert [state for _, state, _ in results] == [PORT_OPEN]
+    assert pressure.errors == {'EADDRNOTAVAIL': 1}
+
+
+def test_local_error_reported_after_retries(monkeypatch):
+    monkeypatch.setattr(batch_scanner.socket, 'socket', failing_socket(errno.EMFILE))
+    pressure = ResourcePressure(4, backoff=0.01, retries=2)
+    scanner = BatchConnectScanner(timeout=0.5, window=4, pressure=pressure)
+    results = list(scanner.scan([('127.0.0.1', 9)]))
+    # closed/filtered로 접지 않고 errno와 함께 error로 보고
+    assert results == [(('127.0.0.1', 9), PORT_ERROR, errno.EMFILE)]
+    assert pressure.errors == {'EMFILE': 3}
+
+
+def test_pressure_halves_and_recovers():
+    pressure = ResourcePressure(64, min_window=8, backoff=0.0)
+    pressure.record_error(errno.EADDRNOTAVAIL)
+    assert pressure.limit == 32
+    for _ in range(3):
+        pressure.record_error(errno.EMFILE)
+    # 최솟값 아래로는 줄이지 않음
+    assert pressure.limit == 8
+    assert pressure.throttle_events == 3
+    for _ in range(8):
+        pressure.record_success()
+    assert pressure.limit == 10
+    stats = pressure.get_stats()
+    assert stats['local_errors'] == {'EADDRNOTAVAIL': 1, 'EMFILE': 3}
+    assert stats['lowest_window'] == 8
+    assert stats['configured_window'] == 64
+
+
+def test_pressure_pause():
+    pressure = ResourcePressure(4, backoff=60)
+    assert pressure.pause() == 0.0
+    pressure.record_error(errno.ENOBUFS)
+    assert 0 < pressure.pause() <= 60
+
+
+@pytest.mark.parametrize('err, local', [(errno.EADDRNOTAVAIL, True), (errno.EMFILE, True),
+                                        (errno.ECONNREFUSED, False), (None, False)])
+def test_is_local_error(err, local):
+    assert is_local_error(err) is local
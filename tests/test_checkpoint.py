@@ -0,0 +1,83 @@
+import os
+import pytest
+from network_monitor.checkpoint import ScanCheckpoint, list_checkpoints, _RECORD, _compress_ports
+from network_monitor.port_scanner import PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_OPEN_FILTERED
+
+
+def test_compress_ports():
+    assert _compress_ports([1, 2, 3, 5, 8, 9]) == '1-3,5,8-9'
+    assert _compress_ports([80]) == '80'
+    assert _compress_ports([]) == ''
+
+
+def test_record_replay(tmp_path):
+    checkpoint = ScanCheckpoint.create('network', ['10.0.0.1', '10.0.0.2'], range(1, 101),
+                                       directory=str(tmp_path))
+    checkpoint.record('10.0.0.1', 22, PORT_OPEN, 0.25)
+    checkpoint.record('10.0.0.1', 23, PORT_CLOSED)
+    checkpoint.record('10.0.0.1', 24, PORT_FILTERED)
+    checkpoint.record('10.0.0.2', 53, PORT_OPEN_FILTERED)
+    checkpoint.record('10.0.0.2', 80, PORT_OPEN)
+    checkpoint.host_done('10.0.0.1')
+    checkpoint.close()
+
+    loaded = ScanCheckpoint.load(checkpoint.scan_id, directory=str(tmp_path))
+    try:
+        assert loaded.kind == 'network'
+        assert loaded.hosts == ['10.0.0.1', '10.0.0.2']
+        assert loaded.ports == list(range(1, 101))
+        assert loaded.resumed_records == 5
+        assert loaded.completed_hosts == {'10.0.0.1'}
+        assert loaded.done_ports('10.0.0.1') == {22, 23, 24}
+        assert loaded.done_ports('10.0.0.3') == set()
+        assert list(loaded.iter_completed('10.0.0.1')) == [
+            (22, PORT_OPEN, 0.25), (23, PORT_CLOSED, None), (24, PORT_FILTERED, None)
+        ]
+        # 응답 시간이 없는 열린 포트는 None으로 복원
+        assert list(loaded.iter_completed('10.0.0.2')) == [
+            (53, PORT_OPEN_FILTERED, None), (80, PORT_OPEN, None)
+        ]
+    finally:
+        loaded.close()
+
+
+def test_torn_trailing_record(tmp_path):
+    checkpoint = ScanCheckpoint.create('host', ['192.0.2.1'], [22, 80, 443], directory=str(tmp_path))
+    checkpoint.record('192.0.2.1', 22, PORT_OPEN, 0.5)
+    checkpoint.record('192.0.2.1', 80, PORT_CLOSED)
+    checkpoint.close()
+    complete_size = os.path.getsize(checkpoint.path)
+
+    # 기록 도중 종료되어 마지막 레코드가 잘린 파일
+    with open(checkpoint.path, 'ab') as f:
+        f.write(_RECORD.pack(0, 443, 1, 0.1)[:5])
+
+    loaded = ScanCheckpoint.load(checkpoint.scan_id, directory=str(tmp_path))
+    assert loaded.resumed_records == 2
+    assert loaded.done_ports('192.0.2.1') == {22, 80}
+    # 잘린 레코드는 파일에서도 잘라낸 뒤 이어서 기록
+    assert os.path.getsize(checkpoint.path) == complete_size
+    loaded.record('192.0.2.1', 443, PORT_OPEN, 0.125)
+    loaded.close()
+
+    resumed = ScanCheckpoint.load(checkpoint.scan_id, directory=str(tmp_path))
+    assert list(resumed.iter_completed('192.0.2.1')) == [
+        (22, PORT_OPEN, 0.5), (80, PORT_CLOSED, None), (443, PORT_OPEN, 0.125)
+    ]
+    resumed.close()
+
+
+def test_close_completed_removes_file(tmp_path):
+    checkpoint = ScanCheckpoint.create('host', ['192.0.2.1'], [22], directory=str(tmp_path))
+    assert list_checkpoints(str(tmp_path)) == [checkpoint.scan_id]
+    checkpoint.record('192.0.2.1', 22, PORT_OPEN)
+    checkpoint.close(completed=True)
+    assert not os.path.exists(checkpoint.path)
+
+
+def test_load_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ScanCheckpoint.load('missing', directory=str(tmp_path))
+    (tmp_path / 'corrupt.ckpt').write_bytes(b'{"version": 1')
+    with pytest.raises(ValueError):
+        ScanCheckpoint.load('corrupt', directory=str(tmp_path))
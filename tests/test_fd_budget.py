@@ -0,0 +1,78 @@
+import errno
+import threading
+import time
+import pytest
+from network_monitor import banner
+from network_monitor.banner import BannerGrabber
+from network_monitor.fd_budget import FDBudget
+
+
+def make_budget(capacity, lease_share=0.5):
+    budget = FDBudget(reserve=0, lease_share=lease_share, raise_soft_limit=False)
+    budget.soft_limit = budget.baseline + capacity
+    return budget
+
+
+def test_acquire_release():
+    budget = make_budget(4)
+    assert budget.capacity == 4
+    assert budget.try_acquire(3, 'monitor')
+    assert not budget.try_acquire(2, 'monitor')
+    assert budget.available == 1
+    budget.release(3, 'monitor')
+    stats = budget.get_stats()
+    assert stats['in_use'] == 0
+    assert stats['peak'] == 3
+    assert stats['by_owner'] == {}
+
+
+def test_acquire_timeout():
+    budget = make_budget(1)
+    assert budget.acquire(1)
+    start = time.monotonic()
+    assert not budget.acquire(1, timeout=0.1)
+    assert time.monotonic() - start < 1.0
+    assert budget.waits == 1
+
+
+def test_acquire_wakes_on_release():
+    budget = make_budget(1)
+    budget.acquire(1)
+    threading.Timer(0.05, budget.release, (1,)).start()
+    assert budget.acquire(1, timeout=5)
+
+
+def test_permit_raises_emfile():
+    budget = make_budget(1)
+    with budget.permit(1, 'server'):
+        assert budget.in_use == 1
+        with pytest.raises(OSError) as info:
+            with budget.permit(1, 'server', timeout=0.05):
+                pass
+        assert info.value.errno == errno.EMFILE
+    assert budget.in_use == 0
+
+
+def test_lease_share_and_timeout():
+    budget = make_budget(100, lease_share=0.5)
+    # 남은 허가의 절반까지만 빌려 줌
+    assert budget.lease(80) == 50
+    assert budget.lease(80) == 25
+    budget.release(75, 'scan')
+    budget.try_acquire(100)
+    with pytest.raises(OSError) as info:
+        budget.lease(10, timeout=0.05)
+    assert info.value.errno == errno.EMFILE
+
+
+def test_banner_grab_gives_up_without_permit(monkeypatch, listeners):
+    port, = listeners()
+    budget = make_budget(1)
+    budget.acquire(1, 'scan')
+    monkeypatch.setattr(banner, 'global_fd_budget', budget)
+    grabber = BannerGrabber(timeout=0.1)
+    start = time.monotonic()
+    # 허가 없이 연결하지 않고 제한 시간 안에 포기
+    assert grabber.grab('127.0.0.1', port) is None
+    assert time.monotonic() - start < 1.0
+    assert budget.in_use == 1
@@ -0,0 +1,58 @@
+import socket
+import monitor
+from network_monitor import happy_eyeballs
+from network_monitor.happy_eyeballs import interleave_addresses, happy_eyeballs_connect
+
+V6 = socket.AF_INET6
+V4 = socket.AF_INET
+
+
+def test_interleave_addresses():
+    addresses = [(V4, '192.0.2.1'), (V4, '192.0.2.2'), (V6, '2001:db8::1'), (V6, '2001:db8::2'),
+                 (V6, '2001:db8::3')]
+    assert interleave_addresses(addresses) == [
+        (V6, '2001:db8::1'), (V4, '192.0.2.1'), (V6, '2001:db8::2'), (V4, '192.0.2.2'), (V6, '2001:db8::3')
+    ]
+    assert interleave_addresses(addresses, first_family_count=2)[:3] == [
+        (V6, '2001:db8::1'), (V6, '2001:db8::2'), (V4, '192.0.2.1')
+    ]
+    # 한 패밀리만 있으면 순서 그대로
+    assert interleave_addresses([(V4, '192.0.2.1'), (V4, '192.0.2.2')]) == [(V4, '192.0.2.1'), (V4, '192.0.2.2')]
+
+
+def test_falls_back_to_ipv4(monkeypatch, listeners):
+    port, = listeners()
+    monkeypatch.setattr(happy_eyeballs, 'resolve_all', lambda host: [(V6, '::1'), (V4, '127.0.0.1')])
+    result = happy_eyeballs_connect('dual.example', port, timeout=2.0)
+    # ::1에는 리스너가 없어 바로 거부되고 IPv4가 승리
+    assert result['success']
+    assert (result['ip'], result['family']) == ('127.0.0.1', 'ipv4')
+    assert result['family_latency']['ipv6'] is None
+    assert result['family_latency']['ipv4'] is not None
+    assert [attempt['error'] for attempt in result['attempts']] == ['ECONNREFUSED', None]
+
+
+def test_all_attempts_fail(monkeypatch, closed_port):
+    monkeypatch.setattr(happy_eyeballs, 'resolve_all', lambda host: [(V4, '127.0.0.1')])
+    result = happy_eyeballs_connect('down.example', closed_port, timeout=1.0)
+    assert not result['success']
+    assert result['error'] == 'ECONNREFUSED'
+
+
+def test_family_result_alerts_only_on_change(monkeypatch):
+    alerts, logged = [], []
+    monkeypatch.setattr(monitor, 'config', {'alerts': {'log': {'enabled': True}}}, raising=False)
+    monkeypatch.setattr(monitor, 'send_alert', lambda config, subject, message: alerts.append(subject))
+    monkeypatch.setattr(monitor, 'log_alert', lambda alert_config, message: logged.append(message))
+    monkeypatch.setattr(monitor, 'family_stats', {})
+
+    def connect(family):
+        return {'family': family, 'family_latency': {family: 0.001}, 'family_kernel_rtt': {}}
+
+    for family in ('ipv6', 'ipv6', 'ipv4'):
+        monitor.record_family_result('web', connect(family))
+    assert alerts == ['[패밀리 변경] web']
+    assert len(logged) == 2
+    stats = monitor.family_stats['web']
+    assert stats['last_family'] == 'ipv4'
+    assert stats['wins'] == {'ipv6': 2, 'ipv4': 1}
@@ -0,0 +1,59 @@
+import socket
+import struct
+from network_monitor.icmp_engine import icmp_checksum, build_echo_request, parse_echo_reply, \
+    ICMP_ECHO_REPLY, ICMP_ECHO_REQUEST, ICMPV6_ECHO_REPLY, ICMPV6_ECHO_REQUEST
+
+
+def test_checksum_rfc1071_example():
+    # RFC 1071 4.1절의 예: 합계 0xddf2의 1의 보수
+    assert icmp_checksum(bytes.fromhex('0001f203f4f5f6f7')) == 0x220d
+
+
+def test_checksum_odd_length_and_zero():
+    assert icmp_checksum(b'\x01') == icmp_checksum(b'\x01\x00')
+    assert icmp_checksum(b'') == 0xffff
+
+
+def test_build_echo_request_ipv4():
+    packet = build_echo_request(socket.AF_INET, 0x1234, 7, b'payload!')
+    icmp_type, code, checksum, ident, seq = struct.unpack('!BBHHH', packet[:8])
+    assert (icmp_type, code, ident, seq) == (ICMP_ECHO_REQUEST, 0, 0x1234, 7)
+    assert checksum != 0
+    assert packet[8:] == b'payload!'
+    # 체크섬을 포함한 전체 패킷의 체크섬은 0
+    assert icmp_checksum(packet) == 0
+
+
+def test_build_echo_request_ipv6_leaves_checksum_to_kernel():
+    packet = build_echo_request(socket.AF_INET6, 1, 2, b'x')
+    assert packet == struct.pack('!BBHHH', ICMPV6_ECHO_REQUEST, 0, 0, 1, 2) + b'x'
+
+
+def ip_header(length=20):
+    """IHL이 length/4인 IPv4 헤더 (옵션은 0으로 채움)"""
+    return bytes([0x40 | (length // 4)]) + bytes(length - 1)
+
+
+def test_parse_echo_reply_with_ip_header():
+    reply = struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, 0xbeef, 42) + b'data'
+    assert parse_echo_reply(ip_header() + reply, socket.AF_INET, True) == (0xbeef, 42)
+    # IP 옵션이 있는 헤더 (IHL 6)
+    assert parse_echo_reply(ip_header(24) + reply, socket.AF_INET, True) == (0xbeef, 42)
+
+
+def test_parse_echo_reply_without_ip_header():
+    reply = struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, 1, 65535)
+    assert parse_echo_reply(reply, socket.AF_INET, False) == (1, 65535)
+    reply6 = struct.pack('!BBHHH', ICMPV6_ECHO_REPLY, 0, 0, 3, 4)
+    assert parse_echo_reply(reply6, socket.AF_INET6, False) == (3, 4)
+
+
+def test_parse_echo_reply_ignores_other_packets():
+    # 요청 패킷, 다른 패밀리의 응답 타입, 잘린 패킷
+    request = build_echo_request(socket.AF_INET, 1, 1, b'')
+    assert parse_echo_reply(request, socket.AF_INET, False) is None
+    reply = struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, 1, 1)
+    assert parse_echo_reply(reply, socket.AF_INET6, False) is None
+    assert parse_echo_reply(reply[:7], socket.AF_INET, False) is None
+    assert parse_echo_reply(ip_header()[:19], socket.AF_INET, True) is None
+    assert parse_echo_reply(ip_header() + reply[:4], socket.AF_INET, True) is None
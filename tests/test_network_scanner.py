@@ -0,0 +1,78 @@
+import threading
+import pytest
+from network_monitor.checkpoint import ScanCheckpoint
+from network_monitor.port_scanner import PORT_CLOSED
+from network_monitor.network_scanner import expand_targets, ProbeScheduler, scan_network
+from network_monitor.rate_limiter import RateLimiter
+
+
+def test_expand_targets():
+    # 네트워크/브로드캐스트 주소는 제외
+    assert expand_targets('10.0.0.0/30') == ['10.0.0.1', '10.0.0.2']
+    assert expand_targets('10.0.0.1-3,10.0.0.2') == ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+    assert expand_targets(['2001:db8::1-2', '[2001:DB8::5]']) == ['2001:db8::1', '2001:db8::2', '2001:db8::5']
+    assert expand_targets('host.example') == ['host.example']
+
+
+@pytest.mark.parametrize('spec', ['10.0.0.0/8', '2001:db8::/64', '10.0.0.5-1'])
+def test_expand_targets_rejects(spec):
+    with pytest.raises(ValueError):
+        expand_targets(spec, max_hosts=1024)
+
+
+def test_scheduler_round_robin():
+    scheduler = ProbeScheduler(['a', 'b'], [1, 2, 3], per_host_limit=10)
+    assert list(scheduler) == [('a', 1), ('b', 1), ('a', 2), ('b', 2), ('a', 3), ('b', 3)]
+
+
+def test_scheduler_per_host_limit():
+    scheduler = ProbeScheduler(['a', 'b'], [1, 2], per_host_limit=1, ports_by_ip={'b': [9]})
+    assert next(scheduler) == ('a', 1)
+    assert next(scheduler) == ('b', 9)
+    # 두 호스트 모두 상한에 걸리면 None으로 완료를 기다리게 함
+    assert next(scheduler) is None
+    scheduler.release(('a', 1))
+    assert next(scheduler) == ('a', 2)
+    scheduler.release(('b', 9))
+    scheduler.release(('a', 2))
+    with pytest.raises(StopIteration):
+        next(scheduler)
+
+
+def test_scan_network_loopback(listeners, closed_port):
+    open_port, = listeners(host='0.0.0.0')
+    result = scan_network('127.0.0.1-3', [open_port, closed_port], timeout=1.0, max_concurrency=4,
+                          per_host_limit=1, rate_limiter=RateLimiter(), return_state_map=True)
+    assert result['host_count'] == 3
+    assert result['total_probes'] == 6
+    assert result['hosts_with_open_ports'] == ['127.0.0.1', '127.0.0.2', '127.0.0.3']
+    assert result['open_on_all_hosts'] == [open_port]
+    assert all(r['closed_port_count'] == 1 for r in result['hosts'].values())
+    assert not result['cancelled']
+
+
+def test_scan_network_resumes_checkpoint(tmp_path, listeners, closed_port):
+    open_port, = listeners(host='0.0.0.0')
+    ports = sorted([open_port, closed_port])
+    checkpoint = ScanCheckpoint.create('network', ['127.0.0.1', '127.0.0.2'], ports, directory=str(tmp_path))
+    checkpoint.record('127.0.0.1', open_port, PORT_CLOSED)
+    checkpoint.record('127.0.0.1', closed_port, PORT_CLOSED)
+    checkpoint.host_done('127.0.0.1')
+    checkpoint.close()
+
+    resumed = ScanCheckpoint.load(checkpoint.scan_id, directory=str(tmp_path))
+    result = scan_network(None, timeout=1.0, rate_limiter=RateLimiter(), checkpoint=resumed)
+    # 이전 실행에서 끝난 호스트는 다시 스캔하지 않음
+    # (기록된 결과를 그대로 쓰므로 127.0.0.1의 열린 포트도 닫힌 것으로 남음)
+    assert result['resumed_probes'] == 2
+    assert result['hosts_with_open_ports'] == ['127.0.0.2']
+    assert result['hosts']['127.0.0.1']['closed_port_count'] == 2
+
+
+def test_scan_network_cancel(listeners):
+    open_port, = listeners()
+    cancel = threading.Event()
+    cancel.set()
+    result = scan_network('127.0.0.1', [open_port], timeout=1.0, rate_limiter=RateLimiter(),
+                          cancel_event=cancel)
+    assert result['cancelled']
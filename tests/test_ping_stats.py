@@ -0,0 +1,88 @@
+import math
+import pytest
+from network_monitor.ping_stats import rtt_array, rtt_statistics, percentile, LOST
+
+
+def test_rtt_array_marks_losses():
+    rtts = rtt_array([0.1, None, 0.3])
+    assert rtts[0] == 0.1 and rtts[2] == 0.3
+    assert math.isnan(rtts[1])
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([5.0], 99) == 5.0
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 90) == pytest.approx(3.7)
+    assert percentile(values, 100) == 4.0
+
+
+def test_statistics():
+    stats = rtt_statistics(rtt_array([10.0, 20.0, 30.0, 40.0]))
+    assert stats['transmitted'] == 4
+    assert stats['received'] == 4
+    assert stats['packet_loss'] == 0
+    assert stats['packet_loss_percent'] == 0.0
+    assert stats['min_time'] == 10.0
+    assert stats['max_time'] == 40.0
+    assert stats['avg_time'] == pytest.approx(25.0)
+    # mdev는 모표준편차, stddev는 표본표준편차
+    assert stats['mdev'] == pytest.approx(math.sqrt(125.0))
+    assert stats['stddev'] == pytest.approx(math.sqrt(500.0 / 3))
+    assert stats['p50'] == pytest.approx(25.0)
+    assert stats['p90'] == pytest.approx(37.0)
+    assert stats['p99'] == pytest.approx(39.7)
+    assert stats['loss_bursts'] == 0
+    assert stats['max_loss_burst'] == 0
+
+
+def test_jitter():
+    # 차이가 10, 10, 10이면 J = J + (10 - J) / 16을 세 번 적용
+    stats = rtt_statistics(rtt_array([10.0, 20.0, 10.0, 20.0]))
+    expected = 0.0
+    for _ in range(3):
+        expected += (10.0 - expected) / 16
+    assert stats['jitter'] == pytest.approx(expected)
+    assert rtt_statistics(rtt_array([5.0]))['jitter'] == 0.0
+
+
+def test_loss_bursts():
+    stats = rtt_statistics(rtt_array([None, 1.0, None, None, 2.0, None, None, None, 3.0, None]))
+    assert stats['transmitted'] == 10
+    assert stats['received'] == 3
+    assert stats['packet_loss'] == 7
+    assert stats['packet_loss_percent'] == pytest.approx(70.0)
+    assert stats['loss_bursts'] == 4
+    assert stats['max_loss_burst'] == 3
+    # 손실은 평균과 백분위수에서 제외
+    assert stats['avg_time'] == pytest.approx(2.0)
+    assert stats['p50'] == 2.0
+
+
+def test_jitter_skips_losses():
+    # 손실을 건너뛰고 연속으로 수신한 패킷끼리 비교
+    with_loss = rtt_statistics(rtt_array([10.0, LOST, 20.0]))
+    without_loss = rtt_statistics(rtt_array([10.0, 20.0]))
+    assert with_loss['jitter'] == pytest.approx(without_loss['jitter'])
+
+
+def test_all_lost_and_empty():
+    stats = rtt_statistics(rtt_array([None, None]))
+    assert stats['received'] == 0
+    assert stats['packet_loss_percent'] == 100.0
+    assert stats['loss_bursts'] == 1
+    assert stats['max_loss_burst'] == 2
+    for key in ('min_time', 'max_time', 'avg_time', 'mdev', 'stddev', 'jitter', 'p50', 'p90', 'p99'):
+        assert stats[key] is None
+
+    empty = rtt_statistics(rtt_array())
+    assert empty['transmitted'] == 0
+    assert empty['packet_loss_percent'] == 0.0
+
+
+def test_single_reply_stddev():
+    stats = rtt_statistics(rtt_array([7.0]))
+    assert stats['mdev'] == 0.0
+    assert stats['stddev'] == 0.0
@@ -0,0 +1,81 @@
+import pytest
+from network_monitor.port_scanner import parse_port_spec, get_common_ports, get_top_ports, scan_host, \
+    iter_scan_host, SCAN_ENGINES, PORT_OPEN, PORT_CLOSED
+from network_monitor.rate_limiter import RateLimiter
+
+
+def test_single_list_and_range():
+    assert parse_port_spec('80') == [80]
+    assert parse_port_spec('443,22,80') == [22, 80, 443]
+    assert parse_port_spec('8000-8003') == [8000, 8001, 8002, 8003]
+    assert parse_port_spec('22, 80, 8000-8002') == [22, 80, 8000, 8001, 8002]
+
+
+def test_duplicates_and_empty_parts():
+    assert parse_port_spec('80,80,79-81,,') == [79, 80, 81]
+
+
+def test_named_sets():
+    assert parse_port_spec('common') == sorted(set(get_common_ports()))
+    assert parse_port_spec('COMMON') == parse_port_spec('common')
+    assert parse_port_spec('top10') == sorted(get_top_ports(10))
+    assert parse_port_spec('top') == sorted(get_top_ports(100))
+    assert parse_port_spec('top5,1') == sorted(set(get_top_ports(5)) | {1})
+
+
+@pytest.mark.parametrize('spec', ['', ',', '0', '65536', '1-65536', '100-10', 'http', '80-', 'topx'])
+def test_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_port_spec(spec)
+
+
+def test_full_range():
+    ports = parse_port_spec('1-65535')
+    assert len(ports) == 65535
+    assert ports[0] == 1 and ports[-1] == 65535
+
+
+@pytest.fixture
+def loopback_ports(listeners, closed_port):
+    """열린 포트 3개와 닫힌 포트 1개"""
+    open_ports = listeners(3)
+    return sorted(open_ports), sorted(open_ports + [closed_port])
+
+
+@pytest.mark.parametrize('engine', SCAN_ENGINES)
+def test_engine_loopback(engine, loopback_ports):
+    open_ports, ports = loopback_ports
+    result = scan_host('127.0.0.1', ports, timeout=1.0, engine=engine, max_workers=4, max_concurrency=4,
+                       rate_limiter=RateLimiter())
+    assert result['engine'] == engine
+    assert [p['port'] for p in result['open_ports']] == open_ports
+    assert result['closed_port_count'] == 1
+    assert result['filtered_port_count'] == 0
+    assert result['total_ports_scanned'] == len(ports)
+    assert not result['cancelled'] and result['stop_reason'] is None
+
+
+def test_engine_parity(loopback_ports):
+    # 세 엔진이 같은 대상에 대해 같은 포트별 상태를 내야 함
+    _, ports = loopback_ports
+    states = {}
+    for engine in SCAN_ENGINES:
+        states[engine] = {r['port']: r['state'] for r in iter_scan_host(
+            '127.0.0.1', ports, 1.0, 4, engine=engine, max_concurrency=4, rate_limiter=RateLimiter())}
+    assert states['thread'] == states['asyncio'] == states['batch']
+    assert sorted(states['batch'].values()).count(PORT_OPEN) == 3
+    assert list(states['batch'].values()).count(PORT_CLOSED) == 1
+
+
+def test_stop_after_open_is_not_cancelled(loopback_ports):
+    _, ports = loopback_ports
+    result = scan_host('127.0.0.1', ports, timeout=1.0, engine='batch', max_concurrency=1,
+                       stop_after_open=1, rate_limiter=RateLimiter())
+    assert result['stop_reason'] == 'open_limit'
+    assert not result['cancelled']
+
+
+def test_iter_scan_host_validates_eagerly():
+    # 제너레이터를 돌리기 전에 잘못된 인자를 알림
+    with pytest.raises(ValueError):
+        iter_scan_host('127.0.0.1', [1, 2], engine='bogus')
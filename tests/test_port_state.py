@@ -0,0 +1,75 @@
+from network_monitor.port_scanner import PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_OPEN_FILTERED, PORT_ERROR
+from network_monitor.port_state import PortStateMap
+
+
+def make_map(states, max_port=1024):
+    state_map = PortStateMap(max_port)
+    for port, state in states.items():
+        state_map.set(port, state)
+    return state_map
+
+
+def test_set_and_get():
+    state_map = make_map({22: PORT_OPEN, 23: PORT_CLOSED, 24: PORT_FILTERED, 25: PORT_OPEN_FILTERED})
+    assert state_map.get(22) == PORT_OPEN
+    assert state_map.get(23) == PORT_CLOSED
+    assert state_map.get(24) == PORT_FILTERED
+    # open|filtered는 2비트에 담을 수 없어 filtered로 기록
+    assert state_map.get(25) == PORT_FILTERED
+    # 스캔하지 않은 포트와 버퍼 밖의 포트
+    assert state_map.get(26) is None
+    assert state_map.get(60000) is None
+
+
+def test_set_overwrites_and_error_clears():
+    state_map = make_map({80: PORT_OPEN})
+    state_map.set(80, PORT_CLOSED)
+    assert state_map.get(80) == PORT_CLOSED
+    state_map.set(80, PORT_ERROR)
+    assert state_map.get(80) is None
+
+
+def test_set_grows_buffer():
+    state_map = PortStateMap(10)
+    state_map.set(65535, PORT_OPEN)
+    assert state_map.get(65535) == PORT_OPEN
+    assert state_map.open_ports() == [65535]
+
+
+def test_ports_and_counts():
+    state_map = make_map({443: PORT_OPEN, 22: PORT_OPEN, 80: PORT_CLOSED, 8080: PORT_FILTERED}, 9000)
+    assert state_map.open_ports() == [22, 443]
+    assert state_map.ports(PORT_CLOSED) == [80]
+    assert state_map.ports(PORT_FILTERED) == [8080]
+    assert state_map.counts() == {PORT_OPEN: 2, PORT_CLOSED: 1, PORT_FILTERED: 1}
+
+
+def test_bytes_round_trip():
+    state_map = make_map({1: PORT_OPEN, 2: PORT_CLOSED, 1023: PORT_FILTERED})
+    restored = PortStateMap.from_bytes(state_map.to_bytes())
+    assert restored.get(1) == PORT_OPEN
+    assert restored.get(2) == PORT_CLOSED
+    assert restored.get(1023) == PORT_FILTERED
+    assert restored.counts() == state_map.counts()
+
+
+def test_union_keeps_known_states():
+    mine = make_map({22: PORT_OPEN, 80: PORT_CLOSED}, 100)
+    theirs = make_map({22: PORT_CLOSED, 80: PORT_OPEN, 443: PORT_OPEN, 3000: PORT_FILTERED}, 3000)
+    merged = mine.union(theirs)
+    # 이 맵에서 확인한 포트는 그대로, 모르는 포트만 other에서 채움
+    assert merged.get(22) == PORT_OPEN
+    assert merged.get(80) == PORT_CLOSED
+    assert merged.get(443) == PORT_OPEN
+    assert merged.get(3000) == PORT_FILTERED
+    assert merged.open_ports() == [22, 443]
+    # 원본은 바뀌지 않음
+    assert mine.get(443) is None
+
+
+def test_diff():
+    previous = make_map({22: PORT_OPEN, 80: PORT_OPEN, 443: PORT_OPEN, 8080: PORT_CLOSED})
+    current = make_map({22: PORT_OPEN, 80: PORT_CLOSED, 8080: PORT_OPEN, 9000: PORT_OPEN}, 9000)
+    # 443은 이번에 스캔하지 않았으므로 닫힌 것으로 보지 않음
+    assert current.diff(previous) == {'opened': [8080, 9000], 'closed': [80]}
+    assert previous.diff(previous) == {'opened': [], 'closed': []}
@@ -0,0 +1,67 @@
+import time
+import pytest
+import monitor
+from network_monitor.rate_limiter import TokenBucket, RateLimiter
+
+
+def test_unlimited_grants_immediately():
+    limiter = RateLimiter()
+    assert not limiter.enabled
+    assert all(limiter.try_acquire('10.0.0.1') == 0.0 for _ in range(1000))
+    assert limiter.get_stats()['granted'] == 1000
+
+
+def test_token_bucket_refill():
+    bucket = TokenBucket(10, burst=2)
+    now = bucket.last
+    assert bucket.wait_time(now) == 0.0
+    bucket.consume()
+    bucket.consume()
+    assert bucket.wait_time(now) == pytest.approx(0.1)
+    # 0.05초 뒤에는 토큰 절반이 채워짐
+    assert bucket.wait_time(now + 0.05) == pytest.approx(0.05)
+
+
+def test_global_budget():
+    limiter = RateLimiter(rate=100, burst=5)
+    waits = [limiter.try_acquire(f"10.0.0.{i}") for i in range(6)]
+    assert waits[:5] == [0.0] * 5
+    assert 0 < waits[5] <= 0.01
+    assert limiter.get_stats()['throttled'] == 1
+
+
+def test_per_destination_budget():
+    limiter = RateLimiter(per_destination_rate=10, burst=2)
+    assert limiter.try_acquire('10.0.0.1') == 0.0
+    assert limiter.try_acquire('10.0.0.1') == 0.0
+    assert limiter.try_acquire('10.0.0.1') > 0
+    # 다른 목적지는 자체 예산을 가짐
+    assert limiter.try_acquire('10.0.0.2') == 0.0
+    assert limiter.get_stats()['destinations'] == 2
+
+
+def test_acquire_paces():
+    limiter = RateLimiter(rate=200, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire('10.0.0.1')
+    assert time.monotonic() - start >= 0.045
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.destinations = []
+
+    def acquire(self, destination):
+        self.destinations.append(destination)
+
+
+def test_ping_monitor_uses_resolved_ip(monkeypatch):
+    # ping 모니터도 포트 점검/스캐너처럼 해석한 IP로 목적지 예산을 받아야 같은 버킷을 씀
+    limiter = RecordingLimiter()
+    monkeypatch.setattr(monitor, 'global_rate_limiter', limiter)
+    monkeypatch.setattr(monitor, 'config', {'alerts': {}}, raising=False)
+    monkeypatch.setattr(monitor, 'ping_host', lambda host, count, *args, **kwargs: {
+        'received': 0, 'engine': 'native', 'fallback': False, 'tcp_port': None})
+    monitor.check_monitor({'name': 'ping', 'type': 'ping', 'host': 'localhost', 'count': 2, 'timeout': 1}, {})
+    assert limiter.destinations == [monitor.resolve_host('localhost')['ip']] * 2
@@ -0,0 +1,87 @@
+import socket
+import pytest
+from network_monitor import resolver
+from network_monitor.resolver import ResolverCache, address_family
+
+
+@pytest.fixture
+def fake_dns(monkeypatch):
+    """getaddrinfo 대신 고정된 레코드를 돌려주고 호출 횟수를 세는 가짜 DNS"""
+    records = {
+        'dual.example': [(socket.AF_INET6, '2001:db8::1'), (socket.AF_INET, '192.0.2.1'),
+                         (socket.AF_INET, '192.0.2.1')],
+        'v6only.example': [(socket.AF_INET6, '2001:db8::2')],
+        'v4only.example': [(socket.AF_INET, '192.0.2.3')],
+    }
+    calls = []
+
+    def getaddrinfo(host, port, family=0, type=0, *args):
+        calls.append(host)
+        if host not in records:
+            raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+        return [(fam, socket.SOCK_STREAM, 6, '', (ip, 0)) for fam, ip in records[host]]
+
+    monkeypatch.setattr(resolver.socket, 'getaddrinfo', getaddrinfo)
+    return calls
+
+
+def test_address_family():
+    assert address_family('10.0.0.1') == socket.AF_INET
+    assert address_family('::1') == socket.AF_INET6
+
+
+def test_ip_literals_skip_lookup(fake_dns):
+    cache = ResolverCache()
+    assert cache.resolve('192.0.2.9')['ip'] == '192.0.2.9'
+    assert cache.resolve('[2001:db8::9]')['family_name'] == 'ipv6'
+    assert fake_dns == []
+
+
+def test_cache_hits(fake_dns):
+    cache = ResolverCache(ttl=60)
+    first = cache.resolve('dual.example')
+    second = cache.resolve('dual.example')
+    assert fake_dns == ['dual.example']
+    assert not first['cached'] and second['cached']
+    # 중복 주소는 한 번만, getaddrinfo 순서 유지
+    assert first['addresses'] == ['2001:db8::1', '192.0.2.1']
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 1
+
+
+def test_cache_expiry_and_invalidate(fake_dns):
+    cache = ResolverCache(ttl=0)
+    cache.resolve('dual.example')
+    cache.resolve('dual.example')
+    assert len(fake_dns) == 2
+    cache.ttl = 60
+    cache.resolve('dual.example')
+    cache.invalidate('dual.example')
+    cache.resolve('dual.example')
+    assert len(fake_dns) == 4
+
+
+def test_lru_limit(fake_dns):
+    cache = ResolverCache(max_entries=2)
+    for host in ('dual.example', 'v6only.example', 'v4only.example'):
+        cache.resolve(host)
+    assert list(cache.entries) == ['v6only.example', 'v4only.example']
+
+
+def test_family_selection(fake_dns):
+    cache = ResolverCache()
+    # 기본은 IPv4 우선, AAAA만 있으면 IPv6
+    assert cache.resolve('dual.example')['ip'] == '192.0.2.1'
+    assert cache.resolve('dual.example', 'ipv6')['ip'] == '2001:db8::1'
+    assert cache.resolve('v6only.example')['family'] == socket.AF_INET6
+    with pytest.raises(socket.gaierror):
+        cache.resolve('v4only.example', 'ipv6')
+    with pytest.raises(ValueError):
+        cache.resolve('dual.example', 'ipx')
+
+
+def test_failure_is_not_cached(fake_dns):
+    cache = ResolverCache()
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            cache.resolve('missing.example')
+    assert fake_dns == ['missing.example', 'missing.example']
@@ -0,0 +1,70 @@
+from network_monitor import scan_history
+from network_monitor.port_scanner import PORT_OPEN, PORT_CLOSED, PORT_ERROR
+from network_monitor.scan_history import ScanHistory, delta_scan_host, rank_ports, _rotating_sample
+
+
+def test_history_round_trip(tmp_path):
+    path = str(tmp_path / 'history.json')
+    history = ScanHistory(path)
+    assert history.get('host') is None
+    history.update('host', {443, 22}, rotation_offset=5, full_scan=True)
+    entry = ScanHistory(path).get('host')
+    assert entry['open_ports'] == [22, 443]
+    assert entry['rotation_offset'] == 5
+    assert entry['last_full_scan'] == entry['last_scan']
+    history.forget('host')
+    assert ScanHistory(path).get('host') is None
+
+
+def test_rank_ports(tmp_path):
+    history = ScanHistory(str(tmp_path / 'history.json'))
+    history.update('a', [8080])
+    history.update('b', [8443, 9000])
+    history.update('c', [9000])
+    # 이 호스트의 열린 포트 -> 다른 호스트에서 자주 열린 포트 -> 기본 빈도 순 -> 번호 순
+    assert rank_ports([1, 9000, 8443, 80, 8080], 'a', history)[:3] == [8080, 9000, 8443]
+
+
+def test_rotating_sample():
+    assert _rotating_sample([1, 2, 3, 4, 5], 3, 3) == ([4, 5, 1], 1)
+    assert _rotating_sample([1, 2], 0, 5) == ([1, 2], 0)
+    assert _rotating_sample([], 3, 2) == ([], 3)
+
+
+def test_delta_scan_loopback(tmp_path, listeners, closed_port):
+    history = ScanHistory(str(tmp_path / 'history.json'))
+    first, second = listeners(2)
+    ports = sorted([first, second, closed_port])
+
+    baseline = delta_scan_host('127.0.0.1', ports, timeout=1.0, history=history, engine='batch')
+    assert baseline['baseline']
+    assert baseline['open_ports'] == sorted([first, second])
+
+    result = delta_scan_host('127.0.0.1', ports, timeout=1.0, sample_fraction=1.0, history=history,
+                             engine='batch')
+    assert not result['baseline']
+    assert result['new_open'] == [] and result['newly_closed'] == []
+    assert result['total_ports_scanned'] == 3
+
+
+def test_delta_scan_keeps_state_of_error_ports(tmp_path, monkeypatch):
+    history = ScanHistory(str(tmp_path / 'history.json'))
+    history.update('127.0.0.1', [22, 80, 443])
+
+    def fake_iter_scan_host(host, ports, *args, **kwargs):
+        # 22는 닫힘, 80은 로컬 자원 부족(EMFILE)으로 확인 실패, 443은 열림
+        states = {22: PORT_CLOSED, 80: PORT_ERROR, 443: PORT_OPEN}
+        for port in ports:
+            state = states.get(port, PORT_ERROR)
+            yield {'port': port, 'state': state, 'service': None, 'response_time': None,
+                   'error': 'EMFILE' if state == PORT_ERROR else None}
+
+    monkeypatch.setattr(scan_history, 'iter_scan_host', fake_iter_scan_host)
+    result = delta_scan_host('127.0.0.1', [22, 80, 443, 8080], sample_fraction=1.0, history=history)
+
+    assert result['newly_closed'] == [22]
+    assert result['error_ports'] == [80, 8080]
+    # 확인하지 못한 80은 이전처럼 열린 것으로 유지
+    assert result['open_ports'] == [80, 443]
+    assert history.get('127.0.0.1')['open_ports'] == [80, 443]
+    assert result['total_ports_scanned'] == 2
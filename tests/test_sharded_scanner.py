@@ -0,0 +1,69 @@
+import os
+import pytest
+from network_monitor import sharded_scanner
+from network_monitor.port_scanner import PORT_OPEN, PORT_CLOSED, PORT_FILTERED
+from network_monitor.port_state import PortStateMap
+from network_monitor.rate_limiter import RateLimiter
+from network_monitor.sharded_scanner import scan_network_sharded, scan_host_sharded, \
+    _pack_host_record, _unpack_host_record
+
+
+def test_host_record_round_trip():
+    state_map = PortStateMap(1024)
+    state_map.set(22, PORT_OPEN)
+    state_map.set(23, PORT_CLOSED)
+    state_map.set(1000, PORT_FILTERED)
+    record = _pack_host_record('2001:db8::1', state_map, {22: 0.5}, {80: 24})
+    ip, restored, open_times, errors = _unpack_host_record(record)
+    assert ip == '2001:db8::1'
+    assert restored.to_bytes() == state_map.to_bytes()
+    assert open_times == {22: 0.5}
+    assert errors == {80: 24}
+
+
+def test_sharded_sweep_loopback(listeners, closed_port):
+    open_port, = listeners(host='0.0.0.0')
+    ports = sorted([open_port, closed_port])
+    result = scan_network_sharded('127.0.0.1-2', ports, timeout=1.0, processes=2,
+                                  rate_limiter=RateLimiter(), return_state_map=True)
+    assert result['hosts_with_open_ports'] == ['127.0.0.1', '127.0.0.2']
+    assert result['total_probes'] == 4
+    assert result['open_on_all_hosts'] == [open_port]
+    assert not result['cancelled'] and not result['incomplete']
+    assert result['failed_hosts'] == []
+
+
+def test_sharded_host_scan_loopback(listeners, closed_port):
+    first, second = listeners(2)
+    result = scan_host_sharded('127.0.0.1', sorted([first, second, closed_port]), timeout=1.0,
+                               processes=2, rate_limiter=RateLimiter())
+    assert [p['port'] for p in result['open_ports']] == sorted([first, second])
+    assert result['closed_port_count'] == 1
+    assert result['total_ports_scanned'] == 3
+
+
+def crashing_shard(crash_ip):
+    real_scan_shard = sharded_scanner._scan_shard
+
+    def scan_shard(ips, *args):
+        if crash_ip in ips:
+            os._exit(3)
+        real_scan_shard(ips, *args)
+
+    return scan_shard
+
+
+@pytest.mark.skipif('fork' not in sharded_scanner.multiprocessing.get_all_start_methods(),
+                    reason='monkeypatch reaches workers only with fork')
+def test_worker_crash_is_not_cancellation(monkeypatch, closed_port):
+    monkeypatch.setattr(sharded_scanner, '_scan_shard', crashing_shard('127.0.0.2'))
+    result = scan_network_sharded('127.0.0.1-2', [closed_port], timeout=1.0, processes=2,
+                                  rate_limiter=RateLimiter())
+    assert result['failed_hosts'] == ['127.0.0.2']
+    assert result['incomplete']
+    assert result['worker_failures'] == {1: 3}
+    assert not result['cancelled']
+    assert list(result['hosts']) == ['127.0.0.1']
+
+    with pytest.raises(RuntimeError):
+        scan_host_sharded('127.0.0.2', [closed_port], timeout=1.0, processes=1, rate_limiter=RateLimiter())
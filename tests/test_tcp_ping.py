@@ -0,0 +1,65 @@
+import errno
+import json
+import math
+import time
+import pytest
+from network_monitor import tcp_ping
+from network_monitor.icmp_engine import REPLY
+from network_monitor.ping_monitor import ping_host
+from network_monitor.tcp_ping import tcp_ping_session
+
+
+def test_open_and_closed_ports_answer(listeners, closed_port):
+    open_port, = listeners()
+    # 열린 포트(SYN-ACK)와 닫힌 포트(RST) 모두 호스트가 응답한 것
+    for port in (open_port, closed_port):
+        batch = tcp_ping_session(['127.0.0.1'], port, count=3, interval=0.0, timeout=1.0)
+        assert batch.received == [3]
+        assert len(batch.rtts[0]) == 3
+        assert all(rtt >= 0 for rtt in batch.rtts[0])
+        assert batch.errors == [{}]
+
+
+def test_interval_and_callback(listeners):
+    port, = listeners()
+    events = []
+    start = time.monotonic()
+    batch = tcp_ping_session(['127.0.0.1', '127.0.0.1'], port, count=3, interval=0.05, timeout=1.0, window=1,
+                             callback=lambda kind, target, round_, rtt, error: events.append((kind, target, round_)))
+    # 3회차는 0, 0.05, 0.1초에 시작
+    assert time.monotonic() - start >= 0.09
+    assert batch.received == [3, 3]
+    assert sorted(events) == [(REPLY, target, round_) for target in (0, 1) for round_ in range(3)]
+
+
+def test_deadline_stops_after_count_replies(listeners):
+    port, = listeners()
+    start = time.monotonic()
+    batch = tcp_ping_session(['127.0.0.1'], port, count=2, interval=0.01, timeout=1.0, deadline=5.0)
+    assert time.monotonic() - start < 1.0
+    assert batch.received == [2]
+
+
+def test_socket_failure_is_reported(monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError(errno.EAFNOSUPPORT, 'injected')
+
+    monkeypatch.setattr(tcp_ping.socket, 'socket', fail)
+    batch = tcp_ping_session(['::1'], 80, count=2, interval=0.0, timeout=0.5)
+    assert batch.received == [0]
+    assert batch.errors == [{0: 'EAFNOSUPPORT', 1: 'EAFNOSUPPORT'}]
+    assert all(math.isnan(rtt) for rtt in batch.rtts[0])
+
+
+def test_count_or_deadline_required():
+    with pytest.raises(ValueError):
+        tcp_ping_session(['127.0.0.1'], 80, count=None, deadline=None)
+
+
+def test_ping_host_tcp_engine(listeners):
+    port, = listeners()
+    result = ping_host('127.0.0.1', 2, 1.0, verbose=False, engine='tcp', interval=0.0, tcp_port=port)
+    assert result['engine'] == 'tcp' and result['tcp_port'] == port
+    assert result['received'] == 2
+    # 결과는 그대로 JSON으로 직렬화할 수 있어야 함 (NaN 없음)
+    json.dumps(result, allow_nan=False)
@@ -0,0 +1,59 @@
+import errno
+import socket
+import threading
+import pytest
+from network_monitor.port_scanner import PORT_OPEN, PORT_CLOSED, PORT_FILTERED, PORT_OPEN_FILTERED, PORT_ERROR
+from network_monitor.udp_scanner import UDPScanner, classify_udp_error, get_udp_payload, UDP_PAYLOADS, \
+    DEFAULT_UDP_PAYLOAD
+
+
+@pytest.mark.parametrize('err, state', [
+    (errno.ECONNREFUSED, PORT_CLOSED),      # ICMP port unreachable
+    (errno.EHOSTUNREACH, PORT_FILTERED),    # 호스트 도달 불가
+    (errno.ENETUNREACH, PORT_FILTERED),
+    (errno.EACCES, PORT_FILTERED),          # 관리적 차단
+    (errno.EMFILE, PORT_ERROR),             # 로컬 fd 부족
+])
+def test_classify_udp_error(err, state):
+    assert classify_udp_error(err) == state
+
+
+def test_payloads():
+    assert get_udp_payload(53) == UDP_PAYLOADS[53]
+    assert get_udp_payload(40000) == DEFAULT_UDP_PAYLOAD
+    # NTP 클라이언트 요청은 48바이트
+    assert len(get_udp_payload(123)) == 48
+
+
+@pytest.fixture
+def udp_ports():
+    """(응답하는 에코 포트, 응답하지 않는 포트, 아무도 듣지 않는 포트)"""
+    echo = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    echo.bind(('127.0.0.1', 0))
+    silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    silent.bind(('127.0.0.1', 0))
+    unused = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    unused.bind(('127.0.0.1', 0))
+    closed_port = unused.getsockname()[1]
+    unused.close()
+
+    def serve():
+        try:
+            while True:
+                data, address = echo.recvfrom(2048)
+                echo.sendto(data, address)
+        except OSError:
+            pass
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield echo.getsockname()[1], silent.getsockname()[1], closed_port
+    echo.close()
+    silent.close()
+
+
+def test_udp_scan_loopback(udp_ports):
+    echo_port, silent_port, closed_port = udp_ports
+    scanner = UDPScanner(timeout=0.3, window=8, retries=1, per_host_rate=None)
+    results = {target[1]: state for target, state, _ in
+               scanner.scan([('127.0.0.1', p) for p in (echo_port, silent_port, closed_port)])}
+    assert results == {echo_port: PORT_OPEN, silent_port: PORT_OPEN_FILTERED, closed_port: PORT_CLOSED}
@@ -1,9 +1,16 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
 from network_monitor.ping_monitor import ping_host
-from network_monitor.port_scanner import scan_host, get_common_ports
+from network_monitor.port_scanner import scan_host, iter_scan_host, get_common_ports, normalize_ports
 from network_monitor.dns_lookup import dns_lookup, reverse_dns_lookup
 from network_monitor.performance_optimizer import PerformanceOptimizer, run_performance_benchmark
+from network_monitor.fd_budget import global_fd_budget
+from network_monitor.rate_limiter import global_rate_limiter
+from network_monitor.icmp_engine import global_icmp_engine
+from network_monitor.config import DEFAULT_PING_ENGINE, DEFAULT_PING_INTERVAL, DEFAULT_TCP_PING_PORT
 import socket
+import errno
+import json
+import time
 import os
 
 app = Flask(__name__)
@@ -273,13 +280,19 @@ with open('templates/index.html', 'w') as f:
                 
                 if (data.success) {
                     let output = `Host: ${data.host}\\n`;
+                    if (data.fallback) {
+                        output += `TCP ping on port ${data.tcp_port} (${data.fallback_reason})\\n`;
+                    }
                     output += `Packets: Transmitted = ${data.transmitted}, Received = ${data.received}, `;
                     output += `Lost = ${data.packet_loss} (${data.packet_loss_percent.toFixed(1)}% loss)\\n\\n`;
                     
                     if (data.avg_time !== null) {
                         output += `Approximate round trip times in milliseconds:\\n`;
                         output += `Minimum = ${data.min_time.toFixed(2)}ms, Maximum = ${data.max_time.toFixed(2)}ms, `;
-                        output += `Average = ${data.avg_time.toFixed(2)}ms\\n\\n`;
+                        output += `Average = ${data.avg_time.toFixed(2)}ms\\n`;
+                        output += `Jitter = ${data.jitter.toFixed(2)}ms, Mdev = ${data.mdev.toFixed(2)}ms, `;
+                        output += `P50/P90/P99 = ${data.p50.toFixed(2)}/${data.p90.toFixed(2)}/${data.p99.toFixed(2)}ms\\n`;
+                        output += `Loss bursts = ${data.loss_bursts} (longest ${data.max_loss_burst})\\n\\n`;
                     }
                     
                     output += `Detailed Results:\\n`;
@@ -835,11 +848,18 @@ def api_ping():
     host = data['host']
     count = data.get('count', 5)
     timeout = data.get('timeout', 2)
+    engine = data.get('engine', DEFAULT_PING_ENGINE)
+    interval = data.get('interval', DEFAULT_PING_INTERVAL)
+    deadline = data.get('deadline')
+    tcp_port = data.get('tcp_port', DEFAULT_TCP_PING_PORT)
     
     try:
-        result = ping_host(host, count, timeout)
+        result = ping_host(host, count, timeout, engine=engine, interval=interval, deadline=deadline,
+                           tcp_port=tcp_port)
         result['success'] = True
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -855,29 +875,34 @@ def api_scan():
     timeout = data.get('timeout', 0.5)
     advanced = data.get('advanced', False)
     adaptive_timeout = data.get('adaptive_timeout', False)
+    engine = data.get('engine')
+    max_concurrency = data.get('max_concurrency', 500)
+    early_exit = {
+        'order': data.get('order', 'numeric'),
+        'stop_after_open': data.get('stop_after_open'),
+        'time_budget': data.get('time_budget'),
+        'grab_banners': data.get('grab_banners', False),
+        'protocol': data.get('protocol', 'tcp'),
+        'family': data.get('family'),
+        'kernel_rtt': data.get('kernel_rtt', False)
+    }
     
     try:
-        if scan_type == 'common':
-            # 공통 포트 스캔
-            common_ports = get_common_ports()
-            
-            # 각 포트 개별적으로 스캔
-            open_ports = []
-            for port in common_ports:
-                port_result = scan_host(host, (port, port), timeout, 
-                                      use_advanced_options=advanced,
-                                      use_adaptive_timeout=adaptive_timeout)
-                if port_result['open_ports']:
-                    open_ports.extend(port_result['open_ports'])
+        if scan_type in ('common', 'list'):
+            # 공통 포트 또는 지정 목록("22,80,8000-8100", "top100")을 한 번의 동시 스캔으로 처리
+            if scan_type == 'common':
+                ports = get_common_ports()
+            else:
+                ports = data.get('ports')
+                if not ports:
+                    return jsonify({'success': False, 'error': 'Ports are required for list scan'}), 400
             
-            # 결과 구성
-            result = {
-                'success': True,
-                'host': host,
-                'open_ports': open_ports,
-                'total_ports_scanned': len(common_ports),
-                'scan_time': sum(p.get('response_time', 0) for p in open_ports) if open_ports else 0
-            }
+            result = scan_host(host, ports, timeout,
+                              use_advanced_options=advanced,
+                              use_adaptive_timeout=adaptive_timeout,
+                              engine=engine, max_concurrency=max_concurrency,
+                              **early_exit)
+            result['success'] = True
             
         else:
             # 포트 범위 스캔
@@ -889,12 +914,88 @@ def api_scan():
             
             result = scan_host(host, (start_port, end_port), timeout,
                               use_advanced_options=advanced,
-                              use_adaptive_timeout=adaptive_timeout)
+                              use_adaptive_timeout=adaptive_timeout,
+                              engine=engine, max_concurrency=max_concurrency,
+                              **early_exit)
             result['success'] = True
         
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except OSError as e:
+        # 다른 스캔이 fd 예산을 다 쓰고 있어 제한 시간 안에 동시성 상한을 빌리지 못함
+        if e.errno == errno.EMFILE:
+            return jsonify({'success': False, 'error': str(e)}), 503
+        return jsonify({'success': False, 'error': str(e)}), 500
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/scan/stream', methods=['POST'])
+def api_scan_stream():
+    """포트별 결과를 완료되는 대로 NDJSON(한 줄에 JSON 하나)으로 스트리밍"""
+    data = request.get_json()
+    
+    if not data or 'host' not in data:
+        return jsonify({'success': False, 'error': 'Host is required'}), 400
+    
+    host = data['host']
+    timeout = data.get('timeout', 0.5)
+    include_closed = data.get('include_closed', False)
+    
+    if data.get('scan_type') == 'common':
+        ports = get_common_ports()
+    else:
+        ports = data.get('ports') or (data.get('start_port', 1), data.get('end_port', 1024))
+    
+    # 입력 검사와 호스트 이름 해석은 iter_scan_host 호출 시점에 끝나므로 응답을 시작하기 전에 400으로 알림
+    try:
+        ports = normalize_ports(ports)
+        results = iter_scan_host(host, ports, timeout,
+                                 use_advanced_options=data.get('advanced', False),
+                                 use_adaptive_timeout=data.get('adaptive_timeout', False),
+                                 engine=data.get('engine'),
+                                 max_concurrency=data.get('max_concurrency', 500),
+                                 order=data.get('order', 'numeric'),
+                                 stop_after_open=data.get('stop_after_open'),
+                                 time_budget=data.get('time_budget'),
+                                 protocol=data.get('protocol', 'tcp'),
+                                 family=data.get('family'),
+                                 kernel_rtt=data.get('kernel_rtt', False))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except socket.gaierror as e:
+        return jsonify({'success': False, 'error': f"Cannot resolve host {host}: {e}"}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+    
+    def generate():
+        # 클라이언트가 연결을 끊으면 제너레이터가 닫히면서 스캔도 중단됨
+        start_ns = time.perf_counter_ns()
+        open_count = 0
+        scanned = 0
+        try:
+            for port_result in results:
+                scanned += 1
+                if port_result['state'] == 'open':
+                    open_count += 1
+                elif not include_closed:
+                    continue
+                yield json.dumps(dict(port_result, type='port')) + '\n'
+            
+            yield json.dumps({
+                'type': 'summary',
+                'success': True,
+                'host': host,
+                'total_ports_scanned': scanned,
+                'open_port_count': open_count,
+                'scan_time': (time.perf_counter_ns() - start_ns) / 1e9
+            }) + '\n'
+        except Exception as e:
+            yield json.dumps({'type': 'summary', 'success': False, 'error': str(e)}) + '\n'
+        finally:
+            results.close()
+    
+    return Response(generate(), mimetype='application/x-ndjson')
 
 @app.route('/api/dns', methods=['POST'])
 def api_dns():
@@ -1010,11 +1111,11 @@ def api_server_status():
         for service in docker_services:
             try:
                 # 간단한 포트 연결 테스트
-                start_time = time.time()
+                start_ns = time.perf_counter_ns()
                 test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 test_socket.settimeout(1.0)
                 result = test_socket.connect_ex(('localhost', service['port']))
-                response_time = time.time() - start_time
+                response_time = (time.perf_counter_ns() - start_ns) / 1e9
                 test_socket.close()
                 
                 service['accessible'] = (result == 0)
@@ -1033,6 +1134,21 @@ def api_server_status():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/stats', methods=['GET'])
+def api_stats():
+    try:
+        # 프로세스 전체 자원 사용 현황 (fd 예산, 레이트 리미터, 공유 ICMP 엔진)
+        result = {
+            'success': True,
+            'fd_budget': global_fd_budget.get_stats(),
+            'rate_limiter': global_rate_limiter.get_stats(),
+            'icmp_engine': global_icmp_engine.get_stats()
+        }
+
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/monitoring-config', methods=['GET'])
 def api_monitoring_config():
     try: